@@ -0,0 +1,400 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from chart_engine import DECOMPOSABLE
+from instrument import traced
+from playstore_data import apply_filters, column, name_contains, name_starts_with, with_columns
+from ranking import top_k, top_k_per_group
+
+# =====================================
+# Task analyses as functions of a loaded catalog
+# =====================================
+# Each task@N.py pipeline, over a frame from load_playstore(), with its
+# thresholds as keyword arguments (the defaults are the scripts' values).
+# Every function returns exactly what its script draws:
+#   top_categories()      task@1  top categories by installs (mpl 'category_bars')
+#   free_vs_paid()        task@2  free vs paid installs / revenue ('free_vs_paid')
+#   category_map()        task@3  top categories for the choropleth (plotly)
+#   cumulative_installs() task@4  (cumulative, highlight, labels) ('cumulative_installs')
+#   size_vs_rating()      task@5  bubble chart rows ('size_vs_rating'); its opt-in
+#                                 min_subjectivity needs Sentiment_Subjectivity
+#                                 (reviews.with_sentiment)
+#   installs_by_month()   task@6  monthly installs and MoM growth ('monthly_installs')
+#
+# sweep() runs one analysis for every combination of a parameter grid over
+# the same frame: one load, then one call per combination. Threshold grids
+# that decompose are answered in one pass instead: threshold_sweep() bins
+# every row by the thresholds it passes, aggregates each (bin, group) cell
+# once and turns the cells into per-threshold totals with cumulative sums
+# (a row passing Rating >= 4.5 passes Rating >= 4.0 too). top_categories over
+# a min_rating x min_size grid goes through it.
+#
+# Usage: python analyses.py top_categories min_rating=3.0,3.5,4.0,4.5 min_size=0,10,20 [--charts DIR]
+
+CATEGORY_AGGS = dict(
+    Avg_Rating=('Rating', 'mean'),
+    Total_Reviews=('Reviews', 'sum'),
+    Total_Installs=('Installs', 'sum')
+)
+
+BUBBLE_CATEGORIES = [
+    'GAME', 'BEAUTY', 'BUSINESS', 'COMICS',
+    'COMMUNICATION', 'DATING', 'ENTERTAINMENT',
+    'SOCIAL', 'EVENTS'
+]
+
+# Legend translations of task@4, task@5 and task@6
+CUMULATIVE_LABELS = {
+    'Travel & Local': 'Voyage et Local',     # French
+    'Productivity': 'Productividad',         # Spanish
+    'Photography': '写真'                     # Japanese
+}
+BUBBLE_LABELS = {
+    'BEAUTY': 'सौंदर्य',
+    'BUSINESS': 'வணிகம்',
+    'DATING': 'Dating (Deutsch)'
+}
+MONTHLY_LABELS = {
+    'Beauty': 'सौंदर्य',          # Hindi
+    'Business': 'வணிகம்',         # Tamil
+    'Dating': 'Dating (Deutsch)'  # German
+}
+
+
+# -------------------------------
+# Analyses
+# -------------------------------
+
+def category_filters(min_rating=4.0, min_size=10, month=1):
+    """task@1's filters (also used by its streaming path)."""
+    return [
+        ('Rating', '>=', min_rating),
+        ('Size_MB', '>=', min_size),
+        ('Last Updated', 'month', month),
+    ]
+
+
+def top_categories(df, min_rating=4.0, min_size=10, month=1, k=10):
+    """task@1: the k categories with the most installs among well-rated, larger apps updated in `month`."""
+    stats = apply_filters(df, category_filters(min_rating, min_size, month)).groupby(
+        'Category', observed=True).agg(**CATEGORY_AGGS).reset_index()
+    return top_k(stats, k, 'Total_Installs')
+
+
+# task@2's thresholds, shared with its incrementally maintained aggregate
+FREE_VS_PAID_FILTERS = dict(min_installs=10000, min_paid_revenue=10000, min_android=4.0, min_size=15,
+                            content_rating='Everyone', max_name_length=30)
+
+
+def free_vs_paid_mask(df, min_installs=10000, min_paid_revenue=10000, min_android=4.0, min_size=15,
+                      content_rating='Everyone', max_name_length=30):
+    """task@2's row filter (also used by its incrementally maintained aggregate)."""
+    return (
+        (df['Installs'] >= min_installs) &
+        (
+            ((df['Type'] == 'Paid') & (column(df, 'Revenue') >= min_paid_revenue)) |
+            (df['Type'] == 'Free')
+        ) &
+        (df['Android_Version'] > min_android) &
+        (df['Size_MB'] > min_size) &
+        (df['Content Rating'] == content_rating) &
+        (column(df, 'App_Length') <= max_name_length)
+    )
+
+
+def free_vs_paid(df, min_installs=10000, min_paid_revenue=10000, min_android=4.0, min_size=15,
+                 content_rating='Everyone', max_name_length=30, k=3):
+    """task@2: average installs and revenue by Type in the k categories with the most installs."""
+    df = with_columns(df, 'Revenue', 'App_Length')
+    filtered = df[free_vs_paid_mask(df, min_installs, min_paid_revenue, min_android, min_size,
+                                    content_rating, max_name_length)]
+    top = top_k(filtered.groupby('Category', observed=True)['Installs'].sum(), k).index
+    return (
+        filtered[filtered['Category'].isin(top)]
+        .groupby(['Category', 'Type'], as_index=False, observed=True)
+        .agg(
+            Avg_Installs=('Installs', 'mean'),
+            Avg_Revenue=('Revenue', 'mean')
+        )
+    )
+
+
+def category_map(df, exclude_prefixes=('A', 'C', 'G', 'S'), k=5, highlight_above=1_000_000):
+    """task@3: total installs of the k biggest categories not starting with exclude_prefixes."""
+    df = df.dropna(subset=['Installs', 'Category'])
+    df = df[~df['Category'].str.startswith(tuple(exclude_prefixes), na=False)]
+    top = top_k(df.groupby('Category', observed=True)['Installs'].sum(), k).index
+    map_df = (
+        df[df['Category'].isin(top)]
+        .groupby('Category', as_index=False, observed=True)
+        .agg(Total_Installs=('Installs', 'sum'))
+    )
+    # Dummy Country column (required for the choropleth), added to the k result rows only
+    map_df = with_columns(map_df, 'Country')[['Country', 'Category', 'Total_Installs']]
+    map_df['Highlight'] = map_df['Total_Installs'] > highlight_above
+    return map_df
+
+
+def cumulative_installs(df, min_rating=4.2, min_reviews=1000, min_size=20, max_size=80,
+                        prefixes=('T', 'P'), growth=0.25, labels=CUMULATIVE_LABELS):
+    """task@4: (cumulative monthly installs per category, months growing > growth, legend labels)."""
+    df = df[~df['Name_Has_Digit']]
+    filtered = df[
+        (df['Rating'] >= min_rating) &
+        (df['Reviews'] > min_reviews) &
+        (df['Size_MB'] >= min_size) &
+        (df['Size_MB'] <= max_size) &
+        (df['Category'].str.startswith(tuple(prefixes), na=False))
+    ]
+    monthly = (
+        with_columns(filtered, 'Month')
+        .groupby(['Month', 'Category'], as_index=False, observed=True)
+        .agg(Monthly_Installs=('Installs', 'sum'))
+    )
+    # Category names as plain strings: columns (stack order, legend) come out alphabetical
+    monthly['Category'] = monthly['Category'].astype(str)
+    cumulative = monthly.pivot(index='Month', columns='Category', values='Monthly_Installs').fillna(0).cumsum()
+    highlight = (cumulative.pct_change() > growth).any(axis=1)
+    return cumulative, highlight, [labels.get(cat, cat) for cat in cumulative.columns]
+
+
+def size_vs_rating(df, min_rating=3.5, min_reviews=500, min_installs=50000, min_subjectivity=None,
+                   categories=BUBBLE_CATEGORIES, labels=BUBBLE_LABELS):
+    """task@5: bubble chart rows with a Category_Label column.
+
+    min_subjectivity is opt-in: apps without reviews have no subjectivity
+    (NaN) and fail it, so setting it also drops every unreviewed app.
+    """
+    filters = [
+        ('Rating', '>', min_rating),
+        ('Reviews', '>', min_reviews),
+        ('Installs', '>', min_installs),
+        ('Sentiment_Subjectivity', '>', min_subjectivity),
+        ('Category', 'in', categories),
+    ]
+    if min_subjectivity is None:
+        del filters[3]
+    filtered = apply_filters(df, filters).dropna(subset=['Size_MB', 'Rating', 'Installs'])
+    return filtered.assign(Category_Label=filtered['Category'].astype(str).replace(labels))
+
+
+def installs_by_month(df, min_reviews=500, exclude_first='XYZ', exclude_chars='s',
+                      prefixes=('E', 'C', 'B'), labels=MONTHLY_LABELS):
+    """task@6: installs per month and category with month-over-month growth (%)."""
+    df = df.assign(Date=df['Last Updated']).dropna(subset=['Date', 'Installs', 'Reviews', 'App', 'Category'])
+    df = df[df['Reviews'] > min_reviews]
+    if exclude_first:
+        df = df[~name_starts_with(df, exclude_first)]
+    if exclude_chars:
+        df = df[~name_contains(df, exclude_chars)]
+    df = df[df['Category'].str.upper().str.startswith(tuple(prefixes))]
+    df = df.assign(Category_Label=df['Category'].astype(str).replace(labels),
+                   YearMonth=df['Date'].dt.to_period('M'))
+    monthly = df.groupby(['YearMonth', 'Category_Label'])['Installs'].sum().reset_index()
+    monthly['YearMonth'] = monthly['YearMonth'].dt.to_timestamp()
+    monthly['MoM_Growth'] = monthly.groupby('Category_Label')['Installs'].pct_change() * 100
+    return monthly
+
+
+# -------------------------------
+# Threshold sweeps
+# -------------------------------
+
+_LOWER_BOUNDS = ('>=', '>')
+_UPPER_BOUNDS = ('<=', '<')
+
+
+def _threshold_bins(values, op, thresholds):
+    """Bin of every row (-1: passes no threshold). A row in bin b passes thresholds[:b + 1] for
+    lower bounds and thresholds[b:] for upper bounds (thresholds sorted ascending)."""
+    if op in _LOWER_BOUNDS:
+        bins = np.searchsorted(thresholds, values, side='right' if op == '>=' else 'left') - 1
+    else:
+        bins = np.searchsorted(thresholds, values, side='left' if op == '<=' else 'right')
+        bins[bins == len(thresholds)] = -1
+    bins[np.isnan(values)] = -1
+    return bins
+
+
+@traced('groupby')
+def threshold_sweep(df, by, aggs, thresholds, filters=()):
+    """Grouped aggregates for every combination of threshold values, from one pass over the rows.
+
+    thresholds: (column, op, values) with op in >=, >, <=, <. aggs: name -> (column, sum | count | mean).
+    Returns one row per combination and group with at least one row, a "<column> <op>" column per
+    threshold holding its value, sorted by the thresholds then the group.
+    """
+    df = apply_filters(df, filters)
+    codes, groups = pd.factorize(column(df, by), sort=True)
+    keep = codes >= 0
+    labels, levels, bins = [], [], []
+    for col, op, values in thresholds:
+        if op not in _LOWER_BOUNDS + _UPPER_BOUNDS:
+            raise ValueError(f"Unsupported threshold operator: {op!r}")
+        s = column(df, col)
+        # Compare in the column's float type, like the filters do (Rating is float32)
+        dtype = s.dtype if s.dtype.kind == 'f' else np.dtype('float64')
+        level, first = np.unique(np.asarray(values, dtype=dtype), return_index=True)
+        b = _threshold_bins(s.to_numpy(dtype=dtype, na_value=np.nan), op, level)
+        keep &= b >= 0
+        labels.append(f"{col} {op}")
+        levels.append(np.asarray(values, dtype='float64')[first])
+        bins.append(b)
+
+    shape = (*(len(level) for level in levels), len(groups))
+    cells = np.ravel_multi_index((*(b[keep] for b in bins), codes[keep]), shape)
+
+    def totals(valid=None, weights=None):
+        cube = np.bincount(cells if valid is None else cells[valid], weights,
+                           minlength=int(np.prod(shape))).reshape(shape)
+        for axis, (_, op, _) in enumerate(thresholds):
+            if op in _LOWER_BOUNDS:
+                cube = np.flip(np.cumsum(np.flip(cube, axis), axis), axis)
+            else:
+                cube = np.cumsum(cube, axis)
+        return cube
+
+    present = totals() > 0
+    where = np.nonzero(present)
+    out = {label: level[i] for label, level, i in zip(labels, levels, where)}
+    out[by] = groups[where[-1]]
+    for name, (col, func) in aggs.items():
+        if func not in DECOMPOSABLE:
+            raise ValueError(f"Unsupported threshold aggregate {func!r} for {name}")
+        s = column(df, col)
+        values = s.to_numpy(dtype='float64', na_value=np.nan)[keep]
+        valid = ~np.isnan(values)
+        count = totals(valid)[present]
+        if func == 'count':
+            out[name] = count.astype('int64')
+            continue
+        total = totals(valid, values[valid])[present]
+        if func == 'sum':
+            out[name] = total.astype('int64') if s.dtype.kind in 'iu' else total
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                out[name] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+    return pd.DataFrame(out)
+
+
+def sweep_top_categories(df, min_rating=(4.0,), min_size=(10,), month=1, k=10):
+    """top_categories() for every min_rating x min_size combination, from one threshold_sweep()."""
+    stats = threshold_sweep(df, 'Category', CATEGORY_AGGS,
+                            [('Rating', '>=', min_rating), ('Size_MB', '>=', min_size)],
+                            [('Last Updated', 'month', month)])
+    variant = stats.groupby(['Rating >=', 'Size_MB >='], sort=False).ngroup()
+    return top_k_per_group(stats.assign(Variant=variant), k, 'Total_Installs', 'Variant') \
+        .drop(columns='Variant').reset_index(drop=True)
+
+
+def _split_top_categories(df, grid, combos, **fixed):
+    names = list(grid)
+    stats = sweep_top_categories(df, *(grid.get(p, [d]) for p, d in (('min_rating', 4.0), ('min_size', 10))),
+                                 **fixed)
+    parts = dict(iter(stats.groupby(['Rating >=', 'Size_MB >='], sort=False)))
+    empty = stats.iloc[:0]
+    out = {}
+    for combo in combos:
+        params = dict(zip(names, combo))
+        key = (float(params.get('min_rating', 4.0)), float(params.get('min_size', 10)))
+        out[combo] = parts.get(key, empty).drop(columns=['Rating >=', 'Size_MB >=']).reset_index(drop=True)
+    return out
+
+
+# analysis -> (vectorized sweep, the parameters it sweeps in one pass)
+_VECTORIZED = {
+    top_categories: (_split_top_categories, ('min_rating', 'min_size')),
+}
+
+
+def sweep(analysis, df, grid, **fixed):
+    """{combination: analysis(df, **combination, **fixed)} for every combination of the grid values.
+
+    grid maps parameter names to values; combinations are value tuples in grid order. Grids an
+    analysis can sweep in one pass (see _VECTORIZED) are answered that way.
+    """
+    combos = list(itertools.product(*grid.values()))
+    vectorized = _VECTORIZED.get(analysis)
+    if vectorized is not None and set(grid) <= set(vectorized[1]):
+        return vectorized[0](df, grid, combos, **fixed)
+    return {combo: analysis(df, **dict(zip(grid, combo)), **fixed) for combo in combos}
+
+
+ANALYSES = {
+    # name: (analysis, mpl_charts kind or None)
+    'top_categories': (top_categories, 'category_bars'),
+    'free_vs_paid': (free_vs_paid, 'free_vs_paid'),
+    'category_map': (category_map, None),
+    'cumulative_installs': (cumulative_installs, 'cumulative_installs'),
+    'size_vs_rating': (size_vs_rating, 'size_vs_rating'),
+    'installs_by_month': (installs_by_month, 'monthly_installs'),
+}
+
+
+def _grid_values(text):
+    name, _, values = text.partition('=')
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(int(value))
+        except ValueError:
+            parsed.append(float(value))
+    return name, parsed
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from playstore_data import load_playstore
+
+    parser = argparse.ArgumentParser(description="Run one analysis over a parameter grid (one data load)")
+    parser.add_argument('analysis', choices=list(ANALYSES))
+    parser.add_argument('grid', nargs='*', metavar='PARAM=V1,V2,...', help="numeric parameter values to sweep")
+    parser.add_argument('--charts', metavar='DIR', help="render every variant into DIR (mpl_charts.render_batch)")
+    parser.add_argument('--format', nargs='+', default=['png'], choices=('png', 'svg', 'pdf'))
+    args = parser.parse_args()
+
+    analysis, kind = ANALYSES[args.analysis]
+    grid = dict(_grid_values(g) for g in args.grid)
+
+    t0 = time.perf_counter()
+    df = load_playstore()
+    if 'min_subjectivity' in grid:
+        from reviews import ReviewSchemaError, with_sentiment
+        try:
+            df = with_sentiment(df)
+        except (FileNotFoundError, ReviewSchemaError) as e:
+            print(f"⚠️  No review sentiment ({e}); sweeping without the subjectivity filter.")
+            del grid['min_subjectivity']
+    t1 = time.perf_counter()
+    results = sweep(analysis, df, grid)
+    t2 = time.perf_counter()
+    print(f"{args.analysis}: {len(results)} variant(s); load {t1 - t0:.3f}s, sweep {t2 - t1:.3f}s "
+          f"({(t2 - t1) / max(len(results), 1) * 1000:.1f} ms each)")
+    if analysis in _VECTORIZED and set(grid) <= set(_VECTORIZED[analysis][1]):
+        t3 = time.perf_counter()
+        for combo in results:
+            analysis(df, **dict(zip(grid, combo)))
+        print(f"  one call per variant instead: {time.perf_counter() - t3:.3f}s")
+
+    for combo, result in results.items():
+        label = ", ".join(f"{name}={value}" for name, value in zip(grid, combo)) or "defaults"
+        rows = len(result[0] if isinstance(result, tuple) else result)
+        print(f"  {label:<40} {rows:>6} rows")
+
+    if args.charts:
+        if kind is None:
+            parser.error(f"{args.analysis} has no matplotlib chart")
+        from mpl_charts import render_batch
+
+        jobs = []
+        for combo, result in results.items():
+            data = result if isinstance(result, tuple) else (result,)
+            if len(data[0]):
+                name = "_".join([args.analysis, *(f"{n}{v:g}" for n, v in zip(grid, combo))])
+                jobs.append((name, kind, data, {}))
+        written = render_batch(jobs, args.charts, args.format)
+        print(f"🖼️  {len(written)} chart(s) -> {args.charts}")
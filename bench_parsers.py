@@ -0,0 +1,99 @@
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from playstore_data import resolve_path
+from playstore_parsers import (
+    parse_android_version, parse_installs, parse_price, parse_size
+)
+
+# =====================================
+# Benchmark: vectorized parsers vs the old per-row versions
+# =====================================
+# Usage: python bench_parsers.py [rows]   (default 1,000,000)
+
+
+# -------------------------------
+# Previous implementations (copied from the scripts)
+# -------------------------------
+
+def legacy_clean_size(x):          # dashboard.py
+    x = str(x)
+    if 'M' in x:
+        return float(x.replace('M', ''))
+    if 'k' in x:
+        return float(x.replace('k', '')) / 1024
+    return np.nan
+
+
+def legacy_convert_size(size):     # task@2.py - task@5.py
+    if isinstance(size, str):
+        if size.endswith('M'):
+            return float(size.replace('M', ''))
+        if size.endswith('k'):
+            return float(size.replace('k', '')) / 1024
+    return None
+
+
+def legacy_installs(s):
+    return pd.to_numeric(s.astype(str).str.replace(r'[+,]', '', regex=True), errors='coerce')
+
+
+def legacy_price(s):
+    s = s.astype(str).str.replace('$', '', regex=False).replace(['Free', 'free'], '0')
+    return pd.to_numeric(s, errors='coerce')
+
+
+def legacy_android(s):
+    return pd.to_numeric(s.astype(str).str.extract(r'(\d+\.\d+|\d+)', expand=False), errors='coerce')
+
+
+# -------------------------------
+# Harness
+# -------------------------------
+
+def best_of(func, arg, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def same(a, b):
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(pd.to_numeric(pd.Series(b), errors='coerce'), dtype=float)
+    return bool(np.allclose(a, b, rtol=1e-6, equal_nan=True))
+
+
+def main(rows=1_000_000):
+    raw = pd.read_csv(resolve_path(), dtype=str)
+    # Only rows the loader keeps (drops the shifted record)
+    raw = raw[raw['Installs'].str.endswith('+', na=False)]
+    reps = -(-rows // len(raw))
+    big = pd.concat([raw] * reps, ignore_index=True).head(rows)
+
+    cases = [
+        ('Size (dashboard clean_size)', big['Size'],
+         lambda s: s.apply(legacy_clean_size), lambda s: parse_size(s)[0]),
+        ('Size (task convert_size)', big['Size'],
+         lambda s: s.apply(legacy_convert_size), lambda s: parse_size(s)[0]),
+        ('Installs', big['Installs'], legacy_installs, parse_installs),
+        ('Price', big['Price'], legacy_price, parse_price),
+        ('Android Ver', big['Android Ver'], legacy_android, parse_android_version),
+    ]
+
+    print(f"Rows: {len(big):,}")
+    print(f"{'column':<30}{'old (s)':>10}{'new (s)':>10}{'speedup':>10}  match")
+    for name, series, old, new in cases:
+        t_old, r_old = best_of(old, series)
+        t_new, r_new = best_of(new, series)
+        print(f"{name:<30}{t_old:>10.3f}{t_new:>10.3f}{t_old / t_new:>9.1f}x  {same(r_new, r_old)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
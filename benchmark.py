@@ -0,0 +1,299 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import analyses
+import playstore_parsers as parsers
+from chart_engine import MaskCache, compute_chart_data
+from genres import GenreIndex
+from playstore_data import CACHE_DIR, clean_playstore, compact_catalog, resolve_path
+from predicate_index import FilterIndex
+from pricing import PricingCube
+from ranking import Leaderboard, top_k_per_group
+from rollup_cube import CubeMiss, build_cube, query as cube_query
+
+# =====================================
+# Benchmark suite: load, clean, aggregate and render
+# =====================================
+# Usage:
+#   python benchmark.py --rows 10000 100000 1000000 --out bench.json
+#   python benchmark.py --rows 100000 --compare bench.json   (flags regressions)
+#
+# Fixture datasets are sampled from the real CSV's per-column distributions
+# and cached under .cache/bench. Every stage is timed on its own: one untimed
+# warm-up call, then the best of --repeat calls, with tracemalloc off (it
+# slows every allocation down). The peak traced allocation comes from one
+# more call made only for that. Stages that change state or are meant to be
+# measured cold (once=True) are timed from a single call, without a peak.
+
+BENCH_DIR = os.path.join(CACHE_DIR, 'bench')
+DEFAULT_ROWS = [10_000, 100_000]
+REGRESSION_THRESHOLD = 0.20   # 20% slower ...
+REGRESSION_MIN_SECONDS = 0.01  # ... and at least 10 ms slower
+REPEAT = 3                     # timed calls per stage, best kept
+WARMUP = 1                     # untimed calls before them
+
+
+# -------------------------------
+# Fixtures
+# -------------------------------
+
+def make_fixture(rows, seed=0):
+    """Write (once) a Play Store-shaped CSV with `rows` rows and return its path."""
+    path = os.path.join(BENCH_DIR, f'fixture-{rows}-{seed}.csv')
+    if os.path.exists(path):
+        return path
+    raw = pd.read_csv(resolve_path(), dtype=str, keep_default_na=False)
+    raw = raw[raw['Installs'].str.endswith('+')]   # drop the shifted record
+    rng = np.random.default_rng(seed)
+
+    columns = {}
+    for col in raw.columns:
+        counts = raw[col].value_counts()
+        columns[col] = rng.choice(counts.index.to_numpy(), size=rows,
+                                  p=(counts / counts.sum()).to_numpy())
+    # Keep Rating/Reviews/Installs correlated like the real data by sampling them as rows
+    linked = raw[['Rating', 'Reviews', 'Installs']].to_numpy()
+    picks = linked[rng.integers(0, len(linked), size=rows)]
+    for i, col in enumerate(['Rating', 'Reviews', 'Installs']):
+        columns[col] = picks[:, i]
+
+    os.makedirs(BENCH_DIR, exist_ok=True)
+    pd.DataFrame(columns)[raw.columns].to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    return path
+
+
+# -------------------------------
+# Stage runner
+# -------------------------------
+
+class Bench:
+
+    def __init__(self, rows, repeat=REPEAT, warmup=WARMUP):
+        self.rows = rows
+        self.repeat = max(1, repeat)
+        self.warmup = warmup
+        self.stages = []
+
+    def stage(self, name, func, *args, once=False):
+        """Best wall time of func(*args) and, in a separate traced call, its peak allocation."""
+        for _ in range(0 if once else self.warmup):
+            func(*args)
+        seconds = float('inf')
+        gc.collect()
+        gc.disable()   # like timeit: no collector pauses inside the timed calls
+        try:
+            for _ in range(1 if once else self.repeat):
+                t0 = time.perf_counter()
+                result = func(*args)
+                seconds = min(seconds, time.perf_counter() - t0)
+        finally:
+            gc.enable()
+        peak_mb = None
+        if not once:
+            tracemalloc.start()
+            func(*args)
+            peak_mb = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+            tracemalloc.stop()
+        self.stages.append({'stage': name, 'seconds': round(seconds, 6), 'peak_mb': peak_mb})
+        peak = '-' if peak_mb is None else f"{peak_mb:.1f}"
+        print(f"  {name:<40}{seconds:>10.4f}s {peak:>10} MB")
+        return result
+
+
+def _task_stages(bench, df):
+    """task@1.py - task@6.py (analyses.py) on the compact catalog, and a 50-combination threshold sweep."""
+    catalog = bench.stage('clean/compact', compact_catalog, df)
+    for name, analysis in [('task1', analyses.top_categories), ('task2', analyses.free_vs_paid),
+                           ('task3', analyses.category_map), ('task4', analyses.cumulative_installs),
+                           ('task5', analyses.size_vs_rating), ('task6', analyses.installs_by_month)]:
+        bench.stage(f'aggregate/{name}', analysis, catalog)
+
+    grid = {'min_rating': [3.0, 3.5, 4.0, 4.2, 4.4, 4.5, 4.6, 4.7, 4.8, 5.0], 'min_size': [0, 5, 10, 20, 50]}
+    bench.stage('sweep/top_categories_per_call',
+                lambda: {c: analyses.top_categories(catalog, *c) for c in itertools.product(*grid.values())})
+    bench.stage('sweep/top_categories_one_pass', analyses.sweep, analyses.top_categories, catalog, grid)
+
+
+def _rank_stages(bench, df):
+    """Leaderboards: first ranking, re-ranking by another metric, appended rows, top apps per group."""
+    head, tail = df.iloc[:len(df) - len(df) // 100], df.iloc[len(df) - len(df) // 100:]
+    board = Leaderboard(head)
+    bench.stage('rank/leaderboard_first', board.top, 'Installs', 10, once=True)
+    bench.stage('rank/leaderboard_other_metric', board.top, 'Rating', 10, (), 100, once=True)
+    bench.stage('rank/leaderboard_append_1pct', board.append, tail, once=True)
+    bench.stage('rank/leaderboard_after_append', board.top, 'Installs', 10, once=True)
+    bench.stage('rank/top_apps_per_category', top_k_per_group, df, 10, 'Installs', 'Category')
+
+
+def _pricing_stages(bench, df):
+    """Segment pricing stats: one build, then a point query and a rollup."""
+    cube = bench.stage('pricing/segments_build', PricingCube, df)
+    bench.stage('pricing/query', lambda: cube.query(Category='GAME', Android=['4.x', '5.x']))
+    bench.stage('pricing/breakdown_category', cube.breakdown, 'Category')
+
+
+def _genre_stages(bench, df):
+    """Genre index build and queries, against splitting the Genres strings per row."""
+    bench.stage('genres/split_explode', lambda: df['Genres'].astype(object).str.split(';').explode())
+    index = bench.stage('genres/index_build', GenreIndex, df)
+    bench.stage('genres/having', index.having, ['Action', 'Casual'])
+    bench.stage('genres/aggregate', index.aggregate)
+    bench.stage('genres/cooccurrence', index.cooccurrence)
+
+
+def _bubble_stages(bench, df):
+    """task@5's bubble chart on a fresh Agg figure, then redrawn on the pooled one, and saved."""
+    import io
+    import mpl_charts
+
+    apps = df[(df['Rating'] > 3.5) & (df['Installs'] > 50000)].dropna(subset=['Size_MB'])
+    apps = apps.assign(Category_Label=apps['Category'].astype(str))
+    mpl_charts._pool.pop('size_vs_rating', None)
+    bubble = lambda: mpl_charts.draw('size_vs_rating', apps, pooled=True)
+    bench.stage('render/bubble_first', bubble, once=True)
+    fig = bench.stage('render/bubble_pooled', bubble)
+    bench.stage('render/bubble_to_png', lambda: fig.savefig(io.BytesIO(), format='png'))
+
+
+def run_scale(rows, render=True, repeat=REPEAT):
+    import dashboard
+
+    bench = Bench(rows, repeat)
+    print(f"\n== {rows:,} rows")
+    path = bench.stage('fixture', make_fixture, rows, once=True)
+
+    raw = bench.stage('load/read_csv', pd.read_csv, path)
+    bench.stage('clean/installs', parsers.parse_installs, raw['Installs'])
+    bench.stage('clean/reviews', lambda: pd.to_numeric(raw['Reviews'], errors='coerce'))
+    bench.stage('clean/price', parsers.parse_price, raw['Price'])
+    bench.stage('clean/size', parsers.parse_size, raw['Size'])
+    bench.stage('clean/android_ver', parsers.parse_android_version, raw['Android Ver'])
+    bench.stage('clean/name_features', parsers.parse_app_names, raw['App'])
+    bench.stage('clean/last_updated',
+                lambda: pd.to_datetime(raw['Last Updated'], format='%B %d, %Y', errors='coerce'))
+    df = bench.stage('clean/all', clean_playstore, raw)
+    del raw
+
+    specs = [spec for _, spec, _, _ in dashboard.charts_config]
+    for spec in specs:
+        bench.stage(f'aggregate/dashboard_{spec.name}', compute_chart_data, df, [spec])
+    data = bench.stage('aggregate/dashboard_all_specs', compute_chart_data, df, specs)
+    index = FilterIndex(df)
+    bench.stage('aggregate/dashboard_indexed_cold',
+                lambda: compute_chart_data(df, specs, MaskCache(df, index)), once=True)
+    bench.stage('aggregate/dashboard_indexed_warm',
+                lambda: compute_chart_data(df, specs, MaskCache(df, index)))
+    cube = bench.stage('aggregate/rollup_cube_build', build_cube, df)
+    for spec in specs:
+        try:
+            bench.stage(f'aggregate/cube_{spec.name}', cube_query, cube, spec.filters, spec.keys, spec.aggs)
+        except CubeMiss:
+            pass
+    _task_stages(bench, df)
+    _rank_stages(bench, df)
+    _pricing_stages(bench, df)
+    _genre_stages(bench, df)
+
+    if render:
+        import plotly.io as pio
+        for spec in specs:
+            fig = bench.stage(f'render/{spec.name}_figure', spec.plot, data[spec.name])
+            if fig is not None:
+                bench.stage(f'render/{spec.name}_to_html',
+                            lambda: pio.to_html(fig, full_html=False, include_plotlyjs='cdn'))
+        _bubble_stages(bench, df)
+
+    return {'rows': rows, 'stages': bench.stages}
+
+
+# -------------------------------
+# Reporting
+# -------------------------------
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss is KB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(maxrss / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, previous, threshold=REGRESSION_THRESHOLD):
+    """List of (rows, stage, old_seconds, new_seconds) for stages that got slower."""
+    old = {(run['rows'], s['stage']): s['seconds'] for run in previous['runs'] for s in run['stages']}
+    regressions = []
+    for run in current['runs']:
+        for s in run['stages']:
+            before = old.get((run['rows'], s['stage']))
+            if before is None or s['stage'] == 'fixture':
+                continue
+            if s['seconds'] > before * (1 + threshold) and s['seconds'] - before > REGRESSION_MIN_SECONDS:
+                regressions.append((run['rows'], s['stage'], before, s['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load/clean/aggregate/render stages")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--out', default=None, help="write results to this JSON file")
+    parser.add_argument('--compare', default=None, help="previous results JSON to check against")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument('--no-render', action='store_true', help="skip figure construction/serialization")
+    parser.add_argument('--repeat', type=int, default=REPEAT, help="timed calls per stage (best kept)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': args.repeat,
+        'runs': [run_scale(rows, render=not args.no_render, repeat=args.repeat) for rows in args.rows],
+    }
+    results['peak_rss_mb'] = peak_rss_mb()
+    print(f"\nPeak RSS: {results['peak_rss_mb']} MB")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        regressions = compare(results, previous, args.threshold)
+        for rows, stage, before, after in regressions:
+            print(f"⚠️  REGRESSION {rows:,} rows {stage}: {before:.4f}s -> {after:.4f}s")
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
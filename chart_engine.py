@@ -0,0 +1,239 @@
+import functools
+import hashlib
+import types
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+import instrument
+from instrument import traced
+from playstore_data import DATA_FILE, column, filter_mask
+from playstore_stream import CHUNK_SIZE, iter_clean_chunks
+
+# =====================================
+# Declarative chart specs + single-pass aggregation engine
+# =====================================
+# A chart is described by its filters, group keys and aggregates instead of a
+# function that slices the frame itself. The engine evaluates every distinct
+# predicate once, then answers all keyed specs with ONE groupby over the union
+# of their keys: each spec contributes masked measure columns (value where
+# its filter holds, 0 elsewhere), and its own result is a cheap re-aggregation
+# of that small table. Adding a chart adds a few columns, not another scan.
+
+DECOMPOSABLE = ('sum', 'count', 'mean')
+
+
+@dataclass
+class ChartSpec:
+    """What a chart needs from the data, and how to draw it.
+
+    keys=None means the chart plots filtered rows rather than aggregates;
+    aggs maps output name -> (column, func) like DataFrame.groupby().agg().
+    plot receives the computed data and returns a figure (or None when empty);
+    it is None for specs that are only maintained as aggregates.
+    """
+    name: str
+    plot: callable
+    filters: list = field(default_factory=list)
+    keys: list = None
+    aggs: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        for out, (col, func) in self.aggs.items():
+            if func not in DECOMPOSABLE:
+                raise ValueError(f"{self.name}: aggregate {out!r} uses {func!r}, "
+                                 f"expected one of {DECOMPOSABLE}")
+        if self.aggs and not self.keys:
+            raise ValueError(f"{self.name}: aggregates need group keys")
+
+    def fingerprint(self):
+        """Identity of the spec for caching: changes when its definition or plot code does."""
+        h = hashlib.sha1()
+        h.update(repr((self.name, self.keys, sorted(self.aggs.items()))).encode())
+        for f in self.filters:
+            if callable(f):
+                _hash_callable(h, f)
+            else:
+                h.update(repr(f).encode())
+        if self.plot is not None:
+            _hash_callable(h, self.plot)
+        return h.hexdigest()
+
+
+def _hash_callable(h, f):
+    """f's code plus the values it runs with: default arguments, closure cells, partial() arguments."""
+    if isinstance(f, functools.partial):
+        _hash_callable(h, f.func)
+        h.update(repr((f.args, sorted(f.keywords.items()))).encode())
+        return
+    _hash_code(h, f.__code__)
+    h.update(repr((f.__defaults__, sorted((f.__kwdefaults__ or {}).items()))).encode())
+    for cell in f.__closure__ or ():
+        value = cell.cell_contents
+        if callable(value) and hasattr(value, '__code__'):
+            _hash_callable(h, value)
+        else:
+            h.update(repr(value).encode())
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+
+class MaskCache:
+    """Evaluate each distinct predicate once per frame and reuse it across specs.
+
+    With a FilterIndex (predicate_index) over the same frame, single predicates
+    are answered from its indexes and its cache outlives this MaskCache.
+    """
+
+    def __init__(self, df, index=None):
+        self.df = df
+        self.index = index
+        self._masks = {}
+
+    def _key(self, f):
+        if callable(f):
+            return ('callable', id(f))
+        col, op, value = f
+        if isinstance(value, (list, set)):
+            value = tuple(value)
+        return (col, op, value)
+
+    def predicate(self, f):
+        key = self._key(f)
+        if key not in self._masks:
+            if self.index is not None:
+                self._masks[key] = self.index.mask(f)
+            else:
+                self._masks[key] = filter_mask(self.df, [f])
+        return self._masks[key]
+
+    def mask(self, filters):
+        if not filters:
+            return np.ones(len(self.df), dtype=bool)
+        key = tuple(self._key(f) for f in filters)
+        if key not in self._masks:
+            mask = self.predicate(filters[0]).copy()
+            for f in filters[1:]:
+                mask &= self.predicate(f)
+            self._masks[key] = mask
+        return self._masks[key]
+
+
+# -------------------------------
+# Planning and execution
+# -------------------------------
+
+def _union_keys(specs):
+    keys = []
+    for spec in specs:
+        for k in spec.keys:
+            if k not in keys:
+                keys.append(k)
+    return keys
+
+
+@traced('groupby')
+def measure_table(df, specs, masks, plain_keys=False):
+    """One groupby over the union of keys with every spec's masked measures.
+
+    plain_keys turns categorical keys into objects so tables built from
+    chunks with different category sets can be combined.
+    """
+    keys = _union_keys(specs)
+    columns = {}
+    for spec in specs:
+        mask = masks.mask(spec.filters)
+        columns[(spec.name, '__rows', 'count')] = mask.astype('int64')
+        for out, (col, func) in spec.aggs.items():
+            values = column(df, col).to_numpy()
+            valid = mask & pd.notna(values)
+            if func in ('sum', 'mean'):
+                # Widen compact (int32/float32) columns so sums neither overflow nor lose precision
+                values = values.astype('float64' if values.dtype.kind == 'f' or func == 'mean' else 'int64')
+                columns[(spec.name, out, 'sum')] = np.where(valid, values, 0)
+            if func in ('count', 'mean'):
+                columns[(spec.name, out, 'count')] = valid.astype('int64')
+
+    table = pd.DataFrame(columns, index=df.index)
+    table.columns = pd.MultiIndex.from_tuples(table.columns)
+    groupers = []
+    for k in keys:
+        key = column(df, k)
+        if plain_keys and isinstance(key.dtype, pd.CategoricalDtype):
+            key = key.astype(object)
+        groupers.append(key)
+    return table.groupby(groupers, observed=True, dropna=False, sort=False).sum()
+
+
+def combine_tables(tables):
+    """Merge measure tables from several chunks (all columns are additive)."""
+    both = pd.concat(tables)
+    return both.groupby(level=list(range(both.index.nlevels)), dropna=False, sort=False).sum()
+
+
+def finish_spec(table, spec):
+    """One spec's groupby result from a measure table (any superset of its keys)."""
+    part = table[spec.name]
+    part = part.groupby(level=list(spec.keys), observed=True).sum().sort_index()
+    part = part[part[('__rows', 'count')] > 0]
+
+    out = pd.DataFrame(index=part.index)
+    for name, (col, func) in spec.aggs.items():
+        if func == 'sum':
+            out[name] = part[(name, 'sum')]
+        elif func == 'count':
+            out[name] = part[(name, 'count')]
+        else:
+            count = part[(name, 'count')]
+            out[name] = part[(name, 'sum')] / count.where(count > 0)
+    return out.reset_index()
+
+
+@traced('aggregate')
+def compute_chart_data(df, specs, masks=None):
+    """Data for every spec from a single pass over df: {spec.name: DataFrame}."""
+    masks = masks or MaskCache(df)
+    if instrument.ENABLED:
+        for spec in specs:
+            if spec.filters:
+                instrument.funnel(spec.name, len(df), spec.filters, masks.predicate)
+    keyed = [s for s in specs if s.keys]
+    results = {}
+    if keyed:
+        table = measure_table(df, keyed, masks)
+        for spec in keyed:
+            results[spec.name] = finish_spec(table, spec)
+    for spec in specs:
+        if not spec.keys:
+            results[spec.name] = df[masks.mask(spec.filters)] if spec.filters else df
+    return results
+
+
+@traced('aggregate')
+def stream_chart_data(specs, path=DATA_FILE, chunksize=CHUNK_SIZE):
+    """Keyed specs computed chunk by chunk; memory is bounded by the group count."""
+    keyed = [s for s in specs if s.keys]
+    if len(keyed) != len(specs):
+        raise ValueError("Row-level specs need the full frame; stream keyed specs only")
+    table = None
+    for chunk in iter_clean_chunks(path, chunksize=chunksize):
+        part = measure_table(chunk, keyed, MaskCache(chunk), plain_keys=True)
+        table = part if table is None else combine_tables([table, part])
+    if table is None:
+        return {s.name: pd.DataFrame(columns=list(s.keys) + list(s.aggs)) for s in keyed}
+    return {spec.name: finish_spec(table, spec) for spec in keyed}
+
+
+def render_specs(df, specs):
+    """Compute all specs together, then plot each one: {spec.name: figure or None}."""
+    data = compute_chart_data(df, specs)
+    return {spec.name: spec.plot(data[spec.name]) for spec in specs}
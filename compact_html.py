@@ -0,0 +1,244 @@
+import base64
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# =====================================
+# Compact Plotly HTML output
+# =====================================
+# pio.to_html writes every figure as plain JSON, and repeats all trace data
+# once more per animation frame. figure_html() writes the same figure as:
+#   - typed arrays (base64 binary), narrowed to the smallest dtype that
+#     holds the values exactly (f8 -> i4/u4/f4 when lossless)
+#   - dictionary-encoded arrays where that is smaller: repeated categories,
+#     dates, the choropleth's 'India' on every row, install buckets, ratings
+#   - a per-figure store of payloads, so a value repeated between traces or
+#     animation frames is written once and referenced by index
+#   - the default layout template (~7 KB per chart) replaced by its name; the
+#     page head carries it once
+# A small loader (LOADER_JS) expands the references in the browser before
+# calling Plotly.newPlot. plotly.js itself is loaded once per page, from a
+# bundled local file (no network), inlined, or from the CDN.
+#
+# Scatter-like row-level charts can be thinned server-side to a point budget
+# with thin_points() before they are drawn.
+
+PLOTLYJS_FILE = 'plotly.min.js'
+POINT_BUDGET = 10_000      # max markers a row-level chart sends to the browser
+MIN_SHARED_BYTES = 64      # smaller payloads are cheaper inline than as a reference
+MIN_DICTIONARY_LENGTH = 16
+
+_PLOTLY_DTYPES = {'i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'f4', 'f8'}
+
+LOADER_JS = """
+window.psdPlot = window.psdPlot || function (id, fig, store) {
+  var TYPES = {i1: Int8Array, u1: Uint8Array, i2: Int16Array, u2: Uint16Array,
+               i4: Int32Array, u4: Uint32Array, f4: Float32Array, f8: Float64Array};
+  function decode(spec) {
+    var bin = atob(spec.bdata), bytes = new Uint8Array(bin.length);
+    for (var i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    return new TYPES[spec.dtype](bytes.buffer);
+  }
+  function expand(v) {
+    if (Array.isArray(v)) return v.map(expand);
+    if (v === null || typeof v !== 'object') return v;
+    if ('$ref' in v) return expand(store[v.$ref]);
+    if ('$template' in v) return window.psdTemplates[v.$template];
+    if ('$labels' in v) {
+      var labels = v.$labels;
+      return Array.prototype.map.call(decode(v.$codes), function (c) { return labels[c]; });
+    }
+    var out = {};
+    for (var k in v) out[k] = expand(v[k]);
+    return out;
+  }
+  fig = expand(fig);
+  Plotly.newPlot(id, fig.data, fig.layout || {}, fig.config || {}).then(function () {
+    if (fig.frames) return Plotly.addFrames(id, fig.frames);
+  });
+};
+"""
+
+
+# -------------------------------
+# Point budget
+# -------------------------------
+
+def thin_points(df, budget=POINT_BUDGET, by=None, seed=0):
+    """About `budget` rows of df for plotting, sampled evenly within each `by` group.
+
+    Every group keeps at least one row, so no legend entry disappears.
+    Row order is preserved; df needs a unique index.
+    """
+    if budget is None or len(df) <= budget:
+        return df
+    if by is None:
+        picked = df.sample(n=budget, random_state=seed).index
+    else:
+        groups = df.groupby(by, observed=True, sort=False)
+        picked = groups.sample(frac=budget / len(df), random_state=seed).index.union(groups.head(1).index)
+    return df[df.index.isin(picked)]
+
+
+# -------------------------------
+# Payload encoding
+# -------------------------------
+
+def _typed(values):
+    values = np.ascontiguousarray(values)
+    code = f"{values.dtype.kind}{values.dtype.itemsize}"
+    return {'dtype': code, 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+
+
+def _narrow(values):
+    """Smallest plotly.js typed-array dtype that holds values exactly."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        # Whole numbers go through the integer path, as long as int64 holds them exactly
+        if (len(values) and np.isfinite(values).all() and np.abs(values).max() < 2 ** 53
+                and np.array_equal(values, np.round(values))):
+            values = values.astype('int64')
+        else:
+            with np.errstate(over='ignore'):   # beyond float32's range: not equal, stays float64
+                exact = np.array_equal(values, values.astype('float32'), equal_nan=True)
+            return values.astype('float32' if exact else 'float64')
+    if values.dtype.kind == 'b':
+        return values.astype('uint8')
+    lo, hi = (int(values.min()), int(values.max())) if len(values) else (0, 0)
+    for dtype in ('uint8', 'int8', 'uint16', 'int16', 'uint32', 'int32'):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return values.astype(dtype)
+    return values.astype('float64')   # beyond int32: plotly.js has no 64-bit ints
+
+
+def _numbers(values):
+    """Typed array of values, or a dictionary of distinct values + codes when that is smaller."""
+    typed = _typed(_narrow(values))
+    if len(values) < MIN_DICTIONARY_LENGTH:
+        return typed
+    labels, codes = np.unique(values, return_inverse=True)
+    if len(labels) * 2 > len(values):
+        return typed
+    labels = [None if np.isnan(v) else (int(v) if float(v).is_integer() else float(v))
+              for v in labels.astype('float64')]
+    coded = {'$labels': labels, '$codes': _typed(_narrow(codes))}
+    return coded if len(json.dumps(coded)) < len(json.dumps(typed)) else typed
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+class _Encoder:
+
+    def __init__(self):
+        self.store = []
+        self._index = {}
+
+    def encode(self, value):
+        if isinstance(value, dict):
+            if value.keys() >= {'dtype', 'bdata'} and value['dtype'] in _PLOTLY_DTYPES and 'shape' not in value:
+                raw = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+                return self._share(_numbers(raw))
+            return {k: self.encode(v) for k, v in value.items()}
+        if isinstance(value, list):
+            if len(value) >= MIN_DICTIONARY_LENGTH:
+                if all(_is_number(v) for v in value):
+                    return self._share(_numbers(np.array(value, dtype='float64')))
+                if all(isinstance(v, str) for v in value):
+                    labels, codes = np.unique(np.array(value, dtype=object), return_inverse=True)
+                    if len(labels) * 2 <= len(value):
+                        return self._share({'$labels': labels.tolist(), '$codes': _typed(_narrow(codes))})
+            return self._share([self.encode(v) for v in value])
+        return value
+
+    def _share(self, payload):
+        text = json.dumps(payload, separators=(',', ':'))
+        if len(text) < MIN_SHARED_BYTES:
+            return payload
+        ref = self._index.get(text)
+        if ref is None:
+            ref = self._index[text] = len(self.store)
+            self.store.append(payload)
+        return {'$ref': ref}
+
+
+def _script_json(value):
+    # "</script>" inside a string must not end the script block
+    return json.dumps(value, separators=(',', ':')).replace('</', '<\\/')
+
+
+def _default_template():
+    """(name, plain JSON) of the template figures get when they do not set one."""
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    name = pio.templates.default
+    blank = json.loads(pio.to_json(go.Figure(layout={'template': name}), validate=False))
+    return name, blank['layout']['template']
+
+
+def figure_html(fig, config=None):
+    """HTML fragment drawing fig through the compact loader (see LOADER_JS)."""
+    import plotly.io as pio
+
+    plain = json.loads(pio.to_json(fig, validate=False))
+    plain['config'] = dict({'responsive': True}, **(config or {}))
+    name, template = _default_template()
+    if plain.get('layout', {}).get('template') == template:
+        plain['layout']['template'] = {'$template': name}
+    encoder = _Encoder()
+    body = encoder.encode(plain)
+    payload = _script_json(body)
+    store = _script_json(encoder.store)
+    div_id = 'fig-' + hashlib.sha1((payload + store).encode()).hexdigest()[:12]
+    return (f'<div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>'
+            f'<script>psdPlot("{div_id}", {payload}, {store});</script>')
+
+
+# -------------------------------
+# plotly.js
+# -------------------------------
+
+def write_plotlyjs(folder):
+    """Write the bundled plotly.js next to the page (once per plotly version)."""
+    import plotly
+    from plotly.offline import get_plotlyjs
+
+    path = os.path.join(folder, PLOTLYJS_FILE)
+    stamp = f"/* plotly.py {plotly.__version__} */\n"
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.readline() == stamp:
+                return path
+    except OSError:
+        pass
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        f.write(stamp + get_plotlyjs())
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def head_scripts(plotlyjs='local', folder='.', url_prefix=''):
+    """<script> tags loading plotly.js ('local', 'inline' or 'cdn') and the loader.
+
+    url_prefix goes in front of the local plotly.min.js src -- '/' when the
+    page is served from a nested path such as /chart/<n>.
+    """
+    if plotlyjs == 'local':
+        write_plotlyjs(folder)
+        tag = f'<script src="{url_prefix}{PLOTLYJS_FILE}"></script>'
+    elif plotlyjs == 'inline':
+        from plotly.offline import get_plotlyjs
+        tag = f'<script>{get_plotlyjs()}</script>'
+    elif plotlyjs == 'cdn':
+        from plotly.offline import get_plotlyjs_version
+        tag = f'<script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>'
+    else:
+        raise ValueError(f"plotlyjs must be 'local', 'inline' or 'cdn', not {plotlyjs!r}")
+    name, template = _default_template()
+    templates = _script_json({name: template})
+    return f'{tag}\n<script>{LOADER_JS}window.psdTemplates = {templates};</script>'
@@ -1,79 +1,91 @@
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.io as pio
-from datetime import datetime, time
+from datetime import datetime
 import pytz
-import numpy as np
 import os
 import webbrowser
 
+from chart_engine import ChartSpec, MaskCache, compute_chart_data, stream_chart_data
+from compact_html import POINT_BUDGET, figure_html, head_scripts, thin_points
+from figure_cache import MAX_CACHE_BYTES, FigureCache, cache_key
+from instrument import stage
+from parallel_render import render_parallel
+from playstore_data import data_version, load_playstore, resolve_path, with_columns
+from predicate_index import FilterIndex
+from ranking import top_k
+from rollup_cube import CubeMiss, load_cube, query as cube_query
+from time_windows import WINDOWS, in_window
+
 # ==========================================
 # 1. CONFIGURATION
 # ==========================================
 
-IGNORE_TIME_LIMITS = False  # ⬅️ Set True to show all charts (testing)
-
-try:
-    df = pd.read_csv('play store data.csv')
-except FileNotFoundError:
-    print("❌ play store data.csv not found")
-    exit()
+STREAMING = False           # ⬅️ Set True to build the aggregate charts chunk by chunk (bounded memory)
+FIGURE_CACHE = True         # ⬅️ Reuse rendered charts while the data and chart specs are unchanged
+PARALLEL_WORKERS = 0        # ⬅️ Set >1 to render charts concurrently in a process pool
+ROLLUP_CUBE = True          # ⬅️ Answer aggregate charts from the monthly rollup cube when it can
+COMPACT_HTML = True         # ⬅️ Typed-array chart payloads, shared across animation frames (compact_html.py)
+PLOTLYJS = 'local'          # ⬅️ 'local' (bundled file next to the page, works offline), 'inline' or 'cdn'
 
 ist = pytz.timezone("Asia/Kolkata")
-now = datetime.now(ist)
-current_time = now.time()
 
-print("Current IST Time:", current_time)
+_df = None
+_index = None
+_version = None
 
-# ==========================================
-# 2. DATA CLEANING
-# ==========================================
+def use_data_version(version):
+    """Drop the loaded frame and its indexes when the data file has changed since they were loaded."""
+    global _df, _index, _version
+    if version != _version:
+        _df = _index = None
+        _version = version
 
-df['Installs'] = df['Installs'].astype(str).str.replace(r'[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
+def get_df():
+    """Load the cleaned dataset the first time a chart needs it."""
+    global _df
+    if _df is None:
+        _df = load_playstore()
+    return _df
 
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
-df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
+def get_index():
+    """Filter indexes over get_df(), shared by every chart data request."""
+    global _index
+    if _index is None:
+        _index = FilterIndex(get_df())
+    return _index
 
-df['Price'] = df['Price'].astype(str).str.replace('$', '', regex=False).replace(['Free','free'],'0')
-df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
+# ==========================================
+# 2. CHART SPECS
+# ==========================================
+# Each chart declares its filters, group keys and aggregates; chart_engine
+# computes every enabled chart in one pass and hands the result to its plot_*.
 
-def clean_size(x):
-    x = str(x)
-    if 'M' in x:
-        return float(x.replace('M',''))
-    if 'k' in x:
-        return float(x.replace('k','')) / 1024
-    return np.nan
+CHART1_FILTERS = [('Rating','>=',4), ('Size_MB','>=',10)]
+CHART1_AGGS = dict(Rating=('Rating','mean'), Reviews=('Reviews','sum'))
 
-df['Size_MB'] = df['Size'].apply(clean_size)
+CHART2_FILTERS = [('Installs','>',10000)]
+CHART2_AGGS = dict(Installs=('Installs','mean'), Price=('Price','mean'),
+                   Total=('Installs','sum'))
 
-df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-df['Month'] = df['Last Updated'].dt.to_period('M').dt.to_timestamp()
-df['Category'] = df['Category'].str.upper()
+CHART4_FILTERS = [('Rating','>=',4.2), ('Reviews','>',1000)]
+CHART5_FILTERS = [('Installs','>',50000), ('Reviews','>',500)]
+CHART6_FILTERS = [('Reviews','>',500)]
 
-# ==========================================
-# 3. CHART FUNCTIONS
-# ==========================================
+MONTHLY_INSTALLS = dict(Installs=('Installs','sum'))
 
-def chart1():
-    temp = df[(df['Rating']>=4) & (df['Size_MB']>=10)]
-    if temp.empty: return None
-    grp = temp.groupby('Category').agg(Rating=('Rating','mean'),
-                                       Reviews=('Reviews','sum')).reset_index()
-    top = grp.sort_values('Reviews', ascending=False).head(10)
+# plotly is imported by the plot functions, so a run with every chart locked never loads it
+
+def plot_chart1(grp):
+    import plotly.express as px
+    if grp.empty: return None
+    top = top_k(grp, 10, 'Reviews')
     m = top.melt(id_vars='Category')
     return px.bar(m, x='Category', y='value', color='variable',
                   barmode='group', title='Ratings vs Reviews')
 
-def chart2():
-    temp = df[df['Installs']>10000]
-    if temp.empty: return None
-    top = temp.groupby('Category')['Installs'].sum().nlargest(3).index
-    agg = temp[temp['Category'].isin(top)].groupby(['Category','Type']).agg(
-        Installs=('Installs','mean'),
-        Price=('Price','mean')).reset_index()
+def plot_chart2(agg):
+    import plotly.graph_objects as go
+    if agg.empty: return None
+    top = top_k(agg.groupby('Category', observed=True)['Total'].sum(), 3).index
+    agg = agg[agg['Category'].isin(top)]
     fig = go.Figure()
     for t in ['Free','Paid']:
         s = agg[agg['Type']==t]
@@ -85,11 +97,11 @@ def chart2():
                       yaxis2=dict(title='Price', overlaying='y', side='right'))
     return fig
 
-def chart3():
-    temp = df.copy()
-    temp['Country'] = 'India'
-    top = temp.groupby('Category')['Installs'].sum().nlargest(5).index
-    temp = temp[temp['Category'].isin(top)]
+def plot_chart3(df):
+    import plotly.express as px
+    top = top_k(df.groupby('Category', observed=True)['Installs'].sum(), 5).index
+    temp = thin_points(df[df['Category'].isin(top)], POINT_BUDGET, by='Category')
+    temp = with_columns(temp, 'Country')
     if temp.empty: return None
     return px.choropleth(temp, locations='Country',
                          locationmode='country names',
@@ -97,75 +109,181 @@ def chart3():
                          animation_frame='Category',
                          title='Installs by Category (India)')
 
-def chart4():
-    temp = df[(df['Rating']>=4.2) & (df['Reviews']>1000)]
-    grp = temp.groupby(['Month','Category'])['Installs'].sum().reset_index()
+def plot_chart4(grp):
+    import plotly.express as px
     if grp.empty: return None
     return px.area(grp, x='Month', y='Installs', color='Category',
                    title='Cumulative Growth')
 
-def chart5():
-    temp = df[(df['Installs']>50000) & (df['Reviews']>500)]
+def plot_chart5(temp):
+    import plotly.express as px
     if temp.empty: return None
+    temp = thin_points(temp, POINT_BUDGET, by='Category')
     return px.scatter(temp, x='Size_MB', y='Rating',
                       size='Installs', color='Category',
                       title='Size vs Rating')
 
-def chart6():
-    temp = df[df['Reviews']>500]
-    grp = temp.groupby(['Month','Category'])['Installs'].sum().reset_index()
+def plot_chart6(grp):
+    import plotly.express as px
     if grp.empty: return None
     return px.line(grp, x='Month', y='Installs', color='Category',
                    title='Category Trend')
 
+chart1 = ChartSpec('chart1', plot_chart1, CHART1_FILTERS, ['Category'], CHART1_AGGS)
+chart2 = ChartSpec('chart2', plot_chart2, CHART2_FILTERS, ['Category','Type'], CHART2_AGGS)
+chart3 = ChartSpec('chart3', plot_chart3)
+chart4 = ChartSpec('chart4', plot_chart4, CHART4_FILTERS, ['Month','Category'], MONTHLY_INSTALLS)
+chart5 = ChartSpec('chart5', plot_chart5, CHART5_FILTERS)
+chart6 = ChartSpec('chart6', plot_chart6, CHART6_FILTERS, ['Month','Category'], MONTHLY_INSTALLS)
+
+def cube_chart_data(specs):
+    """Data for the specs the rollup cube answers exactly; the rest are left out."""
+    data = {}
+    keyed = [s for s in specs if s.keys]
+    if not keyed:
+        return data
+    cube = load_cube(get_df, streaming=STREAMING)
+    for spec in keyed:
+        try:
+            data[spec.name] = cube_query(cube, spec.filters, spec.keys, spec.aggs)
+        except CubeMiss:
+            pass
+    return data
+
+def chart_data(specs):
+    """Data for all enabled charts; aggregate charts are streamed when STREAMING is on."""
+    data = cube_chart_data(specs) if ROLLUP_CUBE else {}
+    specs = [s for s in specs if s.name not in data]
+    if not specs:
+        return data
+    if not STREAMING:
+        data.update(compute_chart_data(get_df(), specs, MaskCache(get_df(), get_index())))
+        return data
+    keyed = [s for s in specs if s.keys]
+    rows = [s for s in specs if not s.keys]
+    if keyed:
+        data.update(stream_chart_data(keyed))
+    if rows:
+        data.update(compute_chart_data(get_df(), rows, MaskCache(get_df(), get_index())))
+    return data
+
 # ==========================================
-# 4. TIME CONFIG
+# 3. TIME CONFIG
 # ==========================================
 
+# Windows are registered under the chart's spec name in time_windows.WINDOWS
 charts_config = [
-    ("Chart 1", chart1, time(13,0), time(14,0)),
-    ("Chart 2", chart2, time(14,0), time(15,0)),
-    ("Chart 3", chart3, time(15,0), time(16,0)),
-    ("Chart 4", chart4, time(16,0), time(17,0)),
-    ("Chart 5", chart5, time(17,0), time(18,0)),
-    ("Chart 6", chart6, time(18,0), time(19,0)),
+    (f"Chart {i}", spec, WINDOWS[spec.name].start, WINDOWS[spec.name].end)
+    for i, spec in enumerate([chart1, chart2, chart3, chart4, chart5, chart6], start=1)
 ]
 
-html = ""
+HTML_OPTIONS = dict(full_html=False, include_plotlyjs='cdn')
 
-for title, func, start, end in charts_config:
-    allowed = (start <= current_time <= end) or IGNORE_TIME_LIMITS
-    html += f"<h2>{title}</h2>"
-    if allowed:
-        fig = func()
+def render_fragment(spec, data):
+    import plotly.io as pio
+    with stage('render', spec.name, rows_in=len(data)):
+        fig = spec.plot(data)
         if fig:
-            html += pio.to_html(fig, full_html=False, include_plotlyjs='cdn')
-        else:
-            html += "<p>No data available</p>"
-    else:
-        html += f"""
+            return figure_html(fig) if COMPACT_HTML else pio.to_html(fig, **HTML_OPTIONS)
+    return "<p>No data available</p>"
+
+def page_head(folder='.', url_prefix=''):
+    """Scripts every compact fragment needs (plotly.js + the payload loader), loaded once."""
+    return head_scripts(PLOTLYJS, folder, url_prefix) if COMPACT_HTML else ""
+
+def locked_fragment(start, end):
+    return f"""
         <div style="padding:40px;border:2px dashed red;text-align:center;">
             🔒 Available between <b>{start.strftime('%H:%M')}</b> and <b>{end.strftime('%H:%M')}</b> IST
         </div>
         """
 
+def fragment_key(spec, version):
+    """Figure cache key of a chart's rendered fragment."""
+    return cache_key(version, spec.fingerprint(), HTML_OPTIONS, COMPACT_HTML, POINT_BUDGET)
+
+def build_fragments(specs, cache=None, version=None):
+    """HTML fragment per spec name: cached ones first, the misses in one engine pass."""
+    fragments = {}
+    if cache:
+        version = version or data_version()
+        cache_keys = {spec.name: fragment_key(spec, version) for spec in specs}
+        for spec in specs:
+            fragments[spec.name] = cache.get(cache_keys[spec.name])
+
+    missing = [spec for spec in specs if fragments.get(spec.name) is None]
+    if PARALLEL_WORKERS > 1 and len(missing) > 1:
+        keyed = chart_data([spec for spec in missing if spec.keys])
+        rendered = render_parallel(missing, render_fragment, keyed, get_df,
+                                   version or data_version(), PARALLEL_WORKERS)
+        fragments.update(zip([spec.name for spec in missing], rendered))
+    else:
+        data = chart_data(missing)
+        for spec in missing:
+            fragments[spec.name] = render_fragment(spec, data[spec.name])
+    if cache:
+        for spec in missing:
+            cache.put(cache_keys[spec.name], fragments[spec.name])
+    return fragments
+
 # ==========================================
-# 5. FINAL HTML
+# 4. FINAL HTML
 # ==========================================
 
-final_html = f"""
+def page_html(body, subtitle, head=""):
+    return f"""
 <html>
-<head><title>Time Based Dashboard</title></head>
+<head><title>Time Based Dashboard</title>
+{head}
+</head>
 <body>
 <h1 style="text-align:center;">Play Store Analytics (IST)</h1>
-<p style="text-align:center;">Generated at {now.strftime('%H:%M:%S')} IST</p>
-{html}
+<p style="text-align:center;">{subtitle}</p>
+{body}
 </body>
 </html>
 """
 
-with open("dashboard.html", "w", encoding="utf-8") as f:
-    f.write(final_html)
+def main(output="dashboard.html", open_browser=True):
+    try:
+        resolve_path()
+    except FileNotFoundError:
+        print("❌ play store data.csv not found")
+        exit()
+
+    now = datetime.now(ist)
+    current_time = now.time()
+    print("Current IST Time:", current_time)
+
+    enabled = [spec for title, spec, start, end in charts_config
+               if in_window(start, end, current_time)]
+    cache = FigureCache(max_bytes=MAX_CACHE_BYTES) if FIGURE_CACHE else None
+    fragments = build_fragments(enabled, cache)
+
+    html = ""
+    for title, spec, start, end in charts_config:
+        html += f"<h2>{title}</h2>"
+        if in_window(start, end, current_time):
+            html += fragments[spec.name]
+        else:
+            html += locked_fragment(start, end)
+
+    final_html = page_html(html, f"Generated at {now.strftime('%H:%M:%S')} IST",
+                           page_head(os.path.dirname(os.path.abspath(output))) if enabled else "")
+
+    with open(output, "w", encoding="utf-8") as f:
+        f.write(final_html)
+
+    if open_browser:
+        webbrowser.open("file://" + os.path.abspath(output))
+        print("✅ Time-based dashboard opened")
+    else:
+        print(f"✅ Time-based dashboard written to {output}")
+
+    if cache:
+        cache.close()
+        print(cache.report())
+
 
-webbrowser.open("file://" + os.path.abspath("dashboard.html"))
-print("✅ Time-based dashboard opened")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
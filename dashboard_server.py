@@ -0,0 +1,198 @@
+import argparse
+import hashlib
+import os
+import threading
+from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import dashboard
+from figure_cache import MAX_CACHE_BYTES, FigureCache
+from compact_html import PLOTLYJS_FILE
+from playstore_data import CACHE_DIR, data_version, resolve_path
+from precompute import PRECOMPUTE_LEAD, PrecomputeScheduler, Window
+import time_windows
+from time_windows import in_window, last_transition
+from window_cache import WindowCache
+
+# =====================================
+# Long-running dashboard server
+# =====================================
+# Loads and cleans the dataset once at startup, then evaluates the IST time
+# gates on every request. Routes:
+#   /                 full dashboard page (locked charts show the lock box)
+#   /chart/<n>        one chart's HTML fragment (403 while it is locked)
+#   /plotly.min.js    the bundled plotly.js (compact HTML output, no CDN)
+# Chart responses carry an ETag (data version + chart spec) and Last-Modified
+# (CSV mtime), so browsers and proxies can revalidate with 304s. The page also
+# depends on the gates: its ETag includes them and its Last-Modified is the
+# later of the CSV mtime and the last time a chart's window opened or closed.
+# A background scheduler (precompute.py) renders each chart shortly before
+# its window opens. Rendered fragments are held in a WindowCache under their
+# chart's window: dropped from memory once it has closed, and picked up from
+# the figure cache the next day while the data version is unchanged.
+
+CHARTS = {str(i): entry for i, entry in enumerate(dashboard.charts_config, start=1)}
+
+
+class DashboardState:
+    """Dataset, data version and rendered fragments shared by all request threads."""
+
+    def __init__(self, use_cache=True):
+        path = resolve_path()
+        self.version = data_version()
+        self.modified = os.path.getmtime(path)
+        dashboard.use_data_version(self.version)
+        dashboard.get_df()
+        self.cache = FigureCache(max_bytes=MAX_CACHE_BYTES) if use_cache else None
+        self._fragments = WindowCache(persist=False)   # the figure cache is the disk tier
+        self._lock = threading.Lock()
+        self.head = dashboard.page_head(CACHE_DIR, url_prefix='/')   # absolute: /chart/<n> too
+
+    def fragment(self, spec):
+        fragment = self._fragments.get(spec.name, 'fragment', self.version)
+        if fragment is None:
+            with self._lock:
+                fragment = self._fragments.get(spec.name, 'fragment', self.version)
+                if fragment is None:
+                    fragment = dashboard.build_fragments([spec], self.cache, self.version)[spec.name]
+                    if self.cache:
+                        self.cache.close()
+                    self._fragments.put(spec.name, 'fragment', self.version, fragment)
+        return fragment
+
+    def forget(self, spec):
+        """Drop a chart's rendered fragment from memory (its window has closed)."""
+        self._fragments.discard(spec.name)
+
+    def windows(self):
+        """One precompute window per chart in charts_config."""
+        return [Window(title, start, end,
+                       warm=lambda spec=spec: self.fragment(spec),
+                       expire=lambda spec=spec: self.forget(spec))
+                for title, spec, start, end in dashboard.charts_config]
+
+    def etag(self, *parts):
+        h = hashlib.sha1(self.version.encode())
+        for part in parts:
+            h.update(str(part).encode())
+        return f'"{h.hexdigest()[:20]}"'
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/') or '/'
+        current_time = datetime.now(dashboard.ist).time()
+
+        if path == '/':
+            gates = [in_window(start, end, current_time)
+                     for title, spec, start, end in dashboard.charts_config]
+            etag = self.state.etag('page', *gates,
+                                   *(spec.fingerprint() for _, spec, _, _ in dashboard.charts_config))
+            modified = max(self.state.modified,
+                           last_transition(spec.name for _, spec, _, _ in dashboard.charts_config).timestamp())
+            if self._not_modified(etag, modified):
+                return
+            body = ""
+            for (title, spec, start, end), allowed in zip(dashboard.charts_config, gates):
+                body += f"<h2>{title}</h2>"
+                body += self.state.fragment(spec) if allowed else dashboard.locked_fragment(start, end)
+            stamp = datetime.fromtimestamp(self.state.modified, dashboard.ist)
+            html = dashboard.page_html(body, f"Data updated {stamp.strftime('%Y-%m-%d %H:%M')} IST",
+                                       self.state.head)
+            return self._send(200, html, etag, modified=modified)
+
+        if path == '/' + PLOTLYJS_FILE:
+            try:
+                with open(os.path.join(CACHE_DIR, PLOTLYJS_FILE), 'rb') as f:
+                    script = f.read()
+            except OSError:  # PLOTLYJS is 'inline' or 'cdn'
+                return self._send(404, "<p>Not found</p>")
+            return self._send(200, script, content_type='application/javascript',
+                              cache_control='max-age=86400')
+
+        if path.startswith('/chart/'):
+            entry = CHARTS.get(path[len('/chart/'):])
+            if entry is None:
+                return self._send(404, "<p>Unknown chart</p>")
+            title, spec, start, end = entry
+            if not in_window(start, end, current_time):
+                return self._send(403, dashboard.locked_fragment(start, end))
+            etag = self.state.etag(spec.fingerprint())
+            if self._not_modified(etag):
+                return
+            return self._send(200, self.state.head + self.state.fragment(spec), etag)
+
+        self._send(404, "<p>Not found</p>")
+
+    def _not_modified(self, etag, modified=None):
+        modified = modified or self.state.modified
+        match = self.headers.get('If-None-Match')
+        if match is not None:
+            fresh = etag in [tag.strip() for tag in match.split(',')] or match.strip() == '*'
+        else:
+            since = self.headers.get('If-Modified-Since')
+            try:
+                fresh = since is not None and parsedate_to_datetime(since).timestamp() >= int(modified)
+            except (TypeError, ValueError):
+                fresh = False
+        if fresh:
+            self.send_response(304)
+            self._cache_headers(etag, modified)
+            self.end_headers()
+        return fresh
+
+    def _cache_headers(self, etag, modified=None):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', formatdate(modified or self.state.modified, usegmt=True))
+        # Time gates can flip at any moment, so clients must revalidate
+        self.send_header('Cache-Control', 'no-cache')
+
+    def _send(self, status, html, etag=None, content_type='text/html; charset=utf-8', cache_control=None,
+              modified=None):
+        body = html.encode('utf-8') if isinstance(html, str) else html
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self._cache_headers(etag, modified)
+        elif cache_control:
+            self.send_header('Cache-Control', cache_control)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host='127.0.0.1', port=8050, use_cache=True, lead=PRECOMPUTE_LEAD):
+    DashboardHandler.state = DashboardState(use_cache)
+    scheduler = None
+    if lead is not None:
+        scheduler = PrecomputeScheduler(DashboardHandler.state.windows(), lead=lead).start()
+    server = ThreadingHTTPServer((host, port), DashboardHandler)
+    print(f"✅ Dashboard server on http://{host}:{port}/  (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if scheduler:
+            scheduler.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the time-gated Play Store dashboard over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--ignore-time-limits', action='store_true',
+                        help="show every chart regardless of the IST windows (testing)")
+    parser.add_argument('--no-figure-cache', action='store_true')
+    parser.add_argument('--precompute-lead', type=float, default=PRECOMPUTE_LEAD.total_seconds() / 60,
+                        help="minutes before a window opens to render its chart in the background")
+    parser.add_argument('--no-precompute', action='store_true')
+    args = parser.parse_args()
+
+    time_windows.IGNORE_TIME_LIMITS = args.ignore_time_limits
+    serve(args.host, args.port, use_cache=not args.no_figure_cache,
+          lead=None if args.no_precompute else timedelta(minutes=args.precompute_lead))
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import time
+
+from playstore_data import CACHE_DIR
+
+# =====================================
+# On-disk cache for rendered chart HTML
+# =====================================
+# Fragments are stored one file per key under .cache/figures, with a small
+# JSON index recording size and last access. When the total size goes over
+# max_bytes the least recently used fragments are evicted.
+
+FIGURE_CACHE_DIR = os.path.join(CACHE_DIR, 'figures')
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def cache_key(*parts):
+    """Stable key for any JSON-serialisable parts (data version, spec fingerprint, params)."""
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()
+
+
+class FigureCache:
+
+    def __init__(self, directory=FIGURE_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index_path = os.path.join(directory, 'index.json')
+        self._index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp, self._index_path)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.html')
+
+    def get(self, key):
+        """Cached fragment or None; a hit refreshes the entry's LRU position."""
+        entry = self._index.get(key)
+        if entry is not None:
+            try:
+                with open(self._path(key), encoding='utf-8') as f:
+                    fragment = f.read()
+            except OSError:
+                del self._index[key]
+            else:
+                entry['atime'] = time.time()
+                self.hits += 1
+                return fragment
+        self.misses += 1
+        return None
+
+    def put(self, key, fragment):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(fragment)
+        os.replace(path + '.tmp', path)
+        self._index[key] = {'size': os.path.getsize(path), 'atime': time.time()}
+        self._evict()
+
+    def _evict(self):
+        total = sum(e['size'] for e in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]['atime']):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)['size']
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self.evictions += 1
+
+    def discard(self, key):
+        """Drop one entry (e.g. a chart whose window has closed)."""
+        if self._index.pop(key, None) is not None:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get_or_render(self, key, render):
+        """Return the cached fragment for key, calling render() to build it on a miss."""
+        fragment = self.get(key)
+        if fragment is None:
+            fragment = render()
+            self.put(key, fragment)
+        return fragment
+
+    def close(self):
+        self._save_index()
+
+    def report(self):
+        size = sum(e['size'] for e in self._index.values())
+        return (f"Figure cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions ({len(self._index)} entries, "
+                f"{size / 1024:.0f} KB of {self.max_bytes / 1024:.0f} KB)")
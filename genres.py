@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from playstore_data import column
+
+# =====================================
+# Multi-label genre index
+# =====================================
+# Genres holds entries like "Art & Design;Pretend Play". Instead of splitting
+# it per row (str.split + explode, one Python string per genre per row), the
+# distinct Genres values (~120, however many rows) are split once and the
+# rows are stored CSR-style:
+#   genres     the genre dictionary (sorted labels)
+#   offsets    row i owns codes[offsets[i]:offsets[i + 1]]
+#   codes      genre code of every (row, genre) entry
+#   rows       row of every entry (np.repeat of the row numbers)
+# Every query is an integer scan over `codes`:
+#   having()       rows with a genre (any / all of several)
+#   cooccurrence() genre x genre app counts, from one indicator matrix over
+#                  the distinct Genres values
+#   aggregate()    per-genre Apps / Installs / Reviews / mean Rating; an app
+#                  counts once for every genre it lists
+#
+# Usage: python genres.py
+
+SEPARATOR = ';'
+
+GENRE_AGGS = dict(
+    Apps=('Installs', 'count'),
+    Installs=('Installs', 'sum'),
+    Reviews=('Reviews', 'sum'),
+    Rating=('Rating', 'mean'),
+)
+
+
+def split_genres(values):
+    """Distinct genres of every value, in order, without duplicates ([] for missing values)."""
+    out = []
+    for value in values:
+        if not isinstance(value, str):
+            out.append([])
+            continue
+        out.append(list(dict.fromkeys(g.strip() for g in value.split(SEPARATOR) if g.strip())))
+    return out
+
+
+class GenreIndex:
+    """CSR view of the Genres column: offsets + codes into a genre dictionary."""
+
+    def __init__(self, df):
+        combo, combos = pd.factorize(column(df, 'Genres'))
+        parts = split_genres(np.asarray(combos, dtype=object))
+        self.genres = pd.Index(sorted({g for p in parts for g in p}), name='Genre')
+
+        # CSR over the distinct Genres values (plus an empty one for missing values) ...
+        combo = np.where(combo >= 0, combo, len(parts))
+        combo_len = np.array([len(p) for p in parts] + [0], dtype='int64')
+        combo_offsets = np.r_[0, np.cumsum(combo_len)]
+        combo_codes = self.genres.get_indexer([g for p in parts for g in p]).astype('int32')
+        # ... gathered into one over the rows
+        lengths = combo_len[combo]
+        self.offsets = np.r_[0, np.cumsum(lengths)]
+        first = np.repeat(combo_offsets[combo] - self.offsets[:-1], lengths)
+        self.codes = combo_codes[first + np.arange(self.offsets[-1])]
+        self.rows = np.repeat(np.arange(len(df)), lengths)
+
+        # Indicator matrix (distinct value x genre) for co-occurrence
+        self._combo = combo
+        self._indicator = np.zeros((len(combo_len), len(self.genres)), dtype='int64')
+        self._indicator[np.repeat(np.arange(len(combo_len)), combo_len), combo_codes] = 1
+        self._frame = df
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def genres_of(self, row):
+        """Genre labels of one row (by position)."""
+        return list(self.genres[self.codes[self.offsets[row]:self.offsets[row + 1]]])
+
+    def _codes_of(self, genres):
+        genres = [genres] if isinstance(genres, str) else list(genres)
+        wanted = self.genres.get_indexer(genres)
+        if (wanted < 0).any():
+            raise KeyError(f"Unknown genre(s): {[g for g, c in zip(genres, wanted) if c < 0]}")
+        return wanted
+
+    def having(self, genres, how='any'):
+        """Boolean mask of the rows listing any (or all) of the genres."""
+        wanted = self._codes_of(genres)
+        hits = np.bincount(self.rows[np.isin(self.codes, wanted)], minlength=len(self))
+        return hits >= (len(wanted) if how == 'all' else 1)
+
+    def cooccurrence(self, mask=None):
+        """Genre x genre matrix of app counts (the diagonal is the apps per genre)."""
+        combo = self._combo if mask is None else self._combo[np.asarray(mask, dtype=bool)]
+        weight = np.bincount(combo, minlength=len(self._indicator))
+        counts = self._indicator.T @ (self._indicator * weight[:, None])
+        return pd.DataFrame(counts, index=self.genres, columns=self.genres.rename(None))
+
+    def aggregate(self, aggs=GENRE_AGGS, mask=None):
+        """Per-genre aggregates (sum / count / mean), one row per genre with at least one app."""
+        keep = slice(None) if mask is None else np.asarray(mask, dtype=bool)[self.rows]
+        rows, codes = self.rows[keep], self.codes[keep]
+        n = len(self.genres)
+        out = {}
+        for name, (col, func) in aggs.items():
+            values = column(self._frame, col).to_numpy(dtype='float64', na_value=np.nan)[rows]
+            valid = ~np.isnan(values)
+            total = np.bincount(codes[valid], weights=values[valid], minlength=n)
+            count = np.bincount(codes[valid], minlength=n)
+            if func == 'sum':
+                out[name] = total
+            elif func == 'count':
+                out[name] = count
+            elif func == 'mean':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    out[name] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+            else:
+                raise ValueError(f"Unsupported genre aggregate {func!r} for {name}")
+        stats = pd.DataFrame(out, index=self.genres)
+        return stats[np.bincount(codes, minlength=n) > 0].reset_index()
+
+
+if __name__ == "__main__":
+    from playstore_data import load_playstore
+    from ranking import top_k
+
+    df = load_playstore()
+    index = GenreIndex(df)
+    pd.set_option('display.width', 140)
+    print(f"{len(index.genres)} genres over {len(index):,} apps ({len(index.codes):,} app-genre entries)")
+    print("\nTop 10 genres by installs:")
+    print(top_k(index.aggregate(), 10, 'Installs').to_string(index=False))
+    print(f"\nApps listing Education and Pretend Play: {int(index.having(['Education', 'Pretend Play'], how='all').sum())}")
+    pairs = index.cooccurrence().stack()
+    pairs = pairs[[a < b for a, b in pairs.index]]
+    print("\nMost frequent genre pairs:")
+    print(top_k(pairs, 10).to_string())
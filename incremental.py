@@ -0,0 +1,196 @@
+import json
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from analyses import CATEGORY_AGGS, FREE_VS_PAID_FILTERS, category_filters, free_vs_paid_mask
+from chart_engine import ChartSpec, MaskCache, combine_tables, finish_spec, measure_table
+from playstore_data import CACHE_DIR, DATA_FILE, clean_playstore, file_sha1, resolve_path
+from ranking import top_k
+
+# =====================================
+# Incremental ingest of daily Play Store exports
+# =====================================
+# Every raw row is identified by a hash of its contents. A new export is
+# diffed against the persisted catalog as a multiset of row hashes, so an app
+# whose Current Ver / Last Updated / counts changed shows up as one removed
+# row plus one added row. Only the added rows are cleaned. The maintained
+# aggregates are additive measure tables (see chart_engine), updated by adding
+# the delta's measures and subtracting the removed rows' measures.
+#
+# Usage: python incremental.py ["new export.csv"]
+
+STATE_DIR = os.path.join(CACHE_DIR, 'incremental')
+CATALOG_PATH = os.path.join(STATE_DIR, 'catalog.parquet')
+MEASURES_PATH = os.path.join(STATE_DIR, 'measures.pkl')
+META_PATH = os.path.join(STATE_DIR, 'meta.json')
+
+
+# Aggregates kept up to date across runs (top-N rankings are read from these)
+MAINTAINED = [
+    ChartSpec('category_totals', None, [], ['Category'], dict(
+        Apps=('Installs', 'count'), Installs=('Installs', 'sum'),
+        Reviews=('Reviews', 'sum'), Rating=('Rating', 'mean'))),
+    ChartSpec('monthly_installs', None, [], ['Month', 'Category'], dict(
+        Installs=('Installs', 'sum'))),
+    # task@1.py: top 10 categories by installs
+    ChartSpec('task1_categories', None, category_filters(), ['Category'], CATEGORY_AGGS),
+    # task@2.py: top 3 categories, Free vs Paid averages
+    ChartSpec('task2_category_type', None, [partial(free_vs_paid_mask, **FREE_VS_PAID_FILTERS)],
+              ['Category', 'Type'], dict(Total_Installs=('Installs', 'sum'),
+                                         Avg_Installs=('Installs', 'mean'),
+                                         Avg_Revenue=('Revenue', 'mean'))),
+    # task@3.py: top 5 categories outside A/C/G/S
+    ChartSpec('task3_categories', None,
+              [('Category', 'not startswith', ('A', 'C', 'G', 'S'))],
+              ['Category'], dict(Total_Installs=('Installs', 'sum'))),
+]
+
+
+def with_derived(df):
+    """Columns the maintained aggregates need beyond the cleaned dataset."""
+    return df.assign(Revenue=df['Installs'] * df['Price'],
+                     App_Length=df['App'].astype(str).str.len())
+
+
+def _definitions_fingerprint():
+    return [spec.fingerprint() for spec in MAINTAINED]
+
+
+def _occurrence_keys(hashes):
+    """(hash, n-th occurrence) pairs, so duplicate rows diff as a multiset."""
+    hashes = np.asarray(hashes, dtype='uint64')
+    occurrence = pd.Series(hashes).groupby(hashes).cumcount().to_numpy()
+    return pd.MultiIndex.from_arrays([hashes, occurrence])
+
+
+def _measures(df):
+    if df.empty:
+        return None
+    df = with_derived(df)
+    return measure_table(df, MAINTAINED, MaskCache(df), plain_keys=True)
+
+
+def _update(table, added, removed):
+    parts = [t for t in (table, added) if t is not None]
+    if removed is not None:
+        parts.append(-removed)
+    if not parts:
+        return None
+    table = combine_tables(parts)
+    # Groups whose rows all went away
+    return table[(table != 0).any(axis=1)]
+
+
+# -------------------------------
+# State
+# -------------------------------
+
+def read_meta():
+    try:
+        with open(META_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_state():
+    """(catalog, measures, meta) from the last run, or (None, None, None)."""
+    meta = read_meta()
+    try:
+        catalog = pd.read_parquet(CATALOG_PATH)
+        measures = pd.read_pickle(MEASURES_PATH)
+    except (OSError, ValueError):
+        return None, None, None
+    if meta is None:
+        return None, None, None
+    if meta.get('definitions') != _definitions_fingerprint():
+        # Aggregate definitions changed: rebuild them from the cleaned catalog (no re-cleaning)
+        measures = _measures(catalog)
+    return catalog, measures, meta
+
+
+def save_state(catalog, measures, meta):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    catalog.to_parquet(CATALOG_PATH + '.tmp', index=False)
+    os.replace(CATALOG_PATH + '.tmp', CATALOG_PATH)
+    pd.to_pickle(measures, MEASURES_PATH + '.tmp')
+    os.replace(MEASURES_PATH + '.tmp', MEASURES_PATH)
+    with open(META_PATH + '.tmp', 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(META_PATH + '.tmp', META_PATH)
+
+
+# -------------------------------
+# Ingest
+# -------------------------------
+
+def ingest(path=DATA_FILE):
+    """Bring the catalog and maintained aggregates up to date with the export at path."""
+    path = resolve_path(path)
+    sha1 = file_sha1(path)
+    meta = read_meta()
+    if meta is not None and meta.get('sha1') == sha1 and meta.get('definitions') == _definitions_fingerprint():
+        return dict(meta['last_run'], added=0, removed=0, seconds=0.0, unchanged=True)
+    catalog, measures, meta = load_state()
+
+    t0 = time.perf_counter()
+    raw = pd.read_csv(path, dtype=str)
+    raw['_row_hash'] = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+    if catalog is None:
+        added_raw = raw
+        removed = catalog = None
+    else:
+        new_keys = _occurrence_keys(raw['_row_hash'])
+        old_keys = _occurrence_keys(catalog['_row_hash'])
+        added_raw = raw[~new_keys.isin(old_keys)]
+        gone = ~old_keys.isin(new_keys)
+        removed = catalog[gone]
+        catalog = catalog[~gone]
+
+    delta = clean_playstore(added_raw) if len(added_raw) else None
+    measures = _update(measures, _measures(delta) if delta is not None else None,
+                       _measures(removed) if removed is not None else None)
+
+    frames = [f for f in (catalog, delta) if f is not None and len(f)]
+    catalog = pd.concat(frames, ignore_index=True) if frames else raw.iloc[:0]
+    for col in ('Category', 'Type', 'Content Rating'):
+        catalog[col] = catalog[col].astype('category')
+
+    stats = {'added': 0 if delta is None else len(delta),
+             'removed': 0 if removed is None else len(removed),
+             'rows': len(catalog),
+             'seconds': round(time.perf_counter() - t0, 4)}
+    save_state(catalog, measures, {'source': os.path.basename(path), 'sha1': sha1,
+                                   'definitions': _definitions_fingerprint(), 'last_run': stats})
+    return stats
+
+
+def maintained(name, path=DATA_FILE):
+    """Up-to-date result of one MAINTAINED aggregate (runs ingest first)."""
+    ingest(path)
+    spec = next(s for s in MAINTAINED if s.name == name)
+    measures = pd.read_pickle(MEASURES_PATH)
+    if measures is None:
+        return pd.DataFrame(columns=list(spec.keys) + list(spec.aggs))
+    return finish_spec(measures, spec)
+
+
+def top_n(name, metric, n, path=DATA_FILE):
+    """Top-n rows of a maintained aggregate by metric (e.g. categories by installs)."""
+    return top_k(maintained(name, path), n, metric)
+
+
+if __name__ == "__main__":
+    stats = ingest(sys.argv[1] if len(sys.argv) > 1 else DATA_FILE)
+    if stats.get('unchanged'):
+        print(f"Catalog already up to date ({stats['rows']:,} rows)")
+    else:
+        print(f"+{stats['added']:,} / -{stats['removed']:,} rows in {stats['seconds']}s "
+              f"-> {stats['rows']:,} rows in the catalog")
+    print(top_n('category_totals', 'Installs', 10))
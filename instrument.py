@@ -0,0 +1,245 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+# =====================================
+# Stage instrumentation (load / clean / filter / groupby / render)
+# =====================================
+# The shared code paths (playstore_data, chart_engine, dashboard, task_output)
+# wrap their stages in `with stage(category, name, rows_in=...) as s:` (and
+# set s.rows_out) or decorate them with @traced(category). Every stage
+# records wall time, CPU time, the change in resident memory and rows in /
+# out. Filters also record a funnel: the rows left after each predicate, so
+# the one that empties a chart is visible.
+#
+# Disabled (the default), stage() returns one shared no-op object: a function
+# call and a global lookup per stage, nothing is measured or stored.
+#
+# Enable without editing any script:
+#   PLAYSTORE_TRACE=trace python task@5.py
+#   python run_tasks.py --trace trace
+# Both write trace.json (records + funnels) and trace.trace.json (Chrome
+# trace events: open in chrome://tracing or https://ui.perfetto.dev) and
+# print a summary when the process ends.
+
+TRACE_ENV = 'PLAYSTORE_TRACE'
+
+ENABLED = False
+
+_records = []
+_local = threading.local()
+_epoch = time.perf_counter()
+_lock = threading.Lock()
+
+
+def _rss():
+    """Resident memory of this process in bytes (0 when it cannot be read)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+class _Disabled:
+    """Stand-in returned by stage() while instrumentation is off."""
+    __slots__ = ()
+    enabled = False
+    rows_in = None
+    rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+    def note(self, **args):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+class Stage:
+    enabled = True
+
+    def __init__(self, category, name, rows_in=None, args=None):
+        self.category = category
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.args = dict(args or {})
+
+    def note(self, **args):
+        """Attach extra values to the record (shown in the trace viewer)."""
+        self.args.update(args)
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self._depth = len(stack)
+        stack.append(self)
+        self._rss = _rss()
+        self._cpu = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu
+        _local.stack.pop()
+        record = {
+            'category': self.category, 'name': self.name,
+            'start': self._start - _epoch, 'wall': wall, 'cpu': cpu,
+            'memory': _rss() - self._rss,
+            'rows_in': self.rows_in, 'rows_out': self.rows_out,
+            'depth': self._depth, 'thread': threading.get_ident(),
+        }
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        if self.args:
+            record['args'] = self.args
+        with _lock:
+            _records.append(record)
+        return False
+
+
+def stage(category, name, rows_in=None, **args):
+    """Context manager timing one stage; a shared no-op while instrumentation is disabled."""
+    if not ENABLED:
+        return _DISABLED
+    return Stage(category, name, rows_in, args)
+
+
+def _shape_rows(value):
+    shape = getattr(value, 'shape', None)
+    return shape[0] if shape else None
+
+
+def traced(category, name=None):
+    """Decorator running every call as a stage; rows from the first argument and the result, when they are frames."""
+    def wrap(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with Stage(category, label, _shape_rows(args[0]) if args else None) as s:
+                result = func(*args, **kwargs)
+                s.rows_out = _shape_rows(result)
+            return result
+        return run
+    return wrap
+
+
+def _label(predicate):
+    if callable(predicate):
+        func = getattr(predicate, 'func', predicate)   # functools.partial
+        return getattr(func, '__name__', repr(predicate))
+    col, op, value = predicate
+    return f"{col} {op} {value!r}"
+
+
+def funnel(name, rows_in, predicates, mask_of):
+    """Record how many rows survive each predicate in turn; mask_of(predicate) -> boolean array."""
+    with stage('filter', name, rows_in=rows_in) as s:
+        steps, remaining = [], None
+        for predicate in predicates:
+            mask = mask_of(predicate)
+            remaining = mask if remaining is None else remaining & mask
+            steps.append([_label(predicate), int(remaining.sum())])
+        s.rows_out = steps[-1][1] if steps else rows_in
+        s.note(funnel=steps)
+
+
+# -------------------------------
+# Output
+# -------------------------------
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+def reset():
+    with _lock:
+        _records.clear()
+
+
+def records():
+    with _lock:
+        return list(_records)
+
+
+def write_json(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'pid': os.getpid(), 'argv': sys.argv, 'stages': records()}, f, indent=1, default=str)
+    return path
+
+
+def write_chrome_trace(path):
+    """Chrome trace-event file: one complete ('X') event per stage, times in microseconds."""
+    pid = os.getpid()
+    events = []
+    for r in records():
+        args = {k: r[k] for k in ('rows_in', 'rows_out', 'cpu', 'memory') if r[k] is not None}
+        args.update(r.get('args', {}))
+        events.append({'name': r['name'], 'cat': r['category'], 'ph': 'X', 'pid': pid, 'tid': r['thread'],
+                       'ts': round(r['start'] * 1e6, 1), 'dur': round(r['wall'] * 1e6, 1), 'args': args})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, default=str)
+    return path
+
+
+def _rows(value):
+    return '' if value is None else f"{value:,}"
+
+
+def report():
+    """Stages in start order with times, memory and rows; stages and predicates that empty the data are marked."""
+    lines = [f"{'stage':<44} {'wall ms':>9} {'cpu ms':>9} {'mem MB':>8} {'rows in':>10} {'rows out':>10}"]
+    for r in sorted(records(), key=lambda r: r['start']):
+        label = '  ' * r['depth'] + f"{r['category']}/{r['name']}"
+        emptied = r['rows_out'] == 0 and bool(r['rows_in'])
+        lines.append(f"{label[:44]:<44} {r['wall'] * 1e3:9.1f} {r['cpu'] * 1e3:9.1f} "
+                     f"{r['memory'] / 2 ** 20:8.1f} {_rows(r['rows_in']):>10} {_rows(r['rows_out']):>10}"
+                     + ("  ⚠️ emptied" if emptied else ""))
+        previous = r['rows_in']
+        for predicate, left in r.get('args', {}).get('funnel', ()):
+            mark = "  ⚠️ emptied here" if left == 0 and previous else ""
+            lines.append(f"{'  ' * (r['depth'] + 1)}· {predicate[:60]:<60} {_rows(left):>10}{mark}")
+            previous = left
+    return "\n".join(lines)
+
+
+def save(prefix):
+    """Write <prefix>.json and <prefix>.trace.json; returns both paths."""
+    return write_json(f"{prefix}.json"), write_chrome_trace(f"{prefix}.trace.json")
+
+
+def _save_at_exit(prefix):
+    if not records():
+        return
+    print("\n📊 Stages\n" + report(), file=sys.stderr)
+    for path in save(prefix):
+        print(f"📊 Wrote {path}", file=sys.stderr)
+
+
+if os.environ.get(TRACE_ENV):
+    enable()
+    atexit.register(_save_at_exit, os.environ[TRACE_ENV])
@@ -0,0 +1,224 @@
+import os
+
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps, dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+# =====================================
+# Headless matplotlib charts (Agg), drawn once per call
+# =====================================
+# The task charts are drawn here, onto axes handed in by the caller:
+#   figure()        interactive runs get a pyplot figure; headless runs get a
+#                   pooled Agg Figure (no pyplot, no window manager) whose
+#                   axes are cleared and reused by the next chart of that kind
+#   draw_*()        every chart adds its marks in one call per artist type:
+#                   one scatter for all bubble categories (per-point colours),
+#                   one LineCollection + one PolyCollection for all monthly
+#                   lines and growth shading, one vlines for highlighted months
+#   render_batch()  many (name, chart, data) variants in one process, each
+#                   saved as PNG / SVG / PDF, all sharing the pooled figures
+#
+# Usage: python mpl_charts.py [--output DIR] [--format png svg pdf]
+#   renders the bubble chart for a grid of rating / installs thresholds.
+
+FORMATS = ('png', 'svg', 'pdf')
+
+_pool = {}   # chart kind -> Figure
+
+
+def figure(kind, figsize, pooled=None):
+    """(fig, ax) for one chart; pooled Agg figures are reused per kind when running headless."""
+    if pooled is None:
+        import task_output
+        pooled = task_output.OUTPUT_DIR is not None
+    if not pooled:
+        import matplotlib.pyplot as plt
+        return plt.subplots(figsize=figsize)
+
+    fig = _pool.get(kind)
+    if fig is None or tuple(fig.get_size_inches()) != tuple(figsize):
+        fig = _pool[kind] = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        fig.add_subplot()
+    else:
+        for extra in fig.axes[1:]:   # twin axes added by the previous chart
+            extra.remove()
+        fig.axes[0].clear()
+    return fig, fig.axes[0]
+
+
+def save(fig, path, fmt=None):
+    """Write fig to path (format from fmt or the extension)."""
+    fig.savefig(path, format=fmt or os.path.splitext(path)[1][1:])
+    return path
+
+
+def _legend_handles(labels, colors, **style):
+    return [Line2D([], [], color=c, label=l, **style) for l, c in zip(labels, colors)]
+
+
+# -------------------------------
+# Charts
+# -------------------------------
+
+def draw_category_bars(ax, top):
+    """task@1: average rating next to total reviews (millions) for the top categories."""
+    x = np.arange(len(top))
+    ax.bar(x, top['Avg_Rating'], width=0.4, label='Average Rating')
+    ax.bar(x + 0.4, top['Total_Reviews'] / 1_000_000, width=0.4, label='Total Reviews (in millions)')
+    ax.set_xticks(x + 0.2)
+    ax.set_xticklabels(top['Category'], rotation=45)
+    ax.set_xlabel("App Category")
+    ax.set_ylabel("Values")
+    ax.set_title("Top 10 App Categories: Average Rating vs Total Reviews")
+    ax.legend()
+
+
+def draw_free_vs_paid(ax, summary):
+    """task@2: average installs (bars) and average revenue (line, second axis) per category and type."""
+    labels = summary['Category'].astype(str) + " (" + summary['Type'].astype(str) + ")"
+    x = np.arange(len(labels))
+    ax.bar(x, summary['Avg_Installs'])
+    ax.set_ylabel("Average Installs")
+    revenue = ax.twinx()
+    revenue.plot(x, summary['Avg_Revenue'], marker='o')
+    revenue.set_ylabel("Average Revenue ($)")
+    ax.set_xticks(x)
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    ax.set_title("Average Installs vs Revenue (Free vs Paid Apps)")
+
+
+def draw_cumulative_installs(ax, cumulative, highlight, labels):
+    """task@4: stacked cumulative installs per category; high-growth months marked."""
+    ax.stackplot(cumulative.index, cumulative.T, labels=labels, alpha=0.8)
+    months = cumulative.index[highlight]
+    if len(months):
+        ax.vlines(months, 0, 1, transform=ax.get_xaxis_transform(), color='black', alpha=0.08)
+    ax.set_title("Cumulative Installs Over Time by Category")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Cumulative Installs")
+    ax.legend(loc='upper left')
+
+
+def draw_size_vs_rating(ax, apps, highlight='GAME'):
+    """task@5: size vs rating bubbles sized by installs, one scatter for every category."""
+    codes, labels = pd.factorize(apps['Category_Label'])
+    # Category by category, like one scatter call per category would layer them
+    order = np.argsort(codes, kind='stable')
+    installs = apps['Installs'].to_numpy(dtype='float64')
+    top = installs.max()
+    sizes = installs / top * 1000 + 50 if top > 0 else np.full(len(apps), 100.0)
+    palette = np.array(['pink' if label == highlight else 'skyblue' for label in labels], dtype=object)
+    ax.scatter(apps['Size_MB'].to_numpy()[order], apps['Rating'].to_numpy()[order], s=sizes[order],
+               c=list(palette[codes[order]]), alpha=0.6, edgecolors='w', linewidth=0.5)
+    ax.set_xlabel("App Size (MB)")
+    ax.set_ylabel("Average Rating")
+    ax.set_title("App Size vs Rating with Installs (Bubble Chart)")
+    ax.legend(handles=_legend_handles(labels, palette, marker='o', linestyle='', alpha=0.6, markersize=8),
+              title="Category", bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.grid(True, linestyle='--', alpha=0.7)
+
+
+def _runs(mask):
+    """(start, stop) of every run of at least two consecutive True values."""
+    edges = np.diff(np.r_[0, mask.astype('int8'), 0])
+    starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    keep = stops - starts >= 2
+    return zip(starts[keep], stops[keep])
+
+
+def draw_monthly_installs(ax, monthly, growth_threshold=20):
+    """task@6: monthly installs per category; months after > growth_threshold % growth shaded."""
+    colors = colormaps['tab10'].colors
+    # Categories numbered by first appearance (the colour order), rows grouped by category then month
+    codes, labels = pd.factorize(monthly['Category_Label'])
+    order = np.lexsort((monthly['YearMonth'].to_numpy(), codes))
+    codes = codes[order]
+    x = mdates.date2num(monthly['YearMonth'].to_numpy()[order])
+    y = monthly['Installs'].to_numpy(dtype='float64')[order]
+    growth = (monthly['MoM_Growth'] > growth_threshold).to_numpy()[order]
+    bounds = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+
+    lines, line_colors, shades, shade_colors = [], [], [], []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        color = colors[codes[start] % len(colors)]
+        lines.append(np.column_stack([x[start:stop], y[start:stop]]))
+        line_colors.append(color)
+        for a, b in _runs(growth[start:stop]):
+            xs, ys = x[start + a:start + b], y[start + a:start + b]
+            shades.append(np.column_stack([np.r_[xs, xs[::-1]], np.r_[ys, np.zeros(len(xs))]]))
+            shade_colors.append(color)
+
+    ax.add_collection(LineCollection(lines, colors=line_colors, linewidths=2))
+    if shades:
+        ax.add_collection(PolyCollection(shades, facecolors=shade_colors, edgecolors='none', alpha=0.2))
+    ax.xaxis_date()
+    ax.autoscale_view()
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Total Installs")
+    ax.set_title(f"Monthly Total Installs by Category (Highlight MoM Growth > {growth_threshold:g}%)")
+    ax.legend(handles=_legend_handles(labels, [colors[i % len(colors)] for i in range(len(labels))],
+                                      linewidth=2), title="Category")
+    ax.grid(True)
+
+
+CHARTS = {
+    # kind: (draw, figsize)
+    'category_bars': (draw_category_bars, (12, 6)),
+    'free_vs_paid': (draw_free_vs_paid, (10, 5)),
+    'cumulative_installs': (draw_cumulative_installs, (12, 6)),
+    'size_vs_rating': (draw_size_vs_rating, (12, 7)),
+    'monthly_installs': (draw_monthly_installs, (14, 7)),
+}
+
+
+def draw(kind, *data, pooled=None, **options):
+    """Draw one chart of `kind` (see CHARTS); returns its figure."""
+    func, figsize = CHARTS[kind]
+    fig, ax = figure(kind, figsize, pooled)
+    func(ax, *data, **options)
+    fig.tight_layout()
+    return fig
+
+
+# -------------------------------
+# Batch
+# -------------------------------
+
+def render_batch(jobs, output_dir, formats=('png',)):
+    """Render (name, kind, data_args, options) jobs on pooled Agg figures; returns {name: [paths]}."""
+    os.makedirs(output_dir, exist_ok=True)
+    written = {}
+    for name, kind, data, options in jobs:
+        fig = draw(kind, *data, pooled=True, **options)
+        written[name] = [save(fig, os.path.join(output_dir, f"{name}.{fmt}"), fmt) for fmt in formats]
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from analyses import size_vs_rating, sweep
+    from playstore_data import load_playstore
+
+    parser = argparse.ArgumentParser(description="Render bubble-chart variants headlessly")
+    parser.add_argument('--output', default=os.path.join('output', 'variants'))
+    parser.add_argument('--format', nargs='+', default=['png'], choices=FORMATS)
+    args = parser.parse_args()
+
+    variants = sweep(size_vs_rating, load_playstore(),
+                     {'min_rating': (3.0, 3.5, 4.0, 4.2, 4.4, 4.6),
+                      'min_installs': (10_000, 50_000, 1_000_000, 10_000_000)},
+                     min_reviews=0)
+    jobs = [(f"size_vs_rating_r{rating:g}_i{installs}", 'size_vs_rating', (apps,), {})
+            for (rating, installs), apps in variants.items() if len(apps)]
+    t0 = time.perf_counter()
+    written = render_batch(jobs, args.output, args.format)
+    elapsed = time.perf_counter() - t0
+    print(f"🖼️  {len(written)} variants x {len(args.format)} format(s) in {elapsed:.2f}s "
+          f"({elapsed / max(len(written), 1) * 1000:.0f} ms each) -> {args.output}")
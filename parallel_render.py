@@ -0,0 +1,97 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_engine import compute_chart_data
+from playstore_data import CACHE_DIR
+
+# =====================================
+# Render charts concurrently in a process pool
+# =====================================
+# The parent computes the aggregate charts' data in one engine pass (the
+# results are small) and ships them to the workers. Charts that plot raw rows
+# read the cleaned frame from an uncompressed Arrow file that every worker
+# memory-maps, so the frame is never pickled per task. Results come back in
+# the order of the specs, exactly as the serial path produces them.
+#
+# to_pandas() in the worker is zero-copy for the numeric, datetime and string
+# columns: they stay views of the mapped pages, shared by every worker. Float
+# columns are written with NaN rather than Arrow nulls for that reason (a
+# validity bitmap forces a NaN-filled copy). What is still copied per worker
+# is small: bool columns (Arrow packs them into bits) and the int8 codes of
+# the categorical columns -- a few bytes per row.
+
+_frame = None
+_frame_source = None
+
+
+def arrow_frame_path(version):
+    return os.path.join(CACHE_DIR, f'frame-{version[:16]}.arrow')
+
+
+def write_arrow_frame(df, version):
+    """Write df once per data version as an uncompressed (mmap-able) Arrow file."""
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    path = arrow_frame_path(version)
+    if not os.path.exists(path):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for i, field in enumerate(table.schema):
+            if pa.types.is_floating(field.type) and table.column(i).null_count:
+                table = table.set_column(i, field, pa.array(df[field.name].to_numpy(), from_pandas=False))
+        feather.write_feather(table, path + '.tmp', compression='uncompressed')
+        os.replace(path + '.tmp', path)
+        # Frames of older data versions are never read again
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith('frame-') and name.endswith('.arrow') and name != os.path.basename(path):
+                os.remove(os.path.join(CACHE_DIR, name))
+    return path
+
+
+def _init_worker(source):
+    global _frame_source
+    _frame_source = source
+
+
+def _worker_frame():
+    """The cleaned frame inside a worker, mapped from the Arrow file on first use."""
+    global _frame
+    if _frame is None:
+        if isinstance(_frame_source, str):
+            import pyarrow as pa
+            with pa.memory_map(_frame_source, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+            _frame = table.to_pandas(split_blocks=True)
+        else:
+            _frame = _frame_source
+    return _frame
+
+
+def _render(job):
+    render, spec, data = job
+    if data is None:
+        data = compute_chart_data(_worker_frame(), [spec])[spec.name]
+    return render(spec, data)
+
+
+def render_parallel(specs, render, keyed_data, get_df=None, version=None, workers=None):
+    """Render specs in a process pool: returns render(spec, data) results in spec order.
+
+    keyed_data holds the precomputed data for aggregate specs; row-level specs
+    are computed in the workers from the frame returned by get_df().
+    """
+    rows = [s for s in specs if not s.keys]
+    source = None
+    if rows:
+        df = get_df()
+        try:
+            source = write_arrow_frame(df, version)
+        except ImportError:
+            source = df  # no pyarrow: each worker gets one pickled copy at startup
+
+    jobs = [(render, spec, keyed_data.get(spec.name) if spec.keys else None) for spec in specs]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(source,)) as pool:
+        return list(pool.map(_render, jobs))
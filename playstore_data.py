@@ -0,0 +1,353 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import instrument
+from instrument import traced
+from playstore_parsers import (
+    char_bits, parse_android_version, parse_app_names, parse_installs, parse_price, parse_size
+)
+
+# =====================================
+# Shared loader for the Play Store dataset
+# =====================================
+# Every script used to run its own read_csv + cleaning. This module parses the
+# CSV once into explicit dtypes and keeps a columnar snapshot next to the data,
+# keyed by the CSV's hash and mtime, so later runs skip the parse entirely.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = "Play Store Data.csv"
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+
+CATEGORICAL_COLUMNS = ['Category', 'Type', 'Content Rating']
+
+
+def resolve_path(name=DATA_FILE):
+    """Find a data file next to the scripts, ignoring case ("play store data.csv")."""
+    path = name if os.path.isabs(name) else os.path.join(BASE_DIR, name)
+    if os.path.exists(path):
+        return path
+    folder, base = os.path.split(path)
+    if os.path.isdir(folder):
+        for entry in os.listdir(folder):
+            if entry.lower() == base.lower():
+                return os.path.join(folder, entry)
+    raise FileNotFoundError(f"{name} not found")
+
+
+def file_sha1(path, block_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+# =====================================
+# Cleaning
+# =====================================
+
+@traced('clean')
+def clean_playstore(df):
+    """Turn the raw CSV columns into typed ones. Rows that cannot be parsed are dropped."""
+    df = df.copy()
+
+    df['Installs'] = parse_installs(df['Installs'])
+    df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
+
+    # Shifted/corrupt rows have no usable Installs or Reviews
+    df = df.dropna(subset=['Installs', 'Reviews'])
+    df['Installs'] = df['Installs'].astype('int64')
+    df['Reviews'] = df['Reviews'].astype('int64')
+
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce').astype('float32')
+    df['Price'] = np.nan_to_num(parse_price(df['Price']), nan=0.0)
+
+    # Size: "19M" -> 19.0, "512k" -> 0.5, "Varies with device" -> NaN + flag
+    df['Size_MB'], df['Size_Varies'] = parse_size(df['Size'])
+
+    df['Android_Version'] = parse_android_version(df['Android Ver'])
+
+    df['Last Updated'] = pd.to_datetime(df['Last Updated'], format='%B %d, %Y', errors='coerce')
+    df['Month'] = df['Last Updated'].dt.to_period('M').dt.to_timestamp()
+
+    df['Category'] = df['Category'].str.upper()
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype('category')
+
+    return df.reset_index(drop=True)
+
+
+# =====================================
+# Compact layout
+# =====================================
+# The cleaned frame no longer needs the raw strings its typed columns were
+# parsed from. compact_catalog() drops them, dictionary-encodes the repetitive
+# text columns and downcasts the numbers. Columns that are a pure function of
+# other columns (or the same value on every row) are not stored at all: they
+# are computed on demand by column() / with_columns(), ideally after filtering.
+# App names get precomputed features (playstore_parsers.parse_app_names), so
+# name rules are bit tests instead of string scans.
+
+# Raw text already parsed into typed columns (Size -> Size_MB + Size_Varies)
+PARSED_RAW_COLUMNS = ['Size']
+DICTIONARY_COLUMNS = ['Genres', 'Current Ver', 'Android Ver']
+
+# Same value on every row of this export
+CONSTANT_COLUMNS = {'Country': 'India'}
+
+DERIVED_COLUMNS = {
+    'Month': lambda df: df['Last Updated'].dt.to_period('M').dt.to_timestamp(),
+    'Revenue': lambda df: df['Installs'] * df['Price'],
+    'App_Length': lambda df: (df['Name_Length'].astype('int64') if 'Name_Length' in df.columns
+                              else df['App'].astype(str).str.len()),
+}
+
+
+def _smallest_int(s):
+    kind = 'unsigned' if len(s) and s.min() >= 0 else 'integer'
+    return pd.to_numeric(s, downcast=kind)
+
+
+def compact_catalog(df):
+    """Memory-optimized copy of a cleaned frame (same rows, same information)."""
+    df = df.drop(columns=[c for c in PARSED_RAW_COLUMNS + list(DERIVED_COLUMNS) + list(CONSTANT_COLUMNS)
+                          if c in df.columns])
+    for col in DICTIONARY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    # Price stays float64: float32 cannot hold every cent value exactly
+    for col in ('Installs', 'Reviews'):
+        df[col] = _smallest_int(df[col])
+    for col, values in parse_app_names(df['App']).items():
+        df[col] = values
+    return df
+
+
+def column(df, name):
+    """df[name], computing derived and constant columns that are not stored."""
+    if name in df.columns:
+        return df[name]
+    if name in DERIVED_COLUMNS:
+        return DERIVED_COLUMNS[name](df).rename(name)
+    if name in CONSTANT_COLUMNS:
+        codes = np.zeros(len(df), dtype='int8')
+        return pd.Series(pd.Categorical.from_codes(codes, [CONSTANT_COLUMNS[name]]),
+                         index=df.index, name=name)
+    raise KeyError(name)
+
+
+def name_contains(df, chars):
+    """Rows whose App name contains any of chars, case-insensitive (a bit test)."""
+    return (df['Name_Chars'].to_numpy() & char_bits(chars)) != 0
+
+
+def name_starts_with(df, letters):
+    """Rows whose upper-cased App name starts with one of letters."""
+    first = df['Name_First'].array
+    hit = first.categories.isin([c.upper() for c in letters])
+    # Code -1 (missing) picks the trailing False
+    return np.append(hit, False)[first.codes]
+
+
+def with_columns(df, *names):
+    """df plus the named derived/constant columns (call it on the filtered rows)."""
+    return df.assign(**{name: column(df, name) for name in names if name not in df.columns})
+
+
+def memory_report(before, after):
+    """Bytes per row of every column in two layouts of the same rows."""
+    rows = max(len(before), 1)
+    columns = list(dict.fromkeys([*before.columns, *after.columns]))
+
+    def per_row(df, col):
+        return df[col].memory_usage(deep=True, index=False) / rows if col in df.columns else 0.0
+
+    report = pd.DataFrame({
+        'before': [per_row(before, c) for c in columns],
+        'after': [per_row(after, c) for c in columns],
+        'dtype': [str(after[c].dtype) if c in after.columns else 'computed / dropped' for c in columns],
+    }, index=columns)
+    report.loc['TOTAL'] = [report['before'].sum(), report['after'].sum(), '']
+    return report.round(2)
+
+
+# =====================================
+# Filter predicates
+# =====================================
+# Filters are lists of (column, op, value) tuples so the same predicate can be
+# applied to a full frame, to a streamed chunk, or planned by the chart engine.
+# A plain callable df -> bool mask is accepted as well.
+
+_OPS = {
+    '>=': lambda s, v: s >= v,
+    '>': lambda s, v: s > v,
+    '<=': lambda s, v: s <= v,
+    '<': lambda s, v: s < v,
+    '==': lambda s, v: s == v,
+    '!=': lambda s, v: s != v,
+    'in': lambda s, v: s.isin(v),
+    'not in': lambda s, v: ~s.isin(v),
+    'startswith': lambda s, v: s.astype(str).str.startswith(tuple(v)),
+    'not startswith': lambda s, v: ~s.astype(str).str.startswith(tuple(v)),
+    'month': lambda s, v: s.dt.month == v,
+}
+
+
+def filter_mask(df, filters):
+    """AND together a list of (column, op, value) predicates into one boolean mask."""
+    mask = np.ones(len(df), dtype=bool)
+    for f in filters or ():
+        if callable(f):
+            part = f(df)
+        else:
+            col, op, value = f
+            if op not in _OPS:
+                raise ValueError(f"Unsupported filter operator: {op!r}")
+            part = _OPS[op](column(df, col), value)
+        mask &= np.asarray(part, dtype=bool)
+    return mask
+
+
+def apply_filters(df, filters):
+    if instrument.ENABLED and filters:
+        instrument.funnel('apply_filters', len(df), filters, lambda f: filter_mask(df, [f]))
+    return df[filter_mask(df, filters)] if filters else df
+
+
+# =====================================
+# Snapshot cache
+# =====================================
+
+# Bumped whenever the stored columns change, so old snapshots are rebuilt
+SNAPSHOT_LAYOUT = 3
+
+
+def _snapshot_format():
+    try:
+        import pyarrow  # noqa: F401
+        return 'parquet'
+    except ImportError:
+        return 'pickle'
+
+
+def _snapshot_paths(path):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(' ', '_').lower()
+    ext = 'parquet' if _snapshot_format() == 'parquet' else 'pkl'
+    return (os.path.join(CACHE_DIR, f"{stem}.{ext}"),
+            os.path.join(CACHE_DIR, f"{stem}.meta.json"))
+
+
+def data_version(path=DATA_FILE):
+    """Content hash of the source CSV; reuses the stored hash while size/mtime are unchanged."""
+    path = resolve_path(path)
+    stat = os.stat(path)
+    _, meta_path = _snapshot_paths(path)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return meta['sha1']
+    except (OSError, ValueError, KeyError):
+        pass
+    return file_sha1(path)
+
+
+def _write_snapshot(df, snap_path, meta_path, meta):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = snap_path + '.tmp'
+    if snap_path.endswith('.parquet'):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, snap_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+@traced('load', 'read_snapshot')
+def _read_snapshot(snap_path):
+    if snap_path.endswith('.parquet'):
+        return pd.read_parquet(snap_path)
+    return pd.read_pickle(snap_path)
+
+
+@traced('load', 'read_csv')
+def _read_csv(path):
+    return pd.read_csv(path)
+
+
+# Frames already loaded by this process, so scripts run back to back
+# (run_tasks.py) share one load: path -> (mtime_ns, size, frame)
+_loaded = {}
+
+
+@traced('load')
+def load_playstore(path=DATA_FILE, use_cache=True):
+    """Return the cleaned dataset (compact layout), from the snapshot when the CSV has not changed."""
+    path = resolve_path(path)
+    if not use_cache:
+        return compact_catalog(clean_playstore(_read_csv(path)))
+
+    stat = os.stat(path)
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+        # Callers add columns to their frame; a shallow copy keeps the shared one intact
+        return loaded[2].copy(deep=False)
+    df = _load_snapshot(path, stat)
+    _loaded[path] = (stat.st_mtime_ns, stat.st_size, df)
+    return df.copy(deep=False)
+
+
+def _load_snapshot(path, stat):
+    snap_path, meta_path = _snapshot_paths(path)
+
+    meta = None
+    if os.path.exists(snap_path):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+
+    if meta is not None and meta.get('layout') != SNAPSHOT_LAYOUT:
+        meta = None  # written by an older version of the loader
+    if meta is not None:
+        if meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+            return _read_snapshot(snap_path)
+        # File was touched: only re-parse if the content really changed
+        sha1 = file_sha1(path)
+        if sha1 == meta['sha1']:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+            return _read_snapshot(snap_path)
+    else:
+        sha1 = file_sha1(path)
+
+    df = compact_catalog(clean_playstore(_read_csv(path)))
+    _write_snapshot(df, snap_path, meta_path, {
+        'layout': SNAPSHOT_LAYOUT,
+        'source': os.path.basename(path),
+        'sha1': sha1,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'rows': len(df),
+    })
+    return df
+
+
+if __name__ == "__main__":
+    # Memory report: the cleaned frame as it used to be kept vs the compact layout
+    full = clean_playstore(pd.read_csv(resolve_path()))
+    # What the scripts used to add on every row
+    full = full.assign(Revenue=column(full, 'Revenue'), App_Length=column(full, 'App_Length'),
+                       Country='India')
+    compact = compact_catalog(full)
+    pd.set_option('display.width', 120)
+    print(f"{len(full):,} rows")
+    print(memory_report(full, compact))
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# =====================================
+# Vectorized column parsers
+# =====================================
+# Store exports repeat a small set of distinct strings ("19M", "10,000+",
+# "$4.99", "4.1 and up") across millions of rows. Each parser factorizes the
+# column, parses the distinct values once with a regex, and broadcasts the
+# result back with NumPy indexing, so nothing runs a Python call per row.
+
+SIZE_VARIES = 'Varies with device'
+
+# Multipliers to MB, indexed by unit code: none / k / M / G
+_SIZE_UNITS = np.array([np.nan, 1 / 1024, 1.0, 1024.0])
+_SIZE_UNIT_CODES = {'k': 1, 'K': 1, 'm': 2, 'M': 2, 'g': 3, 'G': 3}
+
+
+def _factorize(series):
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    return codes, pd.Series(uniques, dtype=object).astype(str)
+
+
+def _broadcast(codes, values, fill, dtype):
+    values = np.asarray(values, dtype=dtype)
+    out = np.append(values, np.array([fill], dtype=dtype))
+    # NaN rows carry code -1, which picks the trailing fill value
+    return out[codes]
+
+
+def parse_size(series):
+    """Size strings -> (float32 MB array, bool "varies with device" mask).
+
+    Handles k/M/G suffixes (case-insensitive) and "Varies with device";
+    anything else becomes NaN.
+    """
+    codes, uniques = _factorize(series)
+    parts = uniques.str.extract(r'^\s*([\d.,]+)\s*([kKmMgG])\s*$')
+    number = pd.to_numeric(parts[0].str.replace(',', '', regex=False), errors='coerce').to_numpy(float)
+    unit = parts[1].map(_SIZE_UNIT_CODES).fillna(0).to_numpy(int)
+    size_mb = number * _SIZE_UNITS[unit]
+    varies = (uniques.str.strip().str.lower() == SIZE_VARIES.lower()).to_numpy()
+    return (_broadcast(codes, size_mb, np.nan, np.float32),
+            _broadcast(codes, varies, False, bool))
+
+
+def parse_installs(series):
+    """"10,000+" -> 10000.0 (float64, NaN when unparseable)."""
+    codes, uniques = _factorize(series)
+    values = pd.to_numeric(uniques.str.replace(r'[+,\s]', '', regex=True), errors='coerce')
+    return _broadcast(codes, values.to_numpy(float), np.nan, np.float64)
+
+
+def parse_price(series):
+    """"$4.99" -> 4.99, "0"/"Free" -> 0.0 (float64, NaN when unparseable)."""
+    codes, uniques = _factorize(series)
+    cleaned = uniques.str.replace('$', '', regex=False).str.strip()
+    cleaned = cleaned.where(~cleaned.str.lower().eq('free'), '0')
+    values = pd.to_numeric(cleaned, errors='coerce')
+    return _broadcast(codes, values.to_numpy(float), np.nan, np.float64)
+
+
+def parse_android_version(series):
+    """"4.0.3 and up" -> 4.0 (float32 minimum major.minor, NaN for "Varies with device")."""
+    codes, uniques = _factorize(series)
+    values = pd.to_numeric(uniques.str.extract(r'(\d+\.\d+|\d+)', expand=False), errors='coerce')
+    return _broadcast(codes, values.to_numpy(float), np.nan, np.float32)
+
+
+# =====================================
+# App name features
+# =====================================
+# Name rules ("no digits", "does not start with X/Y/Z", "no letter s") used
+# to scan every name string on every run. The features below are computed
+# once per distinct name and turn those rules into integer bit tests.
+
+# Bit i of the character set <-> NAME_ALPHABET[i] (lower-cased); the next bit
+# flags any non-ASCII character
+NAME_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+NON_ASCII_BIT = len(NAME_ALPHABET)
+
+_CHAR_BITS = np.zeros(128, dtype=np.uint64)
+for _i, _c in enumerate(NAME_ALPHABET):
+    _CHAR_BITS[ord(_c)] = np.uint64(1) << np.uint64(_i)
+
+
+def char_bits(chars):
+    """Bit mask of the given characters (case-insensitive)."""
+    bits = np.uint64(0)
+    for c in chars.lower():
+        if c not in NAME_ALPHABET:
+            raise ValueError(f"{c!r} is not tracked in the name character set")
+        bits |= _CHAR_BITS[ord(c)]
+    return bits
+
+
+def _char_sets(names, block=100_000):
+    """uint64 character-presence bitset per name, from a UTF-32 code matrix."""
+    out = np.zeros(len(names), dtype=np.uint64)
+    lower = names.str.lower().to_numpy(dtype=str)
+    for start in range(0, len(lower), block):
+        part = lower[start:start + block]
+        width = max(part.dtype.itemsize // 4, 1)
+        codes = part.view(np.uint32).reshape(len(part), width)
+        bits = _CHAR_BITS[np.minimum(codes, 127)]
+        bits[codes > 127] = np.uint64(1) << np.uint64(NON_ASCII_BIT)
+        out[start:start + block] = np.bitwise_or.reduce(bits, axis=1)
+    return out
+
+
+def parse_app_names(series):
+    r"""App names -> dict of per-row features.
+
+    Name_Chars      uint64 character-presence bitset (see NAME_ALPHABET)
+    Name_First      first character, upper-cased ('' when missing)
+    Name_Length     number of characters
+    Name_Has_Digit  any digit (same test as .str.contains(r'\d'))
+    """
+    codes, uniques = _factorize(series)
+    return {
+        'Name_Chars': _broadcast(codes, _char_sets(uniques), 0, np.uint64),
+        'Name_First': pd.Categorical(_broadcast(codes, uniques.str.upper().str[:1].to_numpy(object), '', object)),
+        'Name_Length': _broadcast(codes, uniques.str.len().to_numpy(), 0, np.uint16),
+        'Name_Has_Digit': _broadcast(codes, uniques.str.contains(r'\d', regex=True).to_numpy(bool), False, bool),
+    }
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from playstore_data import DATA_FILE, clean_playstore, filter_mask, resolve_path
+
+# =====================================
+# Streaming ingestion for exports larger than RAM
+# =====================================
+# The CSV is read in fixed-size chunks; each chunk is cleaned, filtered and
+# folded into partial groupby aggregates. Only the per-group state is kept
+# between chunks, so peak memory depends on chunksize and the number of
+# groups, not on the number of rows.
+
+CHUNK_SIZE = 200_000
+
+_SUPPORTED = ('sum', 'count', 'mean', 'min', 'max')
+
+
+def iter_clean_chunks(path=DATA_FILE, filters=None, chunksize=CHUNK_SIZE):
+    """Yield cleaned chunks with the filter predicates already applied."""
+    reader = pd.read_csv(resolve_path(path), chunksize=chunksize)
+    for chunk in reader:
+        chunk = clean_playstore(chunk)
+        if filters:
+            chunk = chunk[filter_mask(chunk, filters)]
+        if not chunk.empty:
+            yield chunk
+
+
+class PartialAggregator:
+    """Combine per-chunk groupby partials into exact sum/count/mean/min/max.
+
+    aggs maps output name -> (column, func), as in DataFrame.groupby().agg().
+    """
+
+    def __init__(self, keys, aggs):
+        self.keys = list(keys)
+        self.aggs = dict(aggs)
+        for name, (col, func) in self.aggs.items():
+            if func not in _SUPPORTED:
+                raise ValueError(f"Unsupported streaming aggregate {func!r} for {name}")
+        self._state = None
+
+    def _partial(self, chunk):
+        spec = {}
+        for name, (col, func) in self.aggs.items():
+            if func in ('sum', 'mean'):
+                spec[f'{name}__sum'] = (col, 'sum')
+            if func in ('count', 'mean'):
+                spec[f'{name}__count'] = (col, 'count')
+            if func in ('min', 'max'):
+                spec[f'{name}__{func}'] = (col, func)
+        # Plain keys so chunks with different category sets line up
+        keyed = chunk.assign(**{k: chunk[k].astype(object) for k in self.keys
+                                if isinstance(chunk[k].dtype, pd.CategoricalDtype)})
+        return keyed.groupby(self.keys, dropna=False).agg(**spec)
+
+    def update(self, chunk):
+        part = self._partial(chunk)
+        if self._state is None:
+            self._state = part
+            return
+        both = pd.concat([self._state, part])
+        grouped = both.groupby(level=list(range(len(self.keys))), dropna=False)
+        combined = {}
+        for col in both.columns:
+            func = col.rsplit('__', 1)[1]
+            combined[col] = getattr(grouped[col], 'sum' if func == 'count' else func)()
+        self._state = pd.DataFrame(combined)
+
+    def result(self):
+        """Final aggregates as a flat frame (same shape as groupby().agg().reset_index())."""
+        columns = list(self.aggs)
+        if self._state is None:
+            return pd.DataFrame(columns=self.keys + columns)
+        out = pd.DataFrame(index=self._state.index)
+        for name, (col, func) in self.aggs.items():
+            if func == 'mean':
+                out[name] = self._state[f'{name}__sum'] / self._state[f'{name}__count']
+            else:
+                out[name] = self._state[f'{name}__{func}']
+        return out.reset_index()
+
+
+def stream_aggregate(keys, aggs, filters=None, path=DATA_FILE, chunksize=CHUNK_SIZE):
+    """One streaming pass: filter each chunk and fold it into a PartialAggregator."""
+    agg = PartialAggregator(keys, aggs)
+    for chunk in iter_clean_chunks(path, filters, chunksize):
+        agg.update(chunk)
+    return agg.result()
@@ -0,0 +1,183 @@
+import argparse
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from time_windows import WINDOWS, ist
+
+# =====================================
+# Background precompute ahead of the IST windows
+# =====================================
+# Every chart unlocks only inside a fixed IST window (time_windows.WINDOWS).
+# Instead of computing it when the first user asks after the window opens,
+# the scheduler warms it `lead` before the window starts and expires the
+# cached output once the window has closed. Windows are checked again at
+# every event (and at least once a minute), so a scheduler started in the
+# middle of a window warms that window straight away.
+#
+# Usage: python precompute.py [--lead MINUTES]
+#   keeps the figure cache warm for dashboard.py and the cleaned snapshot /
+#   incremental aggregates warm for the task scripts.
+# dashboard_server.py runs the same scheduler in-process for its fragments.
+
+PRECOMPUTE_LEAD = timedelta(minutes=10)
+MAX_SLEEP_SECONDS = 60
+
+
+@dataclass
+class Window:
+    """A daily IST window: warm() runs before it opens, expire() after it closes."""
+    name: str
+    start: object        # datetime.time
+    end: object          # datetime.time
+    warm: callable
+    expire: callable = None
+
+    def bounds(self, day, tz=ist):
+        """(opens, closes) of this window on the given date, as aware datetimes."""
+        return (tz.localize(datetime.combine(day, self.start)),
+                tz.localize(datetime.combine(day, self.end)))
+
+
+class PrecomputeScheduler:
+
+    def __init__(self, windows, lead=PRECOMPUTE_LEAD, tz=ist):
+        self.windows = list(windows)
+        self.lead = lead
+        self.tz = tz
+        self._warmed = {}      # window name -> date of the warmed instance
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _instances(self, window, now):
+        # Yesterday's instance may still be expiring; tomorrow's may already be in its lead time
+        for offset in (-1, 0, 1):
+            yield window.bounds(now.date() + timedelta(days=offset), self.tz)
+
+    def run_pending(self, now=None):
+        """Warm or expire every window that is due at `now`; returns [(action, name)]."""
+        now = now or datetime.now(self.tz)
+        actions = []
+        for window in self.windows:
+            for opens, closes in self._instances(window, now):
+                day = opens.date()
+                if opens - self.lead <= now <= closes and self._warmed.get(window.name) != day:
+                    if self._run(window.warm, window.name, 'warm'):
+                        self._warmed[window.name] = day
+                        actions.append(('warm', window.name))
+                elif now > closes and self._warmed.get(window.name) == day:
+                    del self._warmed[window.name]
+                    if window.expire is not None:
+                        self._run(window.expire, window.name, 'expire')
+                    actions.append(('expire', window.name))
+        return actions
+
+    def _run(self, func, name, action):
+        try:
+            func()
+            return True
+        except Exception:
+            print(f"⚠️  precompute {action} failed for {name}:")
+            traceback.print_exc()
+            return False
+
+    def seconds_until_next(self, now=None):
+        """Seconds to the next warm or expire event (capped at MAX_SLEEP_SECONDS)."""
+        now = now or datetime.now(self.tz)
+        upcoming = [MAX_SLEEP_SECONDS]
+        for window in self.windows:
+            for opens, closes in self._instances(window, now):
+                for moment in (opens - self.lead, closes + timedelta(seconds=1)):
+                    if moment > now:
+                        upcoming.append((moment - now).total_seconds())
+        return max(min(upcoming), 0.5)
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(self.seconds_until_next())
+
+    def start(self):
+        """Run the scheduler in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_forever, name='precompute', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# -------------------------------
+# Standalone warmers
+# -------------------------------
+
+def dashboard_windows(cache):
+    """Windows that keep dashboard.py's figure cache warm for each chart.
+
+    Nothing is expired: fragments are keyed by data version, so tomorrow's
+    window reuses them when the data is unchanged (the cache's LRU bound
+    drops old versions). When it has changed, dashboard's frame is reloaded
+    first so the new version's fragments aren't drawn from the old data.
+    """
+    import dashboard
+    from playstore_data import data_version
+
+    windows = []
+    for title, spec, start, end in dashboard.charts_config:
+        def warm(spec=spec):
+            version = data_version()
+            dashboard.use_data_version(version)
+            dashboard.build_fragments([spec], cache, version)
+            cache.close()
+
+        windows.append(Window(title, start, end, warm))
+    return windows
+
+
+def task_windows():
+    """Windows that make sure the task scripts start from a warm snapshot / maintained aggregates."""
+    from incremental import ingest
+    from playstore_data import load_playstore
+
+    def warm_snapshot():
+        load_playstore()
+
+    def warm_aggregates():
+        load_playstore()
+        ingest()
+
+    windows = []
+    for name, window in WINDOWS.items():
+        if not name.startswith('task@'):
+            continue
+        # task@1-3 can read incrementally maintained aggregates (INCREMENTAL = True)
+        warm = warm_aggregates if name in ('task@1', 'task@2', 'task@3') else warm_snapshot
+        windows.append(Window(name, window.start, window.end, warm))
+    return windows
+
+
+if __name__ == "__main__":
+    from figure_cache import MAX_CACHE_BYTES, FigureCache
+
+    parser = argparse.ArgumentParser(description="Precompute charts ahead of their IST windows")
+    parser.add_argument('--lead', type=float, default=PRECOMPUTE_LEAD.total_seconds() / 60,
+                        help="minutes before a window opens to start computing it")
+    args = parser.parse_args()
+
+    cache = FigureCache(max_bytes=MAX_CACHE_BYTES)
+    scheduler = PrecomputeScheduler(dashboard_windows(cache) + task_windows(),
+                                    lead=timedelta(minutes=args.lead))
+    print(f"⏳ Precomputing {len(scheduler.windows)} windows {args.lead:g} min ahead (Ctrl+C to stop)")
+    try:
+        while True:
+            for action, name in scheduler.run_pending():
+                print(f"{datetime.now(ist).strftime('%H:%M:%S')} IST  {action:<6} {name}")
+            time.sleep(scheduler.seconds_until_next())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,269 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from playstore_data import CONSTANT_COLUMNS, DERIVED_COLUMNS, column, filter_mask
+
+# =====================================
+# Indexed filter predicates
+# =====================================
+# A FilterIndex answers (column, op, value) filters from per-column indexes
+# built once per frame, instead of comparing every row again:
+#   numeric / date columns -> row positions sorted by value; a range filter is
+#                             two binary searches plus a scatter of the hits
+#   categorical columns    -> row positions bucketed by category code, so
+#                             ==, in and startswith are a union of buckets
+#   text columns (App)     -> the same buckets keyed by first character, so a
+#                             startswith only checks rows with the right letter
+#   'month' filters        -> buckets keyed by calendar month
+# Indexes are built lazily on the first filter that needs them. Results are
+# kept in a bounded LRU, so a sub-predicate shared by several charts (or
+# repeated across interactive filter changes) is computed once.
+#
+# A range that keeps or drops most rows is cheaper as one vectorized
+# comparison than as a scatter, so those fall back to filter_mask.
+
+RANGE_OPS = ('>=', '>', '<=', '<', '==', '!=')
+BUCKET_OPS = ('==', '!=', 'in', 'not in', 'startswith', 'not startswith')
+MAX_CACHED_MASKS = 256
+SCATTER_FRACTION = 0.125   # scatter when at most 1/8 of the rows must be touched
+
+
+class SortedIndex:
+    """Non-null row positions ordered by value."""
+
+    def __init__(self, values):
+        values = np.asarray(values)
+        if values.dtype.kind == 'M':
+            valid = ~np.isnat(values)
+        elif values.dtype.kind == 'f':
+            valid = ~np.isnan(values)
+        else:
+            values = values.astype('int64')
+            valid = np.ones(len(values), dtype=bool)
+        positions = np.flatnonzero(valid)
+        order = np.argsort(values[positions], kind='stable')
+        self.rows = len(values)
+        self.order = positions[order].astype(_position_dtype(self.rows))
+        self.keys = values[self.order]
+        self.nulls = np.flatnonzero(~valid)
+
+    def _bound(self, value, side):
+        kind = self.keys.dtype.kind
+        if kind == 'M':
+            value = pd.Timestamp(value).to_datetime64().astype(self.keys.dtype)
+        elif kind == 'f':
+            # Same rounding as the vectorized comparison (float32 column vs Python float)
+            value = np.asarray(value, dtype=self.keys.dtype)
+        elif not float(value).is_integer():
+            # Integers against 4.5: >= / > / <= / < all split right after 4
+            value, side = np.floor(value), 'right'
+        return int(np.searchsorted(self.keys, value, side=side))
+
+    def span(self, op, value):
+        """(start, stop) slice of self.order holding the rows where `col op value` holds.
+
+        For '!=' it is the slice where the values are equal (the caller inverts).
+        """
+        n = len(self.keys)
+        if op == '>=':
+            return self._bound(value, 'left'), n
+        if op == '>':
+            return self._bound(value, 'right'), n
+        if op == '<=':
+            return 0, self._bound(value, 'right')
+        if op == '<':
+            return 0, self._bound(value, 'left')
+        return self._bound(value, 'left'), self._bound(value, 'right')
+
+
+class BucketIndex:
+    """Row positions grouped by an integer code (-1 = missing)."""
+
+    def __init__(self, codes, labels):
+        codes = np.asarray(codes)
+        self.rows = len(codes)
+        self.labels = labels
+        self.order = np.argsort(codes, kind='stable').astype(_position_dtype(self.rows))
+        self.offsets = np.searchsorted(codes[self.order], np.arange(-1, len(labels) + 1))
+
+    def positions(self, codes):
+        """Rows whose code is in codes; codes outside the labels match nothing."""
+        parts = [self.order[self.offsets[c + 1]:self.offsets[c + 2]]
+                 for c in codes if 0 <= c < len(self.labels)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=self.order.dtype)
+
+    def codes_where(self, test):
+        """Codes whose label satisfies test(label); missing values never match."""
+        return [i for i, label in enumerate(self.labels) if test(str(label))]
+
+
+def _position_dtype(rows):
+    return 'int32' if rows < 2**31 else 'int64'
+
+
+def _scatter(rows, positions, value=True):
+    mask = np.zeros(rows, dtype=bool) if value else np.ones(rows, dtype=bool)
+    mask[positions] = value
+    return mask
+
+
+class FilterIndex:
+    """Indexes over one frame that answer filter predicates without a full scan."""
+
+    def __init__(self, df, max_masks=MAX_CACHED_MASKS):
+        self.df = df
+        self.rows = len(df)
+        self._sorted = {}
+        self._buckets = {}
+        self._kinds = {}
+        self._masks = OrderedDict()
+        self._max_masks = max_masks
+        self.hits = self.misses = 0
+
+    # -------------------------------
+    # Index builders
+    # -------------------------------
+
+    def sorted_index(self, col):
+        if col not in self._sorted:
+            self._sorted[col] = SortedIndex(column(self.df, col).to_numpy())
+        return self._sorted[col]
+
+    def bucket_index(self, col, kind='value'):
+        """Buckets of col by category ('value'), first character ('first') or calendar month."""
+        key = (col, kind)
+        if key not in self._buckets:
+            values = column(self.df, col)
+            if kind == 'month':
+                codes = values.dt.month.fillna(0).to_numpy(dtype='int64') - 1
+                labels = list(range(1, 13))
+            elif kind == 'first':
+                codes, labels = pd.factorize(values.astype(str).str[:1], sort=True)
+            else:
+                codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+            self._buckets[key] = BucketIndex(codes, list(labels))
+        return self._buckets[key]
+
+    def _kind(self, col):
+        if col not in self._kinds:
+            dtype = column(self.df.iloc[:1], col).dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                kind = 'category'
+            elif dtype.kind in 'iufM':
+                kind = 'range'
+            elif dtype.kind == 'b':
+                kind = None
+            else:
+                kind = 'text'
+            self._kinds[col] = kind
+        return self._kinds[col]
+
+    # -------------------------------
+    # Predicates
+    # -------------------------------
+
+    def supports(self, f):
+        if callable(f):
+            return False
+        col, op, value = f
+        if col not in self.df.columns and col not in DERIVED_COLUMNS and col not in CONSTANT_COLUMNS:
+            return False
+        kind = self._kind(col)
+        if op == 'month':
+            return kind == 'range'
+        if kind == 'range':
+            return op in RANGE_OPS
+        if kind == 'category':
+            return op in BUCKET_OPS
+        return kind == 'text' and op in ('startswith', 'not startswith')
+
+    def mask(self, f):
+        """Boolean mask of the rows where predicate f holds (read-only, cached)."""
+        if not self.supports(f):
+            return filter_mask(self.df, [f])
+        key = _predicate_key(f)
+        mask = self._masks.get(key)
+        if mask is not None:
+            self.hits += 1
+            self._masks.move_to_end(key)
+            return mask
+        self.misses += 1
+        mask = self._evaluate(f)
+        mask.flags.writeable = False
+        self._masks[key] = mask
+        if len(self._masks) > self._max_masks:
+            self._masks.popitem(last=False)
+        return mask
+
+    def _evaluate(self, f):
+        col, op, value = f
+        kind = self._kind(col)
+        if op == 'month':
+            return _scatter(self.rows, self.bucket_index(col, 'month').positions([value - 1]))
+        if kind == 'range':
+            return self._range_mask(f)
+        if kind == 'category':
+            return self._bucket_mask(f)
+        return self._prefix_mask(f)
+
+    def _range_mask(self, f):
+        col, op, value = f
+        index = self.sorted_index(col)
+        start, stop = index.span(op, value)
+        hits = index.order[start:stop]
+        if op == '!=':
+            # Everything but the equal rows (missing values compare unequal)
+            return _scatter(self.rows, hits, value=False)
+        misses = len(index.keys) - len(hits)
+        if min(len(hits), misses) > self.rows * SCATTER_FRACTION:
+            return filter_mask(self.df, [f])
+        if len(hits) <= misses:
+            return _scatter(self.rows, hits)
+        mask = _scatter(self.rows, index.order[:start], value=False)
+        mask[index.order[stop:]] = False
+        mask[index.nulls] = False
+        return mask
+
+    def _bucket_mask(self, f):
+        col, op, value = f
+        index = self.bucket_index(col)
+        negate = op in ('!=', 'not in', 'not startswith')
+        if op in ('==', '!='):
+            codes = index.codes_where(lambda label: label == str(value))
+        elif op in ('in', 'not in'):
+            wanted = {str(v) for v in value}
+            codes = index.codes_where(lambda label: label in wanted)
+        else:
+            prefixes = tuple(value)
+            codes = index.codes_where(lambda label: label.startswith(prefixes))
+        mask = _scatter(self.rows, index.positions(codes))
+        return ~mask if negate else mask
+
+    def _prefix_mask(self, f):
+        col, op, value = f
+        prefixes = tuple(value)
+        index = self.bucket_index(col, 'first')
+        firsts = {p[:1] for p in prefixes}
+        if '' in firsts:
+            mask = np.ones(self.rows, dtype=bool)
+        else:
+            rows = index.positions(index.codes_where(lambda label: label in firsts))
+            # One-letter prefixes are decided by the bucket; longer ones check the candidates only
+            if any(len(p) > 1 for p in prefixes):
+                text = column(self.df, col).iloc[rows].astype(str)
+                rows = rows[text.str.startswith(prefixes).to_numpy()]
+            mask = _scatter(self.rows, rows)
+        return ~mask if op == 'not startswith' else mask
+
+    def report(self):
+        return (f"Filter index: {len(self._sorted)} sorted, {len(self._buckets)} bucket indexes, "
+                f"{self.hits} mask hits / {self.misses} misses")
+
+
+def _predicate_key(f):
+    col, op, value = f
+    if isinstance(value, (list, set)):
+        value = tuple(value)
+    return (col, op, value)
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+from playstore_data import column
+
+# =====================================
+# Pricing analytics per Category x Content Rating x Android version
+# =====================================
+# One pass over the rows builds a table of segments (every combination that
+# occurs): rows are sorted once by (segment, paid, price), and every statistic
+# is a NumPy reduction over the sorted group offsets (np.add.reduceat) instead
+# of a pandas groupby per question:
+#   Apps / Paid_Apps / Free_Apps, Installs split Free vs Paid, Revenue
+#   (Installs x Price), average paid price, paid price percentiles
+#   elasticity proxy: slope of log10(installs) on log10(price) among paid
+#   apps (negative = pricier apps get fewer installs)
+#   price tier x install bucket counts
+# The counts, sums and regression moments are additive, so any rollup
+# (one category, all Teen apps on Android 4.x, ...) is a sum over segment rows;
+# percentiles are recomputed from the paid prices of the selected segments.
+#
+# Usage: python pricing.py
+
+SEGMENT_KEYS = ['Category', 'Content Rating', 'Android']
+
+PRICE_TIER_EDGES = [0, 1, 3, 10]     # Free | (0, 1] | (1, 3] | (3, 10] | above 10
+PRICE_TIERS = ['Free', '<= $1', '$1-3', '$3-10', '> $10']
+PERCENTILES = (25, 50, 75, 90)
+
+ADDITIVE = ['Apps', 'Paid_Apps', 'Installs', 'Paid_Installs', 'Revenue', 'Paid_Price_Sum',
+            '_n', '_x', '_y', '_xy', '_xx']
+
+
+def android_segment(df):
+    """Minimum Android major version as a label ('4.x'), 'Varies' when unknown."""
+    version = column(df, 'Android_Version').to_numpy(dtype='float64')
+    major = np.floor(version)
+    labels = np.array([f"{int(v)}.x" for v in np.unique(major[~np.isnan(major)])] + ['Varies'], dtype=object)
+    codes = np.searchsorted(np.unique(major[~np.isnan(major)]), major)
+    codes[np.isnan(major)] = len(labels) - 1
+    return pd.Categorical.from_codes(codes, labels)
+
+
+def price_tier(price):
+    """Index into PRICE_TIERS for every price."""
+    return np.searchsorted(PRICE_TIER_EDGES, np.asarray(price, dtype='float64'), side='left')
+
+
+def _group_offsets(sorted_codes):
+    """Start of every run of equal codes in a sorted array."""
+    return np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(sorted_codes) else \
+        np.empty(0, dtype='int64')
+
+
+def grouped_percentiles(codes, values, groups, percentiles=PERCENTILES):
+    """Linear-interpolated percentiles of values per group code (NaN for empty groups)."""
+    out = np.full((groups, len(percentiles)), np.nan)
+    if not len(values):
+        return out
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    starts = _group_offsets(codes)
+    sizes = np.diff(np.r_[starts, len(codes)])
+    for j, q in enumerate(percentiles):
+        pos = starts + (sizes - 1) * (q / 100)
+        lo = np.floor(pos).astype('int64')
+        hi = np.minimum(lo + 1, starts + sizes - 1)
+        out[codes[starts], j] = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+    return out
+
+
+def _ratio(num, den):
+    den = np.asarray(den, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / np.where(den > 0, den, 1), np.nan)
+
+
+def _finish(sums):
+    """{column: array} of counts, ratios, means and the elasticity slope from the additive sums."""
+    apps, paid = sums['Apps'], sums['Paid_Apps']
+    free, free_installs = apps - paid, sums['Installs'] - sums['Paid_Installs']
+    n, x, y = sums['_n'], sums['_x'], sums['_y']
+    denom = n * sums['_xx'] - x ** 2
+    slope = _ratio(n * sums['_xy'] - x * y, np.where(denom > 1e-12, denom, 0))
+    return {
+        'Apps': apps, 'Free_Apps': free, 'Paid_Apps': paid, 'Paid_Share': _ratio(paid, apps),
+        'Installs': sums['Installs'], 'Free_Installs': free_installs, 'Paid_Installs': sums['Paid_Installs'],
+        'Avg_Free_Installs': _ratio(free_installs, free), 'Avg_Paid_Installs': _ratio(sums['Paid_Installs'], paid),
+        'Revenue': sums['Revenue'], 'Avg_Paid_Price': _ratio(sums['Paid_Price_Sum'], paid),
+        'Elasticity': np.where(n >= 3, slope, np.nan),
+    }
+
+
+class PricingCube:
+    """Per-segment pricing statistics, built in one sorted pass and rolled up on demand."""
+
+    def __init__(self, df):
+        keys = {'Category': column(df, 'Category'), 'Content Rating': column(df, 'Content Rating'),
+                'Android': android_segment(df)}
+        codes, labels = [], []
+        for name in SEGMENT_KEYS:
+            c, u = pd.factorize(keys[name], sort=True)
+            codes.append(c)
+            labels.append(pd.Index(np.asarray(u)))
+        valid = np.all([c >= 0 for c in codes], axis=0)
+        segment = np.zeros(len(df), dtype='int64')
+        for c, u in zip(codes, labels):
+            segment = segment * len(u) + c
+        segment = np.where(valid, segment, -1)
+
+        price = column(df, 'Price').to_numpy(dtype='float64')
+        installs = column(df, 'Installs').to_numpy(dtype='int64')
+        paid = (column(df, 'Type') == 'Paid').to_numpy()
+        rows = np.flatnonzero(valid)
+
+        # One sort: segment, then free before paid, then price
+        order = rows[np.lexsort((price[rows], paid[rows], segment[rows]))]
+        seg_sorted = segment[order]
+        starts = _group_offsets(seg_sorted)
+        ids = seg_sorted[starts]
+
+        def total(values):
+            return np.add.reduceat(values[order], starts) if len(starts) else np.zeros(0, values.dtype)
+
+        price_paid = np.where(paid, price, 0.0)
+        regress = paid & (price > 0)
+        x = np.where(regress, np.log10(np.where(regress, price, 1.0)), 0.0)
+        y = np.where(regress, np.log10(installs + 1.0), 0.0)
+        table = pd.DataFrame({
+            'Apps': np.diff(np.r_[starts, len(order)]),
+            'Paid_Apps': total(paid.astype('int64')),
+            'Installs': total(installs),
+            'Paid_Installs': total(np.where(paid, installs, 0)),
+            'Revenue': total(installs * price),
+            'Paid_Price_Sum': total(price_paid),
+            '_n': total(regress.astype('int64')),
+            '_x': total(x), '_y': total(y), '_xy': total(x * y), '_xx': total(x * x),
+        })
+        # Decode segment ids back into their key labels
+        rest = ids.copy()
+        for name, u in reversed(list(zip(SEGMENT_KEYS, labels))):
+            table.insert(0, name, pd.Categorical.from_codes(rest % len(u), u))
+            rest //= len(u)
+        self.table = table
+        self.labels = dict(zip(SEGMENT_KEYS, labels))
+        self._codes = {name: table[name].cat.codes.to_numpy() for name in SEGMENT_KEYS}
+        self._sums = {col: table[col].to_numpy() for col in ADDITIVE}
+
+        # Paid prices per segment row (for percentiles) and tier x install bucket counts
+        segment_row = np.full(len(df), -1, dtype='int64')
+        segment_row[order] = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(order)]))
+        self._paid_rows = segment_row[paid & valid]
+        self._paid_prices = price[paid & valid]
+        self.install_buckets, bucket = np.unique(installs[rows], return_inverse=True)
+        cells = (segment_row[rows] * len(PRICE_TIERS) + price_tier(price[rows])) * len(self.install_buckets) + bucket
+        self._tiers = np.bincount(cells, minlength=len(starts) * len(PRICE_TIERS) * len(self.install_buckets)) \
+            .reshape(len(starts), len(PRICE_TIERS), len(self.install_buckets))
+
+    # -------------------------------
+    # Queries
+    # -------------------------------
+
+    def _select(self, where):
+        """Boolean mask over segment rows, e.g. where={'Category': 'GAME', 'Android': ['4.x', '5.x']}."""
+        mask = np.ones(len(self.table), dtype=bool)
+        for name, value in where.items():
+            if name not in SEGMENT_KEYS:
+                raise KeyError(f"{name!r} is not one of {SEGMENT_KEYS}")
+            values = [value] if isinstance(value, str) or not np.iterable(value) else list(value)
+            wanted = self.labels[name].get_indexer(values)
+            mask &= np.isin(self._codes[name], wanted[wanted >= 0])
+        return mask
+
+    def _percentiles(self, out, codes, groups):
+        keep = codes >= 0
+        pct = grouped_percentiles(codes[keep], self._paid_prices[keep], groups)
+        for j, q in enumerate(PERCENTILES):
+            out[f'Price_P{q}'] = pct[:, j]
+        return out
+
+    def segments(self, **where):
+        """Statistics of every segment (optionally only the matching ones)."""
+        sel = self._select(where)
+        rows = np.full(len(self.table), -1, dtype='int64')
+        rows[sel] = np.arange(sel.sum())
+        out = _finish({col: values[sel] for col, values in self._sums.items()})
+        out = self._percentiles(out, rows[self._paid_rows], int(sel.sum()))
+        keys = self.table.loc[sel, SEGMENT_KEYS].reset_index(drop=True)
+        return pd.concat([keys, pd.DataFrame(out)], axis=1)
+
+    def breakdown(self, by, where=None):
+        """Statistics rolled up to the keys in `by` (a subset of SEGMENT_KEYS)."""
+        by = [by] if isinstance(by, str) else list(by)
+        sel = self._select(where or {})
+        group, keys = pd.factorize(pd.MultiIndex.from_frame(self.table.loc[sel, by]), sort=True)
+        sums = {}
+        for col, values in self._sums.items():
+            sums[col] = np.bincount(group, weights=values[sel], minlength=len(keys))
+            if values.dtype.kind == 'i':
+                sums[col] = np.round(sums[col]).astype('int64')
+        segment_group = np.full(len(self.table), -1, dtype='int64')
+        segment_group[sel] = group
+        out = self._percentiles(_finish(sums), segment_group[self._paid_rows], len(keys))
+        return pd.concat([keys.to_frame(index=False, name=by), pd.DataFrame(out)], axis=1)
+
+    def query(self, **where):
+        """Totals for one combination of segments, e.g. query(Category='GAME', **{'Content Rating': 'Teen'})."""
+        sel = self._select(where)
+        out = _finish({col: values[sel].sum() for col, values in self._sums.items()})
+        prices = self._paid_prices[sel[self._paid_rows]]
+        pct = np.percentile(prices, PERCENTILES) if len(prices) else [np.nan] * len(PERCENTILES)
+        for q, value in zip(PERCENTILES, pct):
+            out[f'Price_P{q}'] = value
+        return pd.Series(out, dtype='float64')
+
+    def tiers(self, **where):
+        """Apps per price tier (rows) and install bucket (columns) for the matching segments."""
+        counts = self._tiers[self._select(where)].sum(axis=0)
+        return pd.DataFrame(counts, index=pd.Index(PRICE_TIERS, name='Price tier'),
+                            columns=pd.Index(self.install_buckets, name='Installs'))
+
+
+if __name__ == "__main__":
+    from playstore_data import load_playstore
+
+    cube = PricingCube(load_playstore())
+    pd.set_option('display.width', 160)
+    pd.set_option('display.max_columns', 20)
+    print(f"{len(cube.table):,} segments")
+    print("\nFree vs Paid by content rating:")
+    print(cube.breakdown('Content Rating'))
+    print("\nGAME apps rated Everyone on Android 4.x:")
+    print(cube.query(Category='GAME', **{'Content Rating': 'Everyone', 'Android': '4.x'}))
+    print("\nPrice tier x install bucket, all apps:")
+    print(cube.tiers())
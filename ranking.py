@@ -0,0 +1,177 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from chart_engine import ChartSpec, MaskCache, combine_tables, finish_spec, measure_table
+from playstore_data import column
+
+# =====================================
+# Top-k rankings
+# =====================================
+# Leaderboards used to be a full groupby + sort_values().head(k). Here:
+#   top_k()            partial selection: np.argpartition finds the k best in
+#                      linear time and only those k are sorted
+#   top_k_per_group()  the k best rows inside every group (top apps per
+#                      category) from one vectorized sort, no per-group loop
+#   Leaderboard        running per-key aggregates (additive measure tables,
+#                      see chart_engine) for any number of filter sets;
+#                      append() only aggregates the new rows, and a filter set
+#                      seen before is answered without touching the rows
+# Ties keep their original order, like a stable sort or nlargest(keep='first').
+# Missing values rank last.
+
+BOARD_AGGS = dict(
+    Apps=('Installs', 'count'),
+    Installs=('Installs', 'sum'),
+    Reviews=('Reviews', 'sum'),
+    Revenue=('Revenue', 'sum'),
+    Rating=('Rating', 'mean'),
+)
+MAX_FILTER_SETS = 64
+
+
+def top_k_positions(values, k, largest=True):
+    """Positions of the k largest (or smallest) values, best first."""
+    values = np.asarray(values, dtype='float64')
+    k = max(0, min(k, len(values)))
+    valid = np.flatnonzero(~np.isnan(values))
+    keys = -values[valid] if largest else values[valid]
+    if k < len(valid):
+        # Everything at least as good as the k-th best, ties at the boundary included
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]] if k else -np.inf
+        keep = keys <= kth
+        valid, keys = valid[keep], keys[keep]
+    order = valid[np.lexsort((valid, keys))][:k]
+    if len(order) < k:
+        order = np.concatenate([order, np.flatnonzero(np.isnan(values))[:k - len(order)]])
+    return order
+
+
+def top_k(data, k, metric=None, largest=True):
+    """The k best rows of a DataFrame by metric (or of a Series by value), best first."""
+    values = data if metric is None else data[metric]
+    return data.iloc[top_k_positions(values.to_numpy(dtype='float64', na_value=np.nan), k, largest)]
+
+
+def top_k_per_group(df, k, metric, by, largest=True):
+    """The k best rows of every `by` group, grouped in category order and best first within each."""
+    codes, _ = pd.factorize(column(df, by), sort=True)
+    values = column(df, metric).to_numpy(dtype='float64', na_value=np.nan)
+    keys = -values if largest else values.copy()
+    keys[np.isnan(keys)] = np.inf
+    positions = np.arange(len(df))
+    order = np.lexsort((positions, keys, codes))
+    order = order[codes[order] >= 0]
+    sorted_codes = codes[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_codes, sorted_codes, side='left')
+    return df.iloc[order[rank < k]]
+
+
+def update_top_k_per_group(previous, rows, k, metric, by, largest=True):
+    """top_k_per_group over old + new rows, from the previous result and the new rows only."""
+    return top_k_per_group(pd.concat([previous, rows]), k, metric, by, largest)
+
+
+def _filters_key(filters):
+    key = []
+    for f in filters:
+        if callable(f):
+            key.append(('callable', id(f)))
+        else:
+            col, op, value = f
+            key.append((col, op, tuple(value) if isinstance(value, (list, set)) else value))
+    return tuple(key)
+
+
+class Leaderboard:
+    """Per-key aggregates kept up to date as rows arrive, ranked with top_k."""
+
+    def __init__(self, df, keys=('Category',), aggs=BOARD_AGGS, index=None,
+                 max_filter_sets=MAX_FILTER_SETS):
+        self.keys = list(keys)
+        self.aggs = aggs
+        self._chunks = [df]
+        self._frame = df
+        self._index = index            # optional FilterIndex over df
+        self._tables = OrderedDict()   # filters key -> (spec, measure table)
+        self._stats = {}               # filters key -> finished stats, until the next append
+        self._max_filter_sets = max_filter_sets
+
+    def _rows(self):
+        if self._frame is None:
+            self._frame = pd.concat(self._chunks, ignore_index=True)
+            self._chunks = [self._frame]
+        return self._frame
+
+    def _measures(self, df, spec, index=None):
+        return measure_table(df, [spec], MaskCache(df, index), plain_keys=True)
+
+    def _table(self, filters):
+        key = _filters_key(filters)
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+        spec = ChartSpec('board', None, list(filters), self.keys, self.aggs)
+        index = self._index if len(self._chunks) == 1 else None
+        entry = self._tables[key] = (spec, self._measures(self._rows(), spec, index))
+        if len(self._tables) > self._max_filter_sets:
+            self._stats.pop(self._tables.popitem(last=False)[0], None)
+        return entry
+
+    def append(self, rows):
+        """Add new rows: every filter set already seen is updated from these rows alone."""
+        if not len(rows):
+            return
+        for key, (spec, table) in self._tables.items():
+            self._tables[key] = (spec, combine_tables([table, self._measures(rows, spec)]))
+        self._stats.clear()
+        self._chunks.append(rows)
+        self._frame = None
+        self._index = None   # built over the old rows only
+
+    def stats(self, filters=()):
+        """One row per key with every aggregate (and the row count behind each mean)."""
+        key = _filters_key(filters)
+        if key in self._stats:
+            return self._stats[key].copy()
+        spec, table = self._table(filters)
+        stats = finish_spec(table, spec)
+        part = table[spec.name].groupby(level=self.keys, observed=True).sum().sort_index()
+        part = part[part[('__rows', 'count')] > 0]
+        for name, (col, func) in self.aggs.items():
+            if func == 'mean':
+                stats[f'{name}_count'] = part[(name, 'count')].to_numpy()
+        self._stats[key] = stats
+        return stats.copy()
+
+    def top(self, metric, k=10, filters=(), min_count=0, largest=True):
+        """Top-k keys by metric; for a mean, keys backed by fewer than min_count values are skipped."""
+        stats = self.stats(filters)
+        if min_count:
+            support = f'{metric}_count' if f'{metric}_count' in stats.columns else None
+            counts = stats[support] if support else stats[self._row_count_column()]
+            stats = stats[counts >= min_count]
+        return top_k(stats, k, metric, largest).reset_index(drop=True)
+
+    def _row_count_column(self):
+        for name, (col, func) in self.aggs.items():
+            if func == 'count':
+                return name
+        raise ValueError("min_count on a sum needs a 'count' aggregate in aggs")
+
+
+if __name__ == "__main__":
+    from playstore_data import load_playstore
+
+    df = load_playstore()
+    board = Leaderboard(df)
+    pd.set_option('display.width', 140)
+    print("Top 10 categories by installs:")
+    print(board.top('Installs', 10))
+    print("\nTop 5 categories by average rating (at least 100 rated apps):")
+    print(board.top('Rating', 5, min_count=100))
+    print("\nTop 5 categories by revenue among paid apps:")
+    print(board.top('Revenue', 5, filters=[('Type', '==', 'Paid')]))
+    print("\nTop 3 apps per category by reviews (first 12 rows):")
+    print(top_k_per_group(df, 3, 'Reviews', 'Category')[['Category', 'App', 'Reviews']].head(12))
@@ -0,0 +1,212 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from playstore_data import CACHE_DIR, column, file_sha1, resolve_path
+
+# =====================================
+# User reviews -> per-app sentiment
+# =====================================
+# Review exports (one row per review: App, Translated_Review, Sentiment,
+# Sentiment_Polarity, Sentiment_Subjectivity) are orders of magnitude larger
+# than the catalog, so they are never loaded whole or merged row against row:
+#   1. the CSV is streamed in chunks, reading only the columns used here
+#   2. every chunk is reduced to per-app sums (bincount over the factorized
+#      app names) and folded into running sums keyed by a 64-bit hash of App
+#   3. the per-app table (sorted by that hash) is persisted under .cache and
+#      reused while the review file is unchanged
+#   4. join_sentiment() looks every catalog app up in the sorted hashes
+#      (np.searchsorted), one lookup per distinct name
+# Apps without scored reviews get NaN. After the join the sentiment columns
+# are ordinary columns, so filters like ('Sentiment_Subjectivity', '>', 0.5)
+# work everywhere filter_mask does.
+#
+# Usage: python reviews.py [REVIEWS_CSV]
+
+REVIEWS_FILE = "Review.csv"
+CHUNK_SIZE = 200_000
+SENTIMENT_LAYOUT = 1
+
+REVIEW_COLUMNS = ['App', 'Sentiment', 'Sentiment_Polarity', 'Sentiment_Subjectivity']
+LABELS = ['Positive', 'Negative', 'Neutral']
+_SUMS = ['Scored', 'Polarity_Sum', 'Subjectivity_Sum', *LABELS]
+
+# Columns join_sentiment() adds to the catalog
+SENTIMENT_COLUMNS = ['Sentiment_Reviews', 'Sentiment_Polarity', 'Sentiment_Subjectivity',
+                     'Positive_Share', 'Negative_Share', 'Neutral_Share']
+
+
+class ReviewSchemaError(ValueError):
+    """The review file does not have the per-review sentiment columns."""
+
+
+def app_hashes(names):
+    """(codes, distinct names, 64-bit hash per distinct name); codes are -1 for missing names."""
+    codes, uniques = pd.factorize(np.asarray(names, dtype=object))
+    uniques = np.asarray(uniques, dtype=object)
+    return codes, uniques, pd.util.hash_array(uniques, categorize=False)
+
+
+def check_schema(path=REVIEWS_FILE):
+    """Resolved path of the review file; raises ReviewSchemaError when a sentiment column is missing."""
+    path = resolve_path(path)
+    header = pd.read_csv(path, nrows=0).columns
+    missing = [c for c in REVIEW_COLUMNS if c not in header]
+    if missing:
+        raise ReviewSchemaError(f"{os.path.basename(path)} has no {', '.join(missing)} column(s); "
+                                f"expected one row per review with {', '.join(REVIEW_COLUMNS)}")
+    return path
+
+
+def _chunk_sums(chunk):
+    """(hashes, names, sums) for the scored reviews of one chunk, one row per app."""
+    polarity = pd.to_numeric(chunk['Sentiment_Polarity'], errors='coerce').to_numpy(dtype='float64')
+    subjectivity = pd.to_numeric(chunk['Sentiment_Subjectivity'], errors='coerce').to_numpy(dtype='float64')
+    scored = ~(np.isnan(polarity) | np.isnan(subjectivity)) & chunk['App'].notna().to_numpy()
+    codes, names, hashes = app_hashes(chunk['App'].to_numpy(dtype=object)[scored])
+    label = chunk['Sentiment'].to_numpy(dtype=object)[scored]
+    n = len(names)
+    sums = np.column_stack([
+        np.bincount(codes, minlength=n),
+        np.bincount(codes, weights=polarity[scored], minlength=n),
+        np.bincount(codes, weights=subjectivity[scored], minlength=n),
+        *(np.bincount(codes, weights=label == name, minlength=n) for name in LABELS),
+    ]) if n else np.zeros((0, len(_SUMS)))
+    return hashes, names, sums
+
+
+class SentimentAccumulator:
+    """Running per-app review sums, keyed by the sorted 64-bit app hash."""
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype='uint64')
+        self.names = np.empty(0, dtype=object)
+        self.sums = np.zeros((0, len(_SUMS)))
+
+    def update(self, chunk):
+        hashes, names, sums = _chunk_sums(chunk)
+        keys = np.concatenate([self.keys, hashes])
+        self.keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        self.names = np.concatenate([self.names, names])[first]
+        stacked = np.vstack([self.sums, sums])
+        self.sums = np.column_stack([np.bincount(inverse, weights=stacked[:, j], minlength=len(self.keys))
+                                     for j in range(len(_SUMS))])
+
+    def result(self):
+        """Per-app sentiment table, sorted by App_Key."""
+        sums = dict(zip(_SUMS, self.sums.T))
+        scored = sums['Scored']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = {f'{name}_Share': sums[name] / scored for name in LABELS}
+            out = pd.DataFrame({
+                'App_Key': self.keys,
+                'App': pd.array(self.names, dtype='str'),
+                'Sentiment_Reviews': scored.astype('int64'),
+                'Sentiment_Polarity': sums['Polarity_Sum'] / scored,
+                'Sentiment_Subjectivity': sums['Subjectivity_Sum'] / scored,
+                **share,
+            })
+        return out
+
+
+def aggregate_reviews(path=REVIEWS_FILE, chunksize=CHUNK_SIZE):
+    """Stream the review CSV into per-app sentiment aggregates."""
+    path = check_schema(path)
+    acc = SentimentAccumulator()
+    for chunk in pd.read_csv(path, usecols=REVIEW_COLUMNS, chunksize=chunksize,
+                             dtype={'App': str, 'Sentiment': str}):
+        acc.update(chunk)
+    return acc.result()
+
+
+# -------------------------------
+# Persisted aggregates
+# -------------------------------
+
+def _sentiment_paths(path):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(' ', '_').lower()
+    return (os.path.join(CACHE_DIR, f"{stem}-sentiment.parquet"),
+            os.path.join(CACHE_DIR, f"{stem}-sentiment.meta.json"))
+
+
+def load_sentiment(path=REVIEWS_FILE, use_cache=True):
+    """Per-app sentiment table, rebuilt only when the review file's content changed."""
+    path = check_schema(path)
+    if not use_cache:
+        return aggregate_reviews(path)
+    table_path, meta_path = _sentiment_paths(path)
+    stat = os.stat(path)
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('layout') != SENTIMENT_LAYOUT or not os.path.exists(table_path):
+            meta = None
+    except (OSError, ValueError):
+        meta = None
+
+    sha1 = None
+    if meta is not None:
+        if (meta['mtime_ns'], meta['size']) == (stat.st_mtime_ns, stat.st_size):
+            return pd.read_parquet(table_path)
+        sha1 = file_sha1(path)
+        if sha1 == meta['sha1']:
+            meta.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+            return pd.read_parquet(table_path)
+
+    table = aggregate_reviews(path)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    table.to_parquet(table_path + '.tmp', index=False)
+    os.replace(table_path + '.tmp', table_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'layout': SENTIMENT_LAYOUT, 'source': os.path.basename(path),
+                   'sha1': sha1 or file_sha1(path), 'mtime_ns': stat.st_mtime_ns,
+                   'size': stat.st_size, 'apps': len(table)}, f)
+    os.replace(meta_path + '.tmp', meta_path)
+    return table
+
+
+# -------------------------------
+# Join
+# -------------------------------
+
+def join_sentiment(df, sentiment):
+    """The catalog with SENTIMENT_COLUMNS added (NaN for apps without scored reviews)."""
+    if sentiment.empty:
+        return df.assign(**{name: np.nan for name in SENTIMENT_COLUMNS})
+    codes, names, hashes = app_hashes(column(df, 'App'))
+    keys = sentiment['App_Key'].to_numpy(dtype='uint64')
+    pos = np.minimum(np.searchsorted(keys, hashes), len(keys) - 1)
+    # Guard against hash collisions: the names must match too
+    hit = (keys[pos] == hashes) & (sentiment['App'].to_numpy(dtype=object)[pos] == names)
+    row = np.where(codes >= 0, np.where(hit, pos, -1)[codes], -1)
+    found = row >= 0
+    return df.assign(**{name: np.where(found, sentiment[name].to_numpy(dtype='float64')[row], np.nan)
+                        for name in SENTIMENT_COLUMNS})
+
+
+def with_sentiment(df, path=REVIEWS_FILE):
+    """join_sentiment() with the persisted aggregates of the review file."""
+    return join_sentiment(df, load_sentiment(path))
+
+
+if __name__ == "__main__":
+    from playstore_data import load_playstore
+
+    source = sys.argv[1] if len(sys.argv) > 1 else REVIEWS_FILE
+    try:
+        sentiment = load_sentiment(source)
+    except ReviewSchemaError as e:
+        sys.exit(f"❌ {e}")
+    catalog = join_sentiment(load_playstore(), sentiment)
+    matched = catalog['Sentiment_Reviews'].notna()
+    print(f"{len(sentiment):,} apps with scored reviews "
+          f"({int(sentiment['Sentiment_Reviews'].sum()):,} reviews); "
+          f"{int(matched.sum()):,} of {len(catalog):,} catalog rows matched")
+    pd.set_option('display.width', 140)
+    print(catalog.loc[matched, ['App', 'Category', 'Rating', *SENTIMENT_COLUMNS]]
+          .sort_values('Sentiment_Reviews', ascending=False).head(10).to_string(index=False))
@@ -0,0 +1,233 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from playstore_data import CACHE_DIR, column, data_version, filter_mask, load_playstore
+from playstore_stream import CHUNK_SIZE, iter_clean_chunks
+
+# =====================================
+# Monthly category rollup cube
+# =====================================
+# Month x Category x Type x Content Rating x rating bucket x review bucket x
+# size bucket, with Installs/Reviews/Price/Rating sums and app counts. It is
+# built once per data version and persisted; the time-series charts then
+# re-aggregate a few thousand cube rows instead of scanning every app.
+#
+# Buckets are chosen so the thresholds the scripts use are answered exactly:
+#   Rating  -> Rating x 10 (ratings have one decimal), -1 for missing and
+#              OFF_GRID for a rating that is not a multiple of 0.1: while
+#              the cube holds such rows, every Rating filter raises CubeMiss
+#   Reviews -> right-closed bins (lo, hi] on REVIEW_EDGES; integers, so
+#              "> e" and ">= e + 1" are exact for every edge e
+#   Size_MB -> each edge gets its own point bucket between the open
+#              intervals, so >, >=, <, <= are exact on SIZE_EDGES
+# A filter the cube cannot answer exactly raises CubeMiss; callers fall back
+# to scanning rows.
+
+REVIEW_EDGES = np.array([0, 10, 100, 500, 1000, 5000, 10_000, 50_000, 100_000,
+                         500_000, 1_000_000, 10_000_000], dtype='int64')
+SIZE_EDGES = np.array([1, 5, 10, 15, 20, 30, 50, 80, 100], dtype='float64')
+OFF_GRID = -2   # Rating_x10 of ratings with more than one decimal
+
+# Bumped whenever the bucket definitions change, so persisted cubes are rebuilt
+CUBE_LAYOUT = 2
+
+DIMENSIONS = ['Month', 'Category', 'Type', 'Content Rating',
+              'Rating_x10', 'Review_Bucket', 'Size_Bucket']
+
+# Cube column holding the sum, and the count it must be divided by for a mean
+MEASURES = {
+    'Installs': ('Installs_Sum', 'Apps'),
+    'Reviews': ('Reviews_Sum', 'Apps'),
+    'Price': ('Price_Sum', 'Apps'),
+    'Rating': ('Rating_Sum', 'Rating_Count'),
+}
+
+
+class CubeMiss(ValueError):
+    """The cube's buckets cannot answer this filter exactly."""
+
+
+def cube_path(version):
+    return os.path.join(CACHE_DIR, f'rollup-v{CUBE_LAYOUT}-{version[:16]}.parquet')
+
+
+# -------------------------------
+# Build
+# -------------------------------
+
+def _size_bucket(size):
+    size = np.asarray(size, dtype='float64')
+    left = np.searchsorted(SIZE_EDGES, size, side='left')
+    on_edge = (left < len(SIZE_EDGES)) & (SIZE_EDGES[np.minimum(left, len(SIZE_EDGES) - 1)] == size)
+    # Open interval below edge i -> 2i, exactly edge i -> 2i + 1
+    bucket = 2 * left + on_edge
+    return np.where(np.isnan(size), -1, bucket).astype('int16')
+
+
+def _rating_bucket(rating):
+    x10 = rating * 10
+    bucket = np.where(np.isclose(x10, np.round(x10)), np.round(x10), OFF_GRID)
+    return np.where(np.isnan(rating), -1, bucket).astype('int16')
+
+
+def build_cube(df):
+    rating = df['Rating'].to_numpy(dtype='float64')
+    facts = pd.DataFrame({
+        'Month': column(df, 'Month'),
+        'Category': df['Category'],
+        'Type': df['Type'],
+        'Content Rating': df['Content Rating'],
+        'Rating_x10': _rating_bucket(rating),
+        'Review_Bucket': np.searchsorted(REVIEW_EDGES, df['Reviews'].to_numpy(), side='left').astype('int16'),
+        'Size_Bucket': _size_bucket(df['Size_MB']),
+        'Installs_Sum': df['Installs'].astype('int64'),
+        'Reviews_Sum': df['Reviews'].astype('int64'),
+        'Price_Sum': df['Price'],
+        'Rating_Sum': np.nan_to_num(rating),
+        'Rating_Count': (~np.isnan(rating)).astype('int64'),
+        'Apps': np.ones(len(df), dtype='int64'),
+    })
+    return facts.groupby(DIMENSIONS, observed=True, dropna=False).sum().reset_index()
+
+
+def build_cube_streaming(chunksize=CHUNK_SIZE):
+    """Same cube built chunk by chunk; cube rows are additive, so partials just sum up."""
+    cube = None
+    for chunk in iter_clean_chunks(chunksize=chunksize):
+        part = build_cube(chunk)
+        for col in ('Category', 'Type', 'Content Rating'):
+            part[col] = part[col].astype(object)
+        cube = part if cube is None else (
+            pd.concat([cube, part]).groupby(DIMENSIONS, dropna=False).sum().reset_index())
+    return cube
+
+
+def load_cube(get_df=load_playstore, version=None, streaming=False):
+    """The cube for the current data version, built (and persisted) on first use."""
+    version = version or data_version()
+    path = cube_path(version)
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    cube = build_cube_streaming() if streaming else build_cube(get_df())
+    for col in ('Category', 'Type', 'Content Rating'):
+        cube[col] = cube[col].astype('category')
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        cube.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    except ImportError:
+        pass  # no pyarrow: keep the cube in memory only
+    return cube
+
+
+# -------------------------------
+# Query
+# -------------------------------
+
+def _rating_mask(cube, op, value):
+    x10 = value * 10
+    if not np.isclose(x10, round(x10)):
+        raise CubeMiss(f"Rating threshold {value} is finer than 0.1")
+    bucket = cube['Rating_x10']
+    if (bucket == OFF_GRID).any():
+        raise CubeMiss("some ratings are finer than 0.1")
+    return np.asarray(_compare(bucket, op, int(round(x10)))) & (bucket >= 0).to_numpy()
+
+
+def _review_mask(cube, op, value):
+    # (lo, hi] bins: "> e" keeps buckets above e's; integers make ">= v" == "> v - 1"
+    if op in ('>=', '<'):
+        value, op = value - 1, {'>=': '>', '<': '<='}[op]
+    if op not in ('>', '<=') or value not in REVIEW_EDGES:
+        raise CubeMiss(f"Reviews {op} {value} is not on a review bucket edge")
+    edge = int(np.searchsorted(REVIEW_EDGES, value))
+    return np.asarray(_compare(cube['Review_Bucket'], op, edge))
+
+
+def _size_mask(cube, op, value):
+    hits = np.flatnonzero(SIZE_EDGES == value)
+    if op not in ('>', '>=', '<', '<=') or not len(hits):
+        raise CubeMiss(f"Size_MB {op} {value} is not on a size bucket edge")
+    point = 2 * int(hits[0]) + 1
+    bucket = cube['Size_Bucket']
+    limit = {'>': point, '>=': point - 1, '<': point - 1, '<=': point}[op]
+    return np.asarray(_compare(bucket, '>' if op in ('>', '>=') else '<=', limit)) & (bucket >= 0).to_numpy()
+
+
+def _compare(series, op, value):
+    return {'>': series > value, '>=': series >= value,
+            '<': series < value, '<=': series <= value,
+            '==': series == value, '!=': series != value}[op]
+
+
+def cube_mask(cube, filters):
+    """Translate (column, op, value) filters into a mask over cube rows, or raise CubeMiss."""
+    mask = np.ones(len(cube), dtype=bool)
+    for f in filters or ():
+        if callable(f):
+            raise CubeMiss("callable filters need the raw rows")
+        col, op, value = f
+        if col == 'Rating' and op in ('>', '>=', '<', '<=', '==', '!='):
+            mask &= _rating_mask(cube, op, value)
+        elif col == 'Reviews':
+            mask &= _review_mask(cube, op, value)
+        elif col == 'Size_MB':
+            mask &= _size_mask(cube, op, value)
+        elif col == 'Last Updated' and op == 'month':
+            mask &= filter_mask(cube, [('Month', 'month', value)])
+        elif col in ('Month', 'Category', 'Type', 'Content Rating'):
+            mask &= filter_mask(cube, [f])
+        else:
+            raise CubeMiss(f"{col} is not a cube dimension")
+    return mask
+
+
+def query(cube, filters, keys, aggs):
+    """groupby(keys).agg(aggs) over the rows matching filters, answered from the cube.
+
+    aggs maps output name -> (column, 'sum' | 'mean' | 'count') with columns
+    from MEASURES. Raises CubeMiss when the cube cannot answer exactly.
+    """
+    if not keys:
+        raise CubeMiss("row-level charts need the raw rows")
+    for k in keys:
+        if k not in DIMENSIONS[:4]:
+            raise CubeMiss(f"{k} is not a cube dimension")
+    needed = {'Apps'}
+    for name, (col, func) in aggs.items():
+        if col not in MEASURES:
+            raise CubeMiss(f"{col} is not a cube measure")
+        needed.update(MEASURES[col])
+
+    part = cube.loc[cube_mask(cube, filters), list(keys) + sorted(needed)]
+    grouped = part.groupby(list(keys), observed=True).sum()
+    out = pd.DataFrame(index=grouped.index)
+    for name, (col, func) in aggs.items():
+        total, count = MEASURES[col]
+        if func == 'sum':
+            out[name] = grouped[total]
+        elif func == 'count':
+            out[name] = grouped[count]
+        else:
+            out[name] = grouped[total] / grouped[count].where(grouped[count] > 0)
+    return out.reset_index()
+
+
+# -------------------------------
+# Time-series helpers
+# -------------------------------
+
+def monthly_installs(cube, filters=None):
+    """Month x Category pivot of summed installs."""
+    grp = query(cube, filters, ['Month', 'Category'], {'Installs': ('Installs', 'sum')})
+    return grp.pivot(index='Month', columns='Category', values='Installs').fillna(0)
+
+
+def cumulative(pivot):
+    return pivot.cumsum()
+
+
+def mom_growth(pivot):
+    return pivot.pct_change()
@@ -0,0 +1,184 @@
+import argparse
+import os
+import runpy
+import subprocess
+import sys
+import time
+import traceback
+from collections import defaultdict
+
+STARTED = time.perf_counter()
+
+# =====================================
+# One entry point for the task scripts and the dashboard
+# =====================================
+# Runs any subset of task@1.py ... task@6.py and the dashboard in a single
+# process: Python, pandas and the cleaned dataset are loaded once
+# (load_playstore keeps the frame for the process) instead of once per script.
+# matplotlib / plotly are only imported by the charts that draw with them.
+#
+# Charts are written headlessly to --output (images for the matplotlib tasks,
+# HTML for plotly) unless --show is given. A chart already drawn inside its
+# IST window (same script, same data) is copied from the window cache
+# (window_cache.py) instead of being drawn again; --redraw turns that off.
+#
+# Every task checks its IST window before importing pandas or its plotting
+# library, so a locked chart costs an interpreter start and nothing more.
+# --profile-imports runs the batch again under `python -X importtime` and
+# prints where the startup time went, per package and per top-level import.
+# --trace PREFIX records every load / clean / filter / groupby / render stage
+# (instrument.py): a summary with the rows each filter keeps, PREFIX.json and
+# a Chrome trace PREFIX.trace.json.
+#
+# Usage: python run_tasks.py [1 2 ... 6 dashboard] [--ignore-time-limits]
+#                            [--output DIR] [--format png|svg|pdf] [--show] [--redraw]
+#                            [--profile-imports [N]] [--trace PREFIX]
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+TASKS = {str(i): f"task@{i}.py" for i in range(1, 7)}
+TARGETS = [*TASKS, 'dashboard']
+
+
+def run_target(target, output_dir, show):
+    """Run one task script (or the dashboard) in this process."""
+    if target == 'dashboard':
+        import dashboard
+        if show:
+            dashboard.main()
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            dashboard.main(os.path.join(output_dir, "dashboard.html"), open_browser=False)
+    else:
+        runpy.run_path(os.path.join(BASE_DIR, TASKS[target]), run_name='__main__')
+
+
+# -------------------------------
+# Import-time profile
+# -------------------------------
+
+PROFILE_CHILD_ENV = 'RUN_TASKS_PROFILED'
+
+
+def parse_importtime(lines):
+    """[(module, self_seconds, cumulative_seconds, depth)] from `python -X importtime` stderr lines."""
+    entries = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue   # the header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(fields[0]) / 1e6, int(fields[1]) / 1e6, depth))
+    return entries
+
+
+def import_report(entries, top=15):
+    by_package = defaultdict(float)
+    for name, self_time, _, _ in entries:
+        by_package[name.split('.')[0]] += self_time
+    roots = sorted((e for e in entries if e[3] == 0), key=lambda e: e[2], reverse=True)
+
+    lines = [f"📦 Import time: {len(entries)} modules, {sum(by_package.values()):.3f}s",
+             "  by package (self time):"]
+    for package, seconds in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        lines.append(f"    {package:<32} {seconds:8.3f}s")
+    lines.append("  top-level imports (cumulative):")
+    for name, _, cumulative, _ in roots[:top]:
+        lines.append(f"    {name:<32} {cumulative:8.3f}s")
+    return "\n".join(lines)
+
+
+def profile_imports(argv, top):
+    """Run this batch in a child interpreter under -X importtime and report its imports."""
+    env = dict(os.environ, **{PROFILE_CHILD_ENV: '1'})
+    child = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(__file__), *argv],
+                           env=env, stderr=subprocess.PIPE, text=True)
+    other = [line for line in child.stderr.splitlines() if not line.startswith('import time:')]
+    if other:
+        print("\n".join(other), file=sys.stderr)
+    print()
+    print(import_report(parse_importtime(child.stderr.splitlines()), top))
+    return child.returncode
+
+
+# -------------------------------
+# Batch
+# -------------------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Play Store analyses in one process")
+    parser.add_argument('targets', nargs='*', metavar='TARGET', help="task numbers 1-6 and/or 'dashboard' (default: all)")
+    parser.add_argument('--ignore-time-limits', action='store_true',
+                        help="draw every chart regardless of its IST window")
+    parser.add_argument('--output', default='output', help="folder for headless chart files")
+    parser.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'],
+                        help="image format of the matplotlib charts")
+    parser.add_argument('--show', action='store_true',
+                        help="show charts interactively instead of writing files")
+    parser.add_argument('--redraw', action='store_true',
+                        help="draw every chart even if this window already has it cached")
+    parser.add_argument('--profile-imports', type=int, nargs='?', const=15, metavar='N',
+                        help="report the N most expensive imports (runs the batch under -X importtime)")
+    parser.add_argument('--trace', metavar='PREFIX',
+                        help="record every stage; writes PREFIX.json and PREFIX.trace.json (Chrome trace)")
+    args = parser.parse_args(argv)
+    unknown = set(args.targets) - {*TARGETS, 'all'}
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(sorted(unknown))} (choose from {', '.join(TARGETS)}, all)")
+
+    if args.profile_imports and not os.environ.get(PROFILE_CHILD_ENV):
+        argv = sys.argv[1:] if argv is None else list(argv)
+        return profile_imports(argv, args.profile_imports)
+
+    targets = TARGETS if not args.targets or 'all' in args.targets else list(dict.fromkeys(args.targets))
+
+    if not args.show:
+        # Must be set before anything imports matplotlib.pyplot
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+
+    import instrument
+    import task_output
+    import time_windows
+
+    time_windows.IGNORE_TIME_LIMITS = args.ignore_time_limits
+    task_output.OUTPUT_DIR = None if args.show else args.output
+    task_output.IMAGE_FORMAT = args.format
+    task_output.REUSE_CHARTS = not args.redraw
+    if args.trace:
+        instrument.enable()
+
+    timings = [('startup', time.perf_counter() - STARTED)]
+    failed = []
+    for target in targets:
+        name = 'dashboard' if target == 'dashboard' else TASKS[target]
+        print(f"\n▶ {name}")
+        t0 = time.perf_counter()
+        try:
+            with instrument.stage('task', name):
+                run_target(target, args.output, args.show)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                failed.append(name)
+        except Exception:
+            traceback.print_exc()
+            failed.append(name)
+        timings.append((name, time.perf_counter() - t0))
+
+    print("\n⏱  Timings")
+    for name, seconds in timings:
+        print(f"  {name:<12} {seconds:8.3f}s")
+    print(f"  {'total':<12} {time.perf_counter() - STARTED:8.3f}s")
+    if args.trace:
+        print("\n📊 Stages\n" + instrument.report())
+        for path in instrument.save(args.trace):
+            print(f"📊 Wrote {path}")
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
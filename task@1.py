@@ -1,94 +1,59 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import sys
 from datetime import datetime
-import pytz
 
-# -------------------------------
-# 1. LOAD DATA
-# -------------------------------
-# Dataset name updated as requested
-df = pd.read_csv("play Store Data.csv")
+from time_windows import WINDOWS, in_window, ist
+
+STREAMING = False    # ⬅️ Set True to aggregate the CSV chunk by chunk (bounded memory)
+INCREMENTAL = False  # ⬅️ Set True to read the incrementally maintained stats (incremental.py)
 
 # -------------------------------
-# 2. DATA CLEANING
+# 1. TIME CONDITION (3 PM – 5 PM IST)
 # -------------------------------
+# Checked before pandas / matplotlib are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
 
-# Convert Rating to numeric
-df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
+window = WINDOWS['task@1']
+current_time = datetime.now(ist).time()
 
-# Convert Reviews to numeric
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
+if not in_window(window.start, window.end, current_time):
+    print("⛔ Graph not available. Dashboard accessible only between 3 PM and 5 PM IST.")
+    sys.exit()
 
-# Convert Installs (remove + and ,)
-df['Installs'] = df['Installs'].str.replace('[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
 
-# Convert Size (remove 'M')
-df['Size'] = df['Size'].str.replace('M', '', regex=False)
-df['Size'] = pd.to_numeric(df['Size'], errors='coerce')
+if reuse_chart(window.name, 'task1_top_categories', __file__):
+    sys.exit()
 
-# Convert Last Updated to datetime
-df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
+from analyses import CATEGORY_AGGS, category_filters, top_categories
+from incremental import maintained
+from playstore_data import load_playstore
+from playstore_stream import stream_aggregate
+from ranking import top_k
 
 # -------------------------------
-# 3. FILTER CONDITIONS
+# 2. FILTER CONDITIONS
 # -------------------------------
 
-filtered_df = df[
-    (df['Rating'] >= 4.0) &
-    (df['Size'] >= 10) &
-    (df['Last Updated'].dt.month == 1)
-]
+thresholds = dict(min_rating=4.0, min_size=10, month=1)  # Rating >= 4.0, Size >= 10 MB, updated in January
 
 # -------------------------------
-# 4. GROUP BY CATEGORY
+# 3. LOAD DATA + TOP 10 CATEGORIES BY INSTALLS
 # -------------------------------
+# Same analysis with other thresholds, over one load: python analyses.py top_categories ...
 
-category_stats = filtered_df.groupby('Category').agg(
-    Avg_Rating=('Rating', 'mean'),
-    Total_Reviews=('Reviews', 'sum'),
-    Total_Installs=('Installs', 'sum')
-).reset_index()
-
-# Top 10 categories by installs
-top_10 = category_stats.sort_values(
-    by='Total_Installs', ascending=False
-).head(10)
+if INCREMENTAL:
+    top_10 = top_k(maintained('task1_categories'), 10, 'Total_Installs')
+elif STREAMING:
+    category_stats = stream_aggregate(['Category'], CATEGORY_AGGS, category_filters(**thresholds))
+    top_10 = top_k(category_stats, 10, 'Total_Installs')
+else:
+    top_10 = top_categories(load_playstore(), **thresholds, k=10)
 
 # -------------------------------
-# 5. TIME CONDITION (3 PM – 5 PM IST)
+# 4. GROUPED BAR CHART
 # -------------------------------
 
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
-
-start_time = datetime.strptime("15:00", "%H:%M").time()
-end_time = datetime.strptime("17:00", "%H:%M").time()
-
-if start_time <= current_time <= end_time:
-
-    # -------------------------------
-    # 6. GROUPED BAR CHART
-    # -------------------------------
-
-    x = range(len(top_10))
+from mpl_charts import draw
 
-    plt.figure(figsize=(12, 6))
-    plt.bar(x, top_10['Avg_Rating'], width=0.4, label='Average Rating')
-    plt.bar(
-        [i + 0.4 for i in x],
-        top_10['Total_Reviews'] / 1_000_000,
-        width=0.4,
-        label='Total Reviews (in millions)'
-    )
-
-    plt.xticks([i + 0.2 for i in x], top_10['Category'], rotation=45)
-    plt.xlabel("App Category")
-    plt.ylabel("Values")
-    plt.title("Top 10 App Categories: Average Rating vs Total Reviews")
-    plt.legend()
-    plt.tight_layout()
-    plt.show()
-
-else:
-    print("⛔ Graph not available. Dashboard accessible only between 3 PM and 5 PM IST.")
\ No newline at end of file
+show_figure(draw('category_bars', top_10), 'task1_top_categories')
@@ -1,138 +1,71 @@
 # =====================================
 # STEP 1: Import Required Libraries
 # =====================================
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime, time
-import pytz
+import sys
+from datetime import datetime
 
-
-# =====================================
-# STEP 2: Load Dataset
-# =====================================
-df = pd.read_csv("play store data.csv")
+from time_windows import WINDOWS, in_window, ist
 
 
 # =====================================
-# STEP 3: Data Cleaning
+# STEP 2: Time Restriction (1 PM – 2 PM IST)
 # =====================================
+# Checked before pandas / matplotlib are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
+window = WINDOWS['task@2']
+current_time = datetime.now(ist).time()
 
-# Clean Installs
-df['Installs'] = df['Installs'].astype(str).str.replace('[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
-
-# Clean Price
-df['Price'] = df['Price'].astype(str).str.replace('$', '', regex=True)
-df['Price'] = pd.to_numeric(df['Price'], errors='coerce').fillna(0)
-
-# Revenue calculation
-df['Revenue'] = df['Installs'] * df['Price']
-
-# Convert Size to MB
-def convert_size(size):
-    if isinstance(size, str):
-        if size.endswith('M'):
-            return float(size.replace('M', ''))
-        if size.endswith('k'):
-            return float(size.replace('k', '')) / 1024
-    return None
-
-df['Size_MB'] = df['Size'].apply(convert_size)
-
-# Extract Android Version
-df['Android_Version'] = (
-    df['Android Ver']
-    .astype(str)
-    .str.extract(r'(\d+\.\d+|\d+)')
-)
-df['Android_Version'] = pd.to_numeric(df['Android_Version'], errors='coerce')
+print("Current IST Time:", current_time)
 
-# App name length
-df['App_Length'] = df['App'].astype(str).apply(len)
+if not in_window(window.start, window.end, current_time):
+    print("⏰ Graph hidden (Visible only between 1 PM and 2 PM IST).")
+    sys.exit()
 
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
 
-# =====================================
-# STEP 4: APPLY CORRECT FILTERS ✅
-# =====================================
-filtered_df = df[
-    (df['Installs'] >= 10000) &
-    (
-        ((df['Type'] == 'Paid') & (df['Revenue'] >= 10000)) |
-        (df['Type'] == 'Free')
-    ) &
-    (df['Android_Version'] > 4.0) &
-    (df['Size_MB'] > 15) &
-    (df['Content Rating'] == 'Everyone') &
-    (df['App_Length'] <= 30)
-]
+if reuse_chart(window.name, 'task2_free_vs_paid', __file__):
+    sys.exit()
 
-
-# =====================================
-# STEP 5: Top 3 Categories by Installs
-# =====================================
-top_categories = (
-    filtered_df
-    .groupby('Category')['Installs']
-    .sum()
-    .sort_values(ascending=False)
-    .head(3)
-    .index
-)
+from analyses import FREE_VS_PAID_FILTERS, free_vs_paid
+from incremental import maintained
+from playstore_data import load_playstore
+from ranking import top_k
 
 
-# =====================================
-# STEP 6: Aggregate Free vs Paid
-# =====================================
-summary = (
-    filtered_df[filtered_df['Category'].isin(top_categories)]
-    .groupby(['Category', 'Type'], as_index=False)
-    .agg(
-        Avg_Installs=('Installs', 'mean'),
-        Avg_Revenue=('Revenue', 'mean')
-    )
-)
+INCREMENTAL = False  # ⬅️ Set True to read the incrementally maintained aggregates (incremental.py)
 
+if INCREMENTAL:
+    # Category x Type totals kept up to date by incremental.py
+    totals = maintained('task2_category_type')
+    top_categories = top_k(totals.groupby('Category')['Total_Installs'].sum(), 3).index
+    summary = totals[totals['Category'].isin(top_categories)][
+        ['Category', 'Type', 'Avg_Installs', 'Avg_Revenue']
+    ].reset_index(drop=True)
 
-# =====================================
-# STEP 7: Time Restriction (1 PM – 2 PM IST)
-# =====================================
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
+else:
+    # =====================================
+    # STEP 3: Load Dataset (cleaned by playstore_data)
+    # =====================================
+    df = load_playstore()
 
-start_time = time(13, 0)
-end_time   = time(14, 0)
 
-print("Current IST Time:", current_time)
+    # =====================================
+    # STEP 4-7: Filters, Top 3 Categories, Free vs Paid Averages
+    # =====================================
+    # Installs >= 10K, paid apps earning >= $10K, Android > 4.0, Size > 15 MB,
+    # rated Everyone, app names of at most 30 characters (analyses.FREE_VS_PAID_FILTERS,
+    # shared with the INCREMENTAL aggregate)
+    summary = free_vs_paid(df, **FREE_VS_PAID_FILTERS, k=3)
 
 
 # =====================================
 # STEP 8: Dual-Axis Chart
 # =====================================
-if start_time <= current_time <= end_time:
-
-    if summary.empty:
-        print("❌ No data available after applying filters.")
-    else:
-        labels = summary['Category'] + " (" + summary['Type'] + ")"
-        x = range(len(labels))
-
-        fig, ax1 = plt.subplots(figsize=(10, 5))
-
-        # Bar: Avg Installs
-        ax1.bar(x, summary['Avg_Installs'])
-        ax1.set_ylabel("Average Installs")
-
-        # Line: Avg Revenue
-        ax2 = ax1.twinx()
-        ax2.plot(x, summary['Avg_Revenue'], marker='o')
-        ax2.set_ylabel("Average Revenue ($)")
-
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(labels, rotation=45, ha='right')
-
-        plt.title("Average Installs vs Revenue (Free vs Paid Apps)")
-        plt.tight_layout()
-        plt.show()
-
+if summary.empty:
+    print("❌ No data available after applying filters.")
 else:
-    print("⏰ Graph hidden (Visible only between 1 PM and 2 PM IST).")
\ No newline at end of file
+    from mpl_charts import draw
+
+    # Bars: Avg Installs; line (second axis): Avg Revenue
+    show_figure(draw('free_vs_paid', summary), 'task2_free_vs_paid')
@@ -1,104 +1,77 @@
 # =====================================
 # STEP 1: Import Required Libraries
 # =====================================
-import pandas as pd
-import plotly.express as px
-from datetime import datetime, time
-import pytz
-
+import sys
+from datetime import datetime
 
-# =====================================
-# STEP 2: Load Dataset
-# =====================================
-df = pd.read_csv("play store data.csv")
+from time_windows import WINDOWS, in_window, ist
 
 
 # =====================================
-# STEP 3: Data Cleaning
+# STEP 2: Time Restriction (6 PM – 8 PM IST)
 # =====================================
+# Checked before pandas / plotly are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
+window = WINDOWS['task@3']
+current_time = datetime.now(ist).time()
 
-# Clean Installs
-df['Installs'] = (
-    df['Installs']
-    .astype(str)
-    .str.replace('[+,]', '', regex=True)
-)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
+print("Current IST Time:", current_time)
 
-# Drop invalid rows
-df = df.dropna(subset=['Installs', 'Category'])
+if not in_window(window.start, window.end, current_time):
+    print("⏰ Choropleth map visible only between 6 PM and 8 PM IST.")
+    sys.exit()
 
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
 
-# =====================================
-# STEP 4: Create Dummy Country Column (FIX)
-# =====================================
-df['Country'] = 'India'   # Required for Choropleth
-
+if reuse_chart(window.name, 'task3_choropleth', __file__):
+    sys.exit()
 
-# =====================================
-# STEP 5: Exclude Categories Starting with A, C, G, S
-# =====================================
-df = df[
-    ~df['Category'].str.startswith(('A', 'C', 'G', 'S'), na=False)
-]
+from analyses import category_map
+from incremental import maintained
+from playstore_data import load_playstore, with_columns
+from ranking import top_k
 
 
-# =====================================
-# STEP 6: Select Top 5 Categories by Installs
-# =====================================
-top_categories = (
-    df.groupby('Category')['Installs']
-    .sum()
-    .sort_values(ascending=False)
-    .head(5)
-    .index
-)
+INCREMENTAL = False  # ⬅️ Set True to read the incrementally maintained aggregates (incremental.py)
 
-df = df[df['Category'].isin(top_categories)]
+if INCREMENTAL:
+    # Category totals (A/C/G/S already excluded) kept up to date by incremental.py
+    totals = maintained('task3_categories')
+    top = top_k(totals, 5, 'Total_Installs')
+    map_df = with_columns(top, 'Country')[['Country', 'Category', 'Total_Installs']]
+    map_df = map_df.sort_values('Category').reset_index(drop=True)
+    map_df['Highlight'] = map_df['Total_Installs'] > 1_000_000
 
+else:
+    # =====================================
+    # STEP 3: Load Dataset (cleaned by playstore_data)
+    # =====================================
+    df = load_playstore()
 
-# =====================================
-# STEP 7: Aggregate Installs
-# =====================================
-map_df = (
-    df.groupby(['Country', 'Category'], as_index=False)
-    .agg(Total_Installs=('Installs', 'sum'))
-)
 
-# Highlight installs > 1 million
-map_df['Highlight'] = map_df['Total_Installs'] > 1_000_000
+    # =====================================
+    # STEP 4-7: Top 5 Categories (not A, C, G, S) by Installs
+    # =====================================
+    # Invalid rows dropped, dummy Country column added, installs > 1 million highlighted
+    map_df = category_map(df, exclude_prefixes=('A', 'C', 'G', 'S'), k=5, highlight_above=1_000_000)
 
 
 # =====================================
-# STEP 8: Time Restriction (6 PM – 8 PM IST)
+# STEP 8: Interactive Choropleth Map
 # =====================================
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
-
-start_time = time(18, 0)  # 6 PM
-end_time   = time(20, 0)  # 8 PM
-
-print("Current IST Time:", current_time)
-
+import plotly.express as px
 
-# =====================================
-# STEP 9: Interactive Choropleth Map
-# =====================================
-if start_time <= current_time <= end_time:
-
-    fig = px.choropleth(
-        map_df,
-        locations="Country",
-        locationmode="country names",
-        color="Total_Installs",
-        hover_name="Category",
-        hover_data=["Total_Installs"],
-        animation_frame="Category",
-        color_continuous_scale="Plasma",
-        title="Global Installs by Category (Top 5)"
-    )
-
-    fig.show()
+fig = px.choropleth(
+    map_df,
+    locations="Country",
+    locationmode="country names",
+    color="Total_Installs",
+    hover_name="Category",
+    hover_data=["Total_Installs"],
+    animation_frame="Category",
+    color_continuous_scale="Plasma",
+    title="Global Installs by Category (Top 5)"
+)
 
-else:
-    print("⏰ Choropleth map visible only between 6 PM and 8 PM IST.")
\ No newline at end of file
+show_figure(fig, 'task3_choropleth')
@@ -1,143 +1,59 @@
 # =====================================
 # STEP 1: Import Required Libraries
 # =====================================
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime, time
-import pytz
-import re
+import sys
+from datetime import datetime
 
-
-# =====================================
-# STEP 2: Load Dataset
-# =====================================
-df = pd.read_csv("play store data.csv")
+from time_windows import WINDOWS, in_window, ist
 
 
 # =====================================
-# STEP 3: Data Cleaning
+# STEP 2: Time Restriction (10 AM – 6 PM IST)
 # =====================================
+# Checked before pandas / matplotlib are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
+window = WINDOWS['task@4']
+current_time = datetime.now(ist).time()
 
-# Clean Installs
-df['Installs'] = (
-    df['Installs']
-    .astype(str)
-    .str.replace('[+,]', '', regex=True)
-)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
-
-# Clean Reviews
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
+print("Current IST Time:", current_time)
 
-# Convert Size to MB
-def convert_size(size):
-    if isinstance(size, str):
-        if size.endswith('M'):
-            return float(size.replace('M', ''))
-        elif size.endswith('k'):
-            return float(size.replace('k', '')) / 1024
-    return None
+if not in_window(window.start, window.end, current_time):
+    print("⏰ Visualization visible only between 10 AM and 6 PM IST.")
+    sys.exit()
 
-df['Size_MB'] = df['Size'].apply(convert_size)
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
 
-# Convert Last Updated to datetime
-df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-df['Month'] = df['Last Updated'].dt.to_period('M').dt.to_timestamp()
+if reuse_chart(window.name, 'task4_cumulative_installs', __file__):
+    sys.exit()
 
-# Remove app names with numbers
-df = df[~df['App'].astype(str).str.contains(r'\d', regex=True)]
+from analyses import CUMULATIVE_LABELS, cumulative_installs
+from playstore_data import load_playstore
 
 
 # =====================================
-# STEP 4: Apply Filters
+# STEP 3: Load Dataset (cleaned by playstore_data)
 # =====================================
-filtered_df = df[
-    (df['Rating'] >= 4.2) &
-    (df['Reviews'] > 1000) &
-    (df['Size_MB'] >= 20) &
-    (df['Size_MB'] <= 80) &
-    (df['Category'].str.startswith(('T', 'P'), na=False))
-]
+df = load_playstore()
 
 
 # =====================================
-# STEP 5: Aggregate Monthly Installs
+# STEP 4-8: Filters, Cumulative Monthly Installs, Growth > 25%
 # =====================================
-monthly_data = (
-    filtered_df
-    .groupby(['Month', 'Category'], as_index=False)
-    .agg(Monthly_Installs=('Installs', 'sum'))
+# No digits in the app name, Rating >= 4.2, Reviews > 1000, Size 20-80 MB,
+# Category starting with T or P; legend labels translated (CUMULATIVE_LABELS)
+cumulative_data, highlight_months, translated_labels = cumulative_installs(
+    df,
+    min_rating=4.2, min_reviews=1000, min_size=20, max_size=80,
+    prefixes=('T', 'P'), growth=0.25, labels=CUMULATIVE_LABELS
 )
 
-monthly_pivot = monthly_data.pivot(
-    index='Month',
-    columns='Category',
-    values='Monthly_Installs'
-).fillna(0)
-
-# Cumulative installs
-cumulative_data = monthly_pivot.cumsum()
-
-
-# =====================================
-# STEP 6: Month-over-Month Growth (>25%)
-# =====================================
-mom_growth = cumulative_data.pct_change()
-highlight_months = (mom_growth > 0.25).any(axis=1)
-
-
-# =====================================
-# STEP 7: Translate Legend Labels
-# =====================================
-category_translation = {
-    'Travel & Local': 'Voyage et Local',     # French
-    'Productivity': 'Productividad',         # Spanish
-    'Photography': '写真'                     # Japanese
-}
-
-translated_labels = [
-    category_translation.get(cat, cat)
-    for cat in cumulative_data.columns
-]
-
-
-# =====================================
-# STEP 8: Time Restriction (4 PM – 6 PM IST)
-# =====================================
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
-
-start_time = time(10, 0)  # 4 PM
-end_time   = time(18, 0)  # 6 PM
-
-print("Current IST Time:", current_time)
-
 
 # =====================================
 # STEP 9: Stacked Area Chart
 # =====================================
-if start_time <= current_time <= end_time:
-
-    fig, ax = plt.subplots(figsize=(12, 6))
-
-    ax.stackplot(
-        cumulative_data.index,
-        cumulative_data.T,
-        labels=translated_labels,
-        alpha=0.8
-    )
-
-    # Highlight high-growth months
-    for month in cumulative_data.index[highlight_months]:
-        ax.axvspan(month, month, color='black', alpha=0.08)
-
-    ax.set_title("Cumulative Installs Over Time by Category")
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Cumulative Installs")
-
-    ax.legend(loc='upper left')
-    plt.tight_layout()
-    plt.show()
+from mpl_charts import draw
 
-else:
-    print("⏰ Visualization visible only between 4 PM and 6 PM IST.")
\ No newline at end of file
+# High-growth months are marked in one vlines call
+fig = draw('cumulative_installs', cumulative_data, highlight_months, translated_labels)
+show_figure(fig, 'task4_cumulative_installs')
@@ -1,136 +1,82 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime, time
-import pytz
-import numpy as np
+import sys
+from datetime import datetime
+
+from time_windows import WINDOWS, in_window, ist
+
+# =====================================
+# STEP 1: Time Restriction (3 PM – 7 PM IST)
+# =====================================
+# Checked before pandas / matplotlib are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
+# FOR TESTING: run_tasks.py --ignore-time-limits bypasses the time restriction
+window = WINDOWS['task@5']
+current_time = datetime.now(ist).time()
+
+if not in_window(window.start, window.end, current_time):
+    print("⏰ Bubble chart visible only between 3 PM and 7 PM IST.")
+    print("Current IST Time:", current_time.strftime("%H:%M:%S"))
+    sys.exit()
+
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
+
+if reuse_chart(window.name, 'task5_size_vs_rating', __file__, ("Play Store Data.csv", "Review.csv")):
+    sys.exit()
+
+from analyses import BUBBLE_CATEGORIES, BUBBLE_LABELS, size_vs_rating
+from playstore_data import load_playstore
+from reviews import ReviewSchemaError, with_sentiment
+
+
+MIN_SUBJECTIVITY = None  # ⬅️ e.g. 0.5 keeps apps whose reviews are mostly subjective (drops apps without reviews)
 
 # =====================================
-# STEP 1: Load Dataset
+# STEP 2: Load Dataset (cleaned by playstore_data)
 # =====================================
-# Ensure the file name matches your local file
 try:
-    df = pd.read_csv("play store data.csv")
+    df = load_playstore()
 except FileNotFoundError:
     print("Error: 'play store data.csv' not found. Please check the file path.")
-    exit()
+    sys.exit()
 
 # =====================================
-# STEP 2: Data Cleaning
+# STEP 3: Name Rules
 # =====================================
-# Clean Installs (Remove + and ,)
-df['Installs'] = df['Installs'].astype(str).str.replace(r'[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
-
-# Convert Reviews
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
-
-# Convert Size to MB
-def convert_size(size):
-    if isinstance(size, str):
-        if 'M' in size:
-            return float(size.replace('M', ''))
-        elif 'k' in size:
-            return float(size.replace('k', '')) / 1024
-    return np.nan
-
-df['Size_MB'] = df['Size'].apply(convert_size)
-
 # --- THE FIX: Removing the "S" filter ---
 # The line removing 's' or 'S' was likely deleting 99% of your data.
 # I have commented it out below. 
 # df = df[~df['App'].astype(str).str.contains('s', case=False, regex=True)]
 
 # =====================================
-# STEP 3: Handle Sentiment & Categories
+# STEP 4: Handle Sentiment & Categories
 # =====================================
-if 'Sentiment_Subjectivity' not in df.columns:
-    df['Sentiment_Subjectivity'] = 0.6
-
-# Standardize Categories to Uppercase (as they usually are in this dataset)
-df['Category'] = df['Category'].str.upper()
-
-allowed_categories = [
-    'GAME', 'BEAUTY', 'BUSINESS', 'COMICS',
-    'COMMUNICATION', 'DATING', 'ENTERTAINMENT',
-    'SOCIAL', 'EVENTS'
-]
-
-# =====================================
-# STEP 4: Apply Filters (With Debugging)
-# =====================================
-print(f"Total apps initially: {len(df)}")
-
-filtered_df = df[
-    (df['Rating'] > 3.5) &
-    (df['Reviews'] > 500) &
-    (df['Installs'] > 50000) &
-    (df['Category'].isin(allowed_categories))
-].copy()
-
-# Drop rows with NaN in key columns needed for the chart
-filtered_df = filtered_df.dropna(subset=['Size_MB', 'Rating', 'Installs'])
-
-print(f"Apps remaining after filtering: {len(filtered_df)}")
+# Per-app averages from the review file (streamed and cached by reviews.py),
+# only needed by the opt-in subjectivity filter
+if MIN_SUBJECTIVITY is not None:
+    try:
+        df = with_sentiment(df)
+    except (FileNotFoundError, ReviewSchemaError) as e:
+        print(f"⚠️  No review sentiment ({e}); skipping the subjectivity filter.")
+        MIN_SUBJECTIVITY = None
 
 # =====================================
-# STEP 5: Translate Category Names
+# STEP 5-6: Apply Filters, Translate Category Names
 # =====================================
-category_translation = {
-    'BEAUTY': 'सौंदर्य',
-    'BUSINESS': 'வணிகம்',
-    'DATING': 'Dating (Deutsch)'
-}
-filtered_df['Category_Label'] = filtered_df['Category'].replace(category_translation)
+# Rows kept by each filter: PLAYSTORE_TRACE=trace python task@5.py (instrument.py)
+filtered_df = size_vs_rating(
+    df,
+    min_rating=3.5, min_reviews=500, min_installs=50000, min_subjectivity=MIN_SUBJECTIVITY,
+    categories=BUBBLE_CATEGORIES, labels=BUBBLE_LABELS
+)
 
 # =====================================
-# STEP 6: Time Restriction & Plotting
+# STEP 7: Plotting
 # =====================================
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
-start_time = time(15, 0)  # 5 PM IST
-end_time = time(19, 0)    # 7 PM IST
-
-# FOR TESTING: Set this to True to bypass the time restriction
-bypass_time_check = True 
-
-if (start_time <= current_time <= end_time) or bypass_time_check:
-    if filtered_df.empty:
-        print("❌ No data found with the current filters. Try lowering the Installs or Reviews requirement.")
-    else:
-        plt.figure(figsize=(12, 7))
-
-        # Scale bubble sizes
-        max_installs = filtered_df['Installs'].max()
-        # Prevent division by zero if max_installs is 0
-        if max_installs > 0:
-            installs_scaled = (filtered_df['Installs'] / max_installs) * 1000 + 50
-        else:
-            installs_scaled = 100
-
-        for category in filtered_df['Category_Label'].unique():
-            subset = filtered_df[filtered_df['Category_Label'] == category]
-            
-            # Highlight GAME in Pink
-            color = 'pink' if category == 'GAME' else 'skyblue'
-
-            plt.scatter(
-                subset['Size_MB'],
-                subset['Rating'],
-                s=installs_scaled[subset.index],
-                alpha=0.6,
-                label=category,
-                color=color,
-                edgecolors='w',
-                linewidth=0.5
-            )
-
-        plt.xlabel("App Size (MB)")
-        plt.ylabel("Average Rating")
-        plt.title("App Size vs Rating with Installs (Bubble Chart)")
-        plt.legend(title="Category", bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.grid(True, linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        plt.show()
+if filtered_df.empty:
+    print("❌ No data found with the current filters. Try lowering the Installs or Reviews requirement.")
+    print("   Rows kept by each filter: PLAYSTORE_TRACE=trace python task@5.py")
 else:
-    print("⏰ Bubble chart visible only between 5 PM and 7 PM IST.")
-    print("Current IST Time:", current_time.strftime("%H:%M:%S"))
\ No newline at end of file
+    from mpl_charts import draw
+
+    # One scatter for every category, bubbles scaled by installs, GAME in pink
+    show_figure(draw('size_vs_rating', filtered_df), 'task5_size_vs_rating')
@@ -1,102 +1,52 @@
 # =====================================
 # STEP 1: Import Required Libraries
 # =====================================
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime, time
-import pytz
-import numpy as np
+import sys
+from datetime import datetime
 
-# =====================================
-# STEP 2: Load Dataset
-# =====================================
-df = pd.read_csv("play store data.csv")
+from time_windows import WINDOWS, in_window, ist
 
 # =====================================
-# STEP 3: Data Cleaning
+# STEP 2: Time Restriction (6 PM – 9 PM IST)
 # =====================================
-# Use 'Last Updated' column as date
-if 'Last Updated' not in df.columns:
-    raise ValueError("Dataset must contain 'Last Updated' column for time series")
+# Checked before pandas / matplotlib are imported and before the data is
+# loaded: outside the window the script is done in milliseconds.
+window = WINDOWS['task@6']
+current_time = datetime.now(ist).time()
 
-df['Date'] = pd.to_datetime(df['Last Updated'], errors='coerce')
+if not in_window(window.start, window.end, current_time):
+    print("⏰ Time series chart visible only between 6 PM and 9 PM IST. Current IST Time:", current_time)
+    sys.exit()
 
-# Clean Installs
-df['Installs'] = df['Installs'].astype(str).str.replace('[+,]', '', regex=True)
-df['Installs'] = pd.to_numeric(df['Installs'], errors='coerce')
+# Headless runs reuse the chart already drawn in this window (window_cache.py)
+from task_output import reuse_chart, show_figure
 
-# Clean Reviews
-df['Reviews'] = pd.to_numeric(df['Reviews'], errors='coerce')
+if reuse_chart(window.name, 'task6_monthly_installs', __file__):
+    sys.exit()
 
-# Drop rows with missing critical data
-df = df.dropna(subset=['Date', 'Installs', 'Reviews', 'App', 'Category'])
+from analyses import MONTHLY_LABELS, installs_by_month
+from playstore_data import load_playstore
 
 # =====================================
-# STEP 4: Apply Filters
+# STEP 3: Load Dataset (cleaned by playstore_data)
 # =====================================
-# Reviews > 500
-df = df[df['Reviews'] > 500]
-
-# App name does not start with X, Y, Z
-df = df[~df['App'].str.upper().str.startswith(('X','Y','Z'))]
-
-# App name does not contain S/s
-df = df[~df['App'].str.contains('s', case=False, regex=True)]
-
-# Category starts with E, C, B
-df = df[df['Category'].str.upper().str.startswith(('E','C','B'))]
+df = load_playstore()
 
 # =====================================
-# STEP 5: Translate Categories
+# STEP 4-7: Filters, Monthly Installs by Category, MoM Growth
 # =====================================
-category_translation = {
-    'Beauty': 'सौंदर्य',          # Hindi
-    'Business': 'வணிகம்',         # Tamil
-    'Dating': 'Dating (Deutsch)'  # German
-}
-df['Category_Label'] = df['Category'].replace(category_translation)
+# Reviews > 500, app name not starting with X/Y/Z and without S/s
+# (precomputed name features), Category starting with E, C or B
+monthly_installs = installs_by_month(
+    df,
+    min_reviews=500, exclude_first='XYZ', exclude_chars='s',
+    prefixes=('E', 'C', 'B'), labels=MONTHLY_LABELS
+)
 
 # =====================================
-# STEP 6: Aggregate Total Installs by Month and Category
+# STEP 8: Plot Time Series Line Chart
 # =====================================
-df['YearMonth'] = df['Date'].dt.to_period('M')
-monthly_installs = df.groupby(['YearMonth', 'Category_Label'])['Installs'].sum().reset_index()
-monthly_installs['YearMonth'] = monthly_installs['YearMonth'].dt.to_timestamp()
-
-# Calculate month-over-month growth
-monthly_installs['MoM_Growth'] = monthly_installs.groupby('Category_Label')['Installs'].pct_change() * 100
-
-# =====================================
-# STEP 7: Time Restriction (6 PM – 9 PM IST)
-# =====================================
-ist = pytz.timezone('Asia/Kolkata')
-current_time = datetime.now(ist).time()
-start_time = time(18, 0)  # 6 PM IST
-end_time   = time(21, 0)  # 9 PM IST
-
-if start_time <= current_time <= end_time:
-    # =====================================
-    # STEP 8: Plot Time Series Line Chart
-    # =====================================
-    plt.figure(figsize=(14, 7))
-
-    categories = monthly_installs['Category_Label'].unique()
-    colors = plt.cm.tab10.colors  # up to 10 categories
-
-    for i, category in enumerate(categories):
-        subset = monthly_installs[monthly_installs['Category_Label'] == category].sort_values('YearMonth')
-        plt.plot(subset['YearMonth'], subset['Installs'], label=category, color=colors[i % len(colors)], linewidth=2)
-
-        # Shade areas where MoM growth > 20%
-        growth_mask = subset['MoM_Growth'] > 20
-        plt.fill_between(subset['YearMonth'], 0, subset['Installs'], where=growth_mask, color=colors[i % len(colors)], alpha=0.2)
+from mpl_charts import draw
 
-    plt.xlabel("Month")
-    plt.ylabel("Total Installs")
-    plt.title("Monthly Total Installs by Category (Highlight MoM Growth > 20%)")
-    plt.legend(title="Category")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
-else:
-    print("⏰ Time series chart visible only between 6 PM and 9 PM IST. Current IST Time:", current_time)
\ No newline at end of file
+# All category lines and growth (> 20% MoM) shading drawn as two collections
+show_figure(draw('monthly_installs', monthly_installs), 'task6_monthly_installs')
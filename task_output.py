@@ -0,0 +1,104 @@
+import os
+
+from instrument import stage
+
+# =====================================
+# Where the task charts go
+# =====================================
+# Interactive runs show each chart (plt.show / fig.show). Headless runs
+# (run_tasks.py) set OUTPUT_DIR and get files instead: matplotlib charts as
+# IMAGE_FORMAT images, plotly charts as HTML. The matplotlib charts come from
+# mpl_charts, which draws headless runs on pooled Agg figures (no pyplot).
+#
+# Headless charts are also kept in a WindowCache under the script's IST
+# window: a later run inside that window (or inside the next day's, with the
+# data unchanged) writes the cached file instead of loading, aggregating and
+# drawing again. The key includes the script's source and the CHART_SOURCES
+# it loads, aggregates and draws through, so editing a filter -- in the
+# script or in a default of analyses.py -- draws the chart afresh.
+
+OUTPUT_DIR = None     # None = show interactively
+IMAGE_FORMAT = 'png'  # 'png', 'svg' or 'pdf'
+REUSE_CHARTS = True   # ⬅️ Set False to redraw headless charts on every run
+
+CHART_SOURCES = ('analyses.py', 'chart_engine.py', 'incremental.py', 'mpl_charts.py',
+                 'playstore_data.py', 'playstore_parsers.py', 'playstore_stream.py',
+                 'ranking.py', 'reviews.py')
+
+_cache = None
+_pending = {}         # chart name -> (window, key, version) that reuse_chart() had no entry for
+
+
+def _chart_cache():
+    global _cache
+    if _cache is None:
+        from window_cache import WindowCache
+        _cache = WindowCache()
+    return _cache
+
+
+def _data_versions(data_files):
+    from playstore_data import data_version
+
+    versions = []
+    for path in data_files:
+        try:
+            versions.append(data_version(path))
+        except FileNotFoundError:
+            versions.append(None)
+    return versions
+
+
+def reuse_chart(window, name, script, data_files=("Play Store Data.csv",)):
+    """Write chart `name` from the window cache; True when it was, so the script can stop there."""
+    if OUTPUT_DIR is None or not REUSE_CHARTS:
+        return False
+    from figure_cache import cache_key
+    from playstore_data import file_sha1
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    sources = [file_sha1(os.path.join(here, source)) for source in CHART_SOURCES]
+    key = cache_key(name, IMAGE_FORMAT, file_sha1(script), *sources)
+    version = cache_key(*_data_versions(data_files))
+    cached = _chart_cache().get(window, key, version)
+    if cached is None:
+        _pending[name] = (window, key, version)
+        return False
+    filename, content = cached
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(OUTPUT_DIR, filename)
+    with open(path, 'wb') as f:
+        f.write(content)
+    print(f"🖼️  Reused {path} ({window} window)")
+    return True
+
+
+def show_figure(fig, name):
+    """Show fig, or write it to OUTPUT_DIR/<name>.<ext> when running headless. Returns the path written."""
+    is_plotly = hasattr(fig, 'write_html')
+    if OUTPUT_DIR is None:
+        if is_plotly:
+            fig.show()
+        else:
+            import matplotlib.pyplot as plt
+            plt.show()
+        return None
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with stage('render', name):
+        if is_plotly:
+            path = os.path.join(OUTPUT_DIR, f"{name}.html")
+            fig.write_html(path, include_plotlyjs='cdn')
+        else:
+            path = os.path.join(OUTPUT_DIR, f"{name}.{IMAGE_FORMAT}")
+            fig.savefig(path, format=IMAGE_FORMAT)
+            if fig.canvas.manager is not None:   # pooled Agg figures (mpl_charts) are not pyplot's
+                import matplotlib.pyplot as plt
+                plt.close(fig)
+    print(f"🖼️  Saved {path}")
+
+    pending = _pending.pop(name, None)
+    if pending is not None:
+        with open(path, 'rb') as f:
+            _chart_cache().put(*pending, (os.path.basename(path), f.read()))
+    return path
@@ -0,0 +1,79 @@
+from datetime import datetime, time, timedelta
+from typing import NamedTuple
+
+import pytz
+
+# =====================================
+# IST time gate shared by the task scripts and the dashboard
+# =====================================
+# Every chart is only shown inside its IST window. The windows are registered
+# here (WINDOWS) and the check lives here too, so a single switch
+# (run_tasks.py --ignore-time-limits) opens all of them. window_cache.py keys
+# cached results by these window names.
+
+IGNORE_TIME_LIMITS = False  # ⬅️ Set True to show every chart regardless of its window (testing)
+
+ist = pytz.timezone("Asia/Kolkata")
+
+
+class TimeWindow(NamedTuple):
+    """A daily IST window, start and end included."""
+    name: str
+    start: time
+    end: time
+
+    def span(self):
+        return f"{self.start:%H:%M}–{self.end:%H:%M}"
+
+
+WINDOWS = {w.name: w for w in [
+    # Task scripts
+    TimeWindow('task@1', time(15, 0), time(17, 0)),
+    TimeWindow('task@2', time(13, 0), time(14, 0)),
+    TimeWindow('task@3', time(18, 0), time(20, 0)),
+    TimeWindow('task@4', time(10, 0), time(18, 0)),
+    TimeWindow('task@5', time(15, 0), time(19, 0)),
+    TimeWindow('task@6', time(18, 0), time(21, 0)),
+    # Dashboard charts (by ChartSpec name)
+    TimeWindow('chart1', time(13, 0), time(14, 0)),
+    TimeWindow('chart2', time(14, 0), time(15, 0)),
+    TimeWindow('chart3', time(15, 0), time(16, 0)),
+    TimeWindow('chart4', time(16, 0), time(17, 0)),
+    TimeWindow('chart5', time(17, 0), time(18, 0)),
+    TimeWindow('chart6', time(18, 0), time(19, 0)),
+]}
+
+
+def now_ist():
+    return datetime.now(ist)
+
+
+def in_window(start, end, current_time=None):
+    """True when current_time (default: now, IST) is inside [start, end], or the limits are ignored."""
+    if IGNORE_TIME_LIMITS:
+        return True
+    if current_time is None:
+        current_time = now_ist().time()
+    return start <= current_time <= end
+
+
+def is_open(name, current_time=None):
+    """in_window() for a registered window."""
+    window = WINDOWS[name]
+    return in_window(window.start, window.end, current_time)
+
+
+def next_close(name, moment=None):
+    """First time window `name` closes at or after `moment` (default: now), as an aware IST datetime."""
+    moment = (moment or now_ist()).astimezone(ist)
+    closes = ist.localize(datetime.combine(moment.date(), WINDOWS[name].end))
+    return closes if moment <= closes else closes + timedelta(days=1)
+
+
+def last_transition(names, moment=None):
+    """Latest time at or before `moment` (default: now) that one of the windows opened or closed (aware IST)."""
+    moment = (moment or now_ist()).astimezone(ist)
+    edges = [ist.localize(datetime.combine(day, edge))
+             for name in names for edge in (WINDOWS[name].start, WINDOWS[name].end)
+             for day in (moment.date() - timedelta(days=1), moment.date())]
+    return max(t for t in edges if t <= moment)
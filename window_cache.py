@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+import threading
+
+from playstore_data import CACHE_DIR
+from time_windows import next_close, now_ist
+
+# =====================================
+# Results tied to an IST window
+# =====================================
+# Every entry records the window it belongs to (a name from
+# time_windows.WINDOWS) and the data version it was computed from. Two tiers:
+#   memory  kept until the window next closes after the entry was stored
+#           (an entry warmed ahead of the window lasts through it), so
+#           repeated refreshes inside a busy window are dictionary lookups
+#   disk    .cache/windows/<window>/, one pickle per key, kept after the
+#           window closes: the next day's window (or another process, such
+#           as the next run of a task script) reuses it if the data version
+#           is unchanged. A new version overwrites the entry in place.
+# Every lookup first evicts the memory entries of closed windows, so no
+# background thread is needed (precompute.py can still call expire()).
+
+WINDOW_CACHE_DIR = os.path.join(CACHE_DIR, 'windows')
+
+
+class WindowCache:
+
+    def __init__(self, directory=WINDOW_CACHE_DIR, persist=True):
+        self.directory = directory if persist else None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._memory = {}      # (window, key) -> (version, value, closes)
+        self._lock = threading.Lock()
+
+    def _path(self, window, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, window, f'{digest}.pkl')
+
+    def expire(self, now=None):
+        """Drop the memory entries whose window has closed by `now`; returns their (window, key)."""
+        now = now or now_ist()
+        with self._lock:
+            dropped = [entry for entry, (_, _, closes) in self._memory.items() if now > closes]
+            for entry in dropped:
+                del self._memory[entry]
+        self.evictions += len(dropped)
+        return dropped
+
+    def get(self, window, key, version, now=None):
+        """Value cached for (window, key) at this data version, or None."""
+        self.expire(now)
+        with self._lock:
+            entry = self._memory.get((window, key))
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            return entry[1]
+        if self.directory is not None:
+            try:
+                with open(self._path(window, key), 'rb') as f:
+                    stored = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                stored = None
+            if stored is not None and (stored['key'], stored['version']) == (key, version):
+                with self._lock:
+                    self._memory[(window, key)] = (version, stored['value'], next_close(window, now))
+                self.hits += 1
+                return stored['value']
+        self.misses += 1
+        return None
+
+    def put(self, window, key, version, value, now=None):
+        with self._lock:
+            self._memory[(window, key)] = (version, value, next_close(window, now))
+        if self.directory is not None:
+            path = self._path(window, key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump({'window': window, 'key': key, 'version': version, 'value': value}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+
+    def get_or_compute(self, window, key, version, compute):
+        """Cached value for (window, key, version), calling compute() on a miss."""
+        value = self.get(window, key, version)
+        if value is None:
+            value = compute()
+            self.put(window, key, version, value)
+        return value
+
+    def discard(self, window, key=None):
+        """Drop a window's memory entries (all of them, or one key); the disk tier is kept."""
+        with self._lock:
+            for entry in [e for e in self._memory if e[0] == window and key in (None, e[1])]:
+                del self._memory[entry]
+
+    def report(self):
+        return (f"Window cache: {self.hits} hits, {self.misses} misses, "
+                f"{self.evictions} evictions ({len(self._memory)} in memory)")